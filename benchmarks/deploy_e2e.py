@@ -0,0 +1,182 @@
+"""
+Runs `execute_deploy_process` end to end against an in-process Prefect API and reports wall time, API requests and
+peak memory per run
+- The API is prefect's own server app on a throwaway SQLite database, served by uvicorn in a background thread;
+  every request is delayed by `--latency-ms` to stand in for a remote server
+- Deploys from a throwaway git repo with one flow per size, so each size starts with no deployments on the server
+- Each size runs twice: `create` (no deployments on the server yet) and `redeploy` (the same configs again)
+- Deployment diffs render through the terminal sink into `/dev/null`, so rendering is part of the measured time
+- Peak memory is traced with `tracemalloc` and includes the server thread's allocations
+
+Usage: `python benchmarks/deploy_e2e.py [--sizes 1,10,100,1000] [--latency-ms 10] [--deploy-flags "--jobs 8"]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import os
+import re
+import shlex
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+FLOW_TEMPLATE = """from prefect import flow
+
+
+@flow(name="bench-{size}")
+def main(host: str = "host1", retries: int = 3, options: dict = None):
+    pass
+"""
+UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+WORK_POOL_NAME = "bench-pool"
+
+
+class LatencyMiddleware:
+    """ASGI middleware that delays every HTTP request by `latency` seconds and counts requests per endpoint"""
+
+    def __init__(self, app, latency: float):
+        self.app = app
+        self.latency = latency
+        self.requests = Counter()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.requests[f"{scope['method']} {UUID_PATTERN.sub('{id}', scope['path'])}"] += 1
+            await asyncio.sleep(self.latency)
+        await self.app(scope, receive, send)
+
+
+@contextlib.contextmanager
+def serve_api(latency: float):
+    """Serves prefect's API on a free local port and points `PREFECT_API_URL` at it"""
+    import uvicorn
+    from prefect.server.api.server import create_app
+    from prefect.settings import PREFECT_API_URL, temporary_settings
+    from prefect.testing.utilities import prefect_test_harness
+
+    with prefect_test_harness():
+        app = LatencyMiddleware(create_app(ephemeral=True, ignore_cache=True), latency)
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        server = uvicorn.Server(uvicorn.Config(app, log_level="error", lifespan="on"))
+        # prefect settings are context-local; the server thread needs the harness's throwaway database settings
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run, args=(server.run, [sock]), daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+        try:
+            with temporary_settings({PREFECT_API_URL: f"http://127.0.0.1:{sock.getsockname()[1]}/api"}):
+                yield app
+        finally:
+            server.should_exit = True
+            thread.join()
+
+
+def make_repo(root: Path, sizes: list[int]) -> Path:
+    """A committed git repo with one flow module per size (clean, so the dirty check passes)"""
+    from git import Repo
+
+    repo = Repo.init(root, initial_branch="main")
+    for size in sizes:
+        (root / f"bench_{size}.py").write_text(FLOW_TEMPLATE.format(size=size))
+    repo.index.add([f"bench_{x}.py" for x in sizes])
+    repo.index.commit("benchmark flows")
+    return root
+
+
+def deployment_configs(size: int) -> list:
+    from prefect.client.schemas.objects import MinimalDeploymentSchedule
+    from prefect.client.schemas.schedules import CronSchedule
+
+    from prefect_addl_utils import DeploymentConfig
+
+    return [
+        DeploymentConfig(
+            name=f"dep{i}",
+            version="1.0.0",
+            tags=["bench", f"t{i % 10}"],
+            schedules=[MinimalDeploymentSchedule(schedule=CronSchedule(cron=f"{i % 60} 2 * * *"), active=True)],
+            parameters={"host": f"host{i}", "retries": 3, "options": {"batch": {"size": i, "tables": ["a", "b"]}}},
+        )
+        for i in range(size)
+    ]
+
+
+async def run_deploy(repo_root: Path, size: int, deploy_flags: list[str]):
+    from prefect.runner.storage import GitRepository
+    from rich.console import Console
+
+    from prefect_addl_utils import execute_deploy_process
+    from prefect_addl_utils.deployment_output import RichDiffSink
+    from prefect_addl_utils.flow_source import load_flow_from_checkout
+
+    source = GitRepository(url=repo_root.as_uri(), branch="main")
+    entrypoint = f"bench_{size}.py:main"
+    flow = await load_flow_from_checkout(source, entrypoint, repo_root)
+    with open(os.devnull, "w") as devnull:
+        await execute_deploy_process(
+            flow=flow,
+            source=source,
+            entrypoint=entrypoint,
+            deployments=deployment_configs(size),
+            work_pool_name=WORK_POOL_NAME,
+            source_checkout=repo_root,
+            diff_sink=RichDiffSink(Console(file=devnull, width=120, force_terminal=True), batch_size=50),
+            cli_flags=deploy_flags,
+            cwd=repo_root,
+        )
+
+
+async def create_work_pool():
+    from prefect import get_client
+    from prefect.client.schemas.actions import WorkPoolCreate
+
+    async with get_client() as client:
+        await client.create_work_pool(WorkPoolCreate(name=WORK_POOL_NAME, type="process"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1,10,100,1000", help="comma-separated deployment counts")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="delay added to every API request")
+    parser.add_argument("--deploy-flags", default="", help="`_deploy.py` flags, e.g. `--jobs 8 --incremental`")
+    parser.add_argument("--top", type=int, default=0, help="also list the N most requested endpoints per run")
+    args = parser.parse_args()
+    sizes = [int(x) for x in args.sizes.split(",")]
+    deploy_flags = shlex.split(args.deploy_flags)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo_root = make_repo(Path(tmpdir) / "repo", sizes)
+        os.environ["GIT_REPO_ROOT"] = str(repo_root)
+        with serve_api(args.latency_ms / 1000) as api:
+            asyncio.run(create_work_pool())
+            print(f"{'deployments':>11} {'run':<9} {'wall s':>8} {'requests':>9} {'peak MiB':>9}")
+            tracemalloc.start()
+            for size in sizes:
+                for run in ("create", "redeploy"):
+                    api.requests.clear()
+                    tracemalloc.reset_peak()
+                    start = time.perf_counter()
+                    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                        asyncio.run(run_deploy(repo_root, size, deploy_flags))
+                    seconds = time.perf_counter() - start
+                    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+                    requests = sum(api.requests.values())
+                    print(f"{size:>11} {run:<9} {seconds:>8.2f} {requests:>9} {peak:>9.1f}")
+                    for endpoint, count in api.requests.most_common(args.top):
+                        print(f"{'':>21} {count:>9}  {endpoint}")
+                    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
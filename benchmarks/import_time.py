@@ -0,0 +1,69 @@
+"""
+Measures the cold import time of prefect-addl-utils with `python -X importtime`
+- Each statement runs in a fresh interpreter, so nothing is already in `sys.modules`
+- `--max-ms` fails the run (exit code 1) when `import prefect_addl_utils` is slower than the budget
+
+Usage: `python benchmarks/import_time.py [--repeat 5] [--top 10] [--max-ms 50]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "import prefect_addl_utils": "import prefect_addl_utils",
+    "DeploymentConfig": "from prefect_addl_utils import DeploymentConfig",
+    "execute_deploy_process": "from prefect_addl_utils import execute_deploy_process",
+}
+
+
+def import_times(statement: str) -> dict[str, tuple[int, int]]:
+    """`(cumulative microseconds, nesting depth)` of every module imported by `statement`"""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        name = module.lstrip()
+        times[name] = (int(cumulative), (len(module) - len(name) - 1) // 2)
+    return times
+
+
+def statement_ms(times: dict[str, tuple[int, int]], startup: set[str]) -> float:
+    """Time spent in the statement itself: top-level imports, minus the ones every interpreter does at startup"""
+    return sum(us for name, (us, depth) in times.items() if depth == 0 and name not in startup) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    startup = set(import_times("pass"))
+    medians_ms = {}
+    for label, statement in STATEMENTS.items():
+        runs = [import_times(statement) for _ in range(args.repeat)]
+        medians_ms[label] = statistics.median(statement_ms(x, startup) for x in runs)
+        print(f"{label:<28} {medians_ms[label]:>9.1f} ms (median of {args.repeat})")
+        slowest = sorted((x for x in runs[-1].items() if x[0] not in startup), key=lambda x: -x[1][0])
+        for module, (us, _) in slowest[: args.top]:
+            print(f"    {us / 1000:>9.1f} ms  {module}")
+
+    if args.max_ms is not None and medians_ms["import prefect_addl_utils"] > args.max_ms:
+        print(f"FAIL: `import prefect_addl_utils` took more than {args.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Renders synthetic deployment diffs through the terminal output path and reports the time per mode
+- Each deployment has tags, cron/interval schedules and flat + nested parameters, with a few changes per deployment
+- Output goes to an in-memory terminal (colors on, fixed width), so only rendering is measured
+
+Usage: `python benchmarks/render_diffs.py [--deployments 500] [--repeat 3]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import statistics
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+from prefect.client.schemas.objects import MinimalDeploymentSchedule
+from prefect.client.schemas.schedules import CronSchedule, IntervalSchedule
+from rich.console import Console
+
+from prefect_addl_utils.deployment_output import RichDiffSink, build_diff
+
+
+def synthetic_pair(i: int) -> tuple[SimpleNamespace, SimpleNamespace]:
+    """`(new, old)` deployment states for deployment `i`: one tag, one schedule and two parameters differ"""
+    schedules = [
+        MinimalDeploymentSchedule(schedule=CronSchedule(cron=f"{x} 2 * * *", timezone="UTC"), active=True)
+        for x in range(3)
+    ] + [
+        MinimalDeploymentSchedule(
+            schedule=IntervalSchedule(interval=timedelta(minutes=x + 1), anchor_date="2024-01-01T00:00:00+00:00"),
+            active=True,
+        )
+        for x in range(2)
+    ]
+    parameters = {f"param_{x}": x for x in range(15)}
+    parameters["config"] = {"tables": [{"name": f"t{x}", "columns": list(range(20))} for x in range(20)]}
+    old = SimpleNamespace(
+        entrypoint=f"flows/flow_{i}/flow.py:main",
+        tags=[f"tag{x}" for x in range(8)],
+        schedules=schedules,
+        parameters=parameters,
+    )
+    new_parameters = {**parameters, "param_0": -1}
+    new_parameters["config"] = {"tables": [*parameters["config"]["tables"][:-1], {"name": "t19", "columns": [0]}]}
+    new = SimpleNamespace(
+        entrypoint=old.entrypoint,
+        tags=[*old.tags[1:], "new-tag"],
+        schedules=schedules[1:],
+        parameters=new_parameters,
+    )
+    return new, old
+
+
+def render(diffs: list, **sink_options) -> float:
+    output = Console(file=io.StringIO(), width=120, force_terminal=True, color_system="truecolor")
+    sink = RichDiffSink(output, **sink_options)
+    start = time.perf_counter()
+    for diff in diffs:
+        sink.write(diff)
+    sink.close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--deployments", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pairs = [synthetic_pair(i) for i in range(args.deployments)]
+    start = time.perf_counter()
+    diffs = [build_diff(f"flow/deployment-{i}", new, old) for i, (new, old) in enumerate(pairs)]
+    print(f"{'diff':<10} {time.perf_counter() - start:>8.3f} s for {args.deployments} deployments")
+
+    modes = {
+        "tree": {"mode": "tree", "batch_size": 1},
+        "tree-batch": {"mode": "tree", "batch_size": 50},
+        "compact": {"mode": "compact", "batch_size": 50},
+        "summary": {"mode": "summary", "batch_size": 50},
+    }
+    for mode, sink_options in modes.items():
+        seconds = statistics.median(render(diffs, **sink_options) for _ in range(args.repeat))
+        print(f"{mode:<12} {seconds:>8.3f} s ({seconds / args.deployments * 1000:.2f} ms per deployment)")
+
+
+if __name__ == "__main__":
+    main()
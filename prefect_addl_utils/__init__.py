@@ -1,5 +1,42 @@
 from __future__ import annotations
 
-from .deployment_process import DeploymentConfig, build_entrypoint_str, execute_deploy_process
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = [build_entrypoint_str, execute_deploy_process, DeploymentConfig]
+if TYPE_CHECKING:
+    from .deployment_config import DeploymentConfig
+    from .deployment_process import build_entrypoint_str, execute_deploy_process
+    from .entrypoint import resolve_entrypoint
+    from .manifest import DeploymentManifest, deploy_manifest
+    from .variables import VariableCache, git_repository_from_variables, resolve_values
+
+# attributes are imported on first access, so `import prefect_addl_utils` does not import prefect, git or rich
+_LAZY_ATTRIBUTES = {
+    "DeploymentConfig": ".deployment_config",
+    "build_entrypoint_str": ".deployment_process",
+    "execute_deploy_process": ".deployment_process",
+    "resolve_entrypoint": ".entrypoint",
+    "DeploymentManifest": ".manifest",
+    "deploy_manifest": ".manifest",
+    "git_repository_from_variables": ".variables",
+    "resolve_values": ".variables",
+    "VariableCache": ".variables",
+}
+
+__all__ = [
+    "build_entrypoint_str",
+    "execute_deploy_process",
+    "resolve_entrypoint",
+    "DeploymentConfig",
+    "DeploymentManifest",
+    "deploy_manifest",
+    "git_repository_from_variables",
+    "resolve_values",
+    "VariableCache",
+]
+
+
+def __getattr__(name: str):
+    if module_name := _LAZY_ATTRIBUTES.get(name):
+        return getattr(importlib.import_module(module_name, __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
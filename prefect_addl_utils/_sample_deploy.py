@@ -1,13 +1,12 @@
 from __future__ import annotations
 
 import asyncio
-import sys
 from pathlib import Path
 
 from prefect.client.schemas.objects import MinimalDeploymentSchedule as sch
 from prefect.client.schemas.schedules import CronSchedule
 
-import prefect_utils_addl as addl
+import prefect_addl_utils as addl
 
 ######################################################################
 # USER CONFIGURATION BEGINS HERE
@@ -20,7 +19,7 @@ if True:
 
 WORK_POOL_NAME = "2.19.3"
 
-deployment1 = wcc.DeploymentConfig(
+deployment1 = addl.DeploymentConfig(
     name="deployment-name1",
     version="0.0.1",
     work_queue_name="default",
@@ -31,7 +30,7 @@ deployment1 = wcc.DeploymentConfig(
     description=open(Path(__file__).parent / "_description.md").read(),
 )
 
-deployment2 = wcc.DeploymentConfig(
+deployment2 = addl.DeploymentConfig(
     name="deployment-name2",
     version="0.0.1",
     work_queue_name="default",
@@ -47,21 +46,19 @@ deployments_l = [deployment1, deployment2]
 ######################################################################
 # CODE BELOW IS USUALLY UNCHANGED
 ######################################################################
-gitlab_storage = GitRepository(
-    name=Variable.get("gitlab_flows_repo_name").value,
-    url=Variable.get("gitlab_flows_storage").value,
-    branch=Variable.get("gitlab_flows_branch").value,
-    credentials={
-        "access_token": Secret.load("gitlab-flows-token"),
-    },
+gitlab_storage = addl.git_repository_from_variables(
+    name_variable="gitlab_flows_repo_name",
+    url_variable="gitlab_flows_storage",
+    branch_variable="gitlab_flows_branch",
+    access_token_secret="gitlab-flows-token",  # noqa: S106  (the name of a Secret block, not the token)
 )
 
 if __name__ == "__main__":
     asyncio.run(
-        wcc.execute_deploy_process(
+        addl.execute_deploy_process(
             flow=main,
             source=gitlab_storage,
-            entrypoint=wcc.build_entrypoint_str(__file__),
+            entrypoint=addl.build_entrypoint_str(__file__),
             deployments=deployments_l,
             work_pool_name=WORK_POOL_NAME,
         )
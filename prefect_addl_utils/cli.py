@@ -39,4 +39,72 @@ def cli():
 )
 @click.option("-t", "--test", "test", is_flag=True, hidden=True)
 def keepass_list(test, input_password=None):
-    ...
\ No newline at end of file
+    ...
+
+
+@cli.command(
+    "deploy-all",
+    help="Deploys every `_deploy.py` under `--root` (default: the git project root) from one process. "
+    "Unrecognized options (e.g. `--update-all`, `--incremental`) are passed to each deployment process.",
+    context_settings={"ignore_unknown_options": True},
+)
+@click.option("-r", "--root", "root", type=click.Path(exists=True, file_okay=False), help="Directory to search")
+@click.option("-j", "--flow-jobs", "flow_jobs", default=4, show_default=True, help="Flows deployed at the same time")
+@click.argument("deploy_flags", nargs=-1, type=click.UNPROCESSED)
+def deploy_all(root, flow_jobs, deploy_flags):
+    from pathlib import Path
+
+    from . import monorepo
+    from .manage_config import get_repo
+
+    root = root or Path(get_repo().common_dir).parent
+    monorepo.deploy_all(root, cli_flags=list(deploy_flags), max_concurrency=flow_jobs)
+
+
+@cli.command(
+    "deploy",
+    help="Deploys a `_deploy.toml` manifest (default: the one in the current directory). "
+    "Unrecognized options (e.g. `--update-all`, `--plan`) are passed to the deployment process.",
+    context_settings={"ignore_unknown_options": True},
+)
+@click.option("-m", "--manifest", "manifest", type=click.Path(exists=True, dir_okay=False), help="Manifest to deploy")
+@click.argument("deploy_flags", nargs=-1, type=click.UNPROCESSED)
+def deploy(manifest, deploy_flags):
+    import asyncio
+
+    from .manifest import MANIFEST_NAME, deploy_manifest
+
+    asyncio.run(deploy_manifest(manifest or MANIFEST_NAME, cli_flags=list(deploy_flags)))
+
+
+@cli.command(
+    "watch",
+    help="Keeps one process running and shows the `--plan` of each `_deploy.py`/`_deploy.toml` under `--root` "
+    "(default: the git project root) whenever files in its directory change. Nothing is deployed. "
+    "Unrecognized options (e.g. `--update-all`, `--diff-format compact`) are passed to each deployment process.",
+    context_settings={"ignore_unknown_options": True},
+)
+@click.option("-r", "--root", "root", type=click.Path(exists=True, file_okay=False), help="Directory to watch")
+@click.option("-i", "--interval", "interval", type=float, help="Seconds between checks for changed files")
+@click.argument("deploy_flags", nargs=-1, type=click.UNPROCESSED)
+def watch(root, interval, deploy_flags):
+    import asyncio
+    from pathlib import Path
+
+    from . import watch as watch_mode
+    from .deployment_process import cli_option_value
+    from .diff_sinks import stdout_reserved_for_diffs
+    from .manage_config import get_repo
+
+    root = root or Path(get_repo().common_dir).parent
+    interval = watch_mode.WATCH_INTERVAL if interval is None else interval
+    diff_format = cli_option_value(list(deploy_flags), "--diff-format") or "rich"
+    with stdout_reserved_for_diffs(diff_format, cli_option_value(list(deploy_flags), "--diff-file")):
+        try:
+            asyncio.run(watch_mode.watch(root, cli_flags=list(deploy_flags), interval=interval))
+        except KeyboardInterrupt:
+            watch_mode.console.print("Stopped watching")
+
+
+if __name__ == "__main__":
+    cli()
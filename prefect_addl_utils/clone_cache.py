@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import urlparse, urlunparse
+
+from git import Repo
+from git.exc import GitCommandError
+from prefect.runner.storage import GitRepository
+
+from .manage_config import default_cache_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+LAST_USED_MARKER = ".addl-last-used"
+
+
+class CloneCache:
+    """
+    Persistent on-disk cache of git sources, shared by every deploy run on a machine
+    - One bare mirror per repository URL, updated with incremental fetches of only the requested branch
+    - One detached worktree per commit SHA, checked out from the mirror (no network, no object copies)
+    - Worktrees unused for longer than `max_age` are evicted, then least recently used ones until the cache is
+      under `max_bytes`
+
+    """
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        *,
+        max_bytes: int = 5 * 1024**3,
+        max_age: timedelta = timedelta(days=14),
+    ):
+        self.root = Path(root) if root else default_cache_dir() / "git"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def mirror_path(self, url: str) -> Path:
+        return self.root / "mirrors" / f"{self.__url_key(url)}.git"
+
+    def worktree_path(self, url: str, sha: str) -> Path:
+        return self.root / "worktrees" / self.__url_key(url) / sha
+
+    def fetch(self, url: str, branch: str | None = None, *, fetch_url: str | None = None) -> str:
+        """
+        Creates or incrementally updates the mirror for `url` and returns the commit SHA of `branch`
+        - `branch=None` resolves the remote's default branch
+        - `fetch_url` (e.g., the URL with credentials) is only used for the fetch and is never written to disk
+
+        """
+        mirror_path = self.mirror_path(url)
+        with self.__lock(mirror_path):
+            mirror = Repo(mirror_path) if mirror_path.exists() else Repo.init(mirror_path, bare=True, mkdir=True)
+            ref = f"refs/heads/{branch}" if branch else "refs/addl-default"
+            source_ref = f"refs/heads/{branch}" if branch else "HEAD"
+            mirror.git.fetch("--prune", "--no-tags", fetch_url or url, f"+{source_ref}:{ref}")
+            return mirror.git.rev_parse(f"{ref}^{{commit}}")
+
+    def checkout(self, url: str, branch: str | None = None, *, fetch_url: str | None = None) -> Path:
+        """
+        Returns a worktree of `url` at the current tip of `branch`, reusing the cached one when it exists
+
+        """
+        sha = self.fetch(url, branch, fetch_url=fetch_url)
+        worktree_path = self.worktree_path(url, sha)
+        mirror_path = self.mirror_path(url)
+        with self.__lock(mirror_path):
+            if not worktree_path.exists():
+                worktree_path.parent.mkdir(parents=True, exist_ok=True)
+                Repo(mirror_path).git.worktree("add", "--detach", "--force", str(worktree_path), sha)
+            (worktree_path / LAST_USED_MARKER).touch()
+        self.evict(keep={worktree_path})
+        return worktree_path
+
+    async def checkout_source(self, source: GitRepository) -> Path:
+        """
+        Checks out a prefect `GitRepository` from the cache and returns the directory its entrypoints are relative to
+
+        """
+        return await asyncio.to_thread(
+            self.checkout,
+            source._url,
+            source._branch,
+            fetch_url=source._repository_url_with_credentials,
+        )
+
+    def evict(self, keep: set[Path] = frozenset()):
+        """
+        Removes worktrees unused for longer than `max_age`, then least recently used ones until under `max_bytes`
+
+        """
+        worktrees = sorted(self.__worktrees(), key=lambda x: x[1])
+        expired_before = time.time() - self.max_age.total_seconds()
+        total_bytes = sum(x[2] for x in worktrees)
+        for path, last_used, size in worktrees:
+            if path in keep:
+                continue
+            if last_used >= expired_before and total_bytes <= self.max_bytes:
+                break
+            self.__remove_worktree(path)
+            total_bytes -= size
+
+    def __worktrees(self) -> list[tuple[Path, float, int]]:
+        worktrees = []
+        for repo_dir in (self.root / "worktrees").glob("*"):
+            for path in repo_dir.iterdir():
+                marker = path / LAST_USED_MARKER
+                last_used = marker.stat().st_mtime if marker.exists() else 0
+                worktrees.append((path, last_used, self.__directory_size(path)))
+        return worktrees
+
+    def __remove_worktree(self, path: Path):
+        mirror_path = self.root / "mirrors" / f"{path.parent.name}.git"
+        with self.__lock(mirror_path):
+            try:
+                Repo(mirror_path).git.worktree("remove", "--force", str(path))
+            except GitCommandError:
+                shutil.rmtree(path, ignore_errors=True)
+                Repo(mirror_path).git.worktree("prune")
+
+    @contextmanager
+    def __lock(self, mirror_path: Path):
+        # serializes mirror updates across processes sharing the cache (e.g., parallel CI jobs on one runner)
+        if fcntl is None:
+            yield
+            return
+        mirror_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(mirror_path.with_suffix(".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def __url_key(url: str) -> str:
+        # credentials never become part of the cache path
+        parsed = urlparse(url)
+        without_credentials = urlunparse(parsed._replace(netloc=parsed.netloc.rsplit("@", 1)[-1]))
+        name = Path(parsed.path).stem or "repo"
+        return f"{name}-{hashlib.sha256(without_credentials.encode()).hexdigest()[:16]}"
+
+    @staticmethod
+    def __directory_size(path: Path) -> int:
+        size = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    size += os.lstat(os.path.join(dirpath, filename)).st_size
+                except FileNotFoundError:
+                    pass
+        return size
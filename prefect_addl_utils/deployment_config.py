@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from pydantic.v1 import BaseModel, parse_obj_as, validator
+
+
+class DeploymentConfig(BaseModel):
+    name: str = None
+    version: str
+    work_queue_name: str = "default"
+    work_pool_name: str | None = None  # defaults to the `work_pool_name` passed to `execute_deploy_process`
+    job_variables: dict | None = None
+    parameters: dict | None = None
+    description: str | None = None
+    schedules: list | None = None  # `MinimalDeploymentSchedule`s or `DeploymentSchedule`s
+    tags: list | None = None
+
+    @validator("schedules", pre=True)
+    def __schedule_types(cls, value):
+        # the schedule types are imported on first use, so `from prefect_addl_utils import DeploymentConfig` does not
+        # import prefect's client
+        if value is None:
+            return value
+        from prefect.client.schemas.objects import DeploymentSchedule, MinimalDeploymentSchedule
+
+        return parse_obj_as(list[MinimalDeploymentSchedule] | list[DeploymentSchedule], value)
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import json
+import reprlib
+from typing import Any, Iterator, Literal, NamedTuple
+
+from prefect.client.schemas.schedules import CronSchedule, IntervalSchedule, RRuleSchedule
+
+
+class ScheduleChange(NamedTuple):
+    active: bool
+    schedule: CronSchedule | IntervalSchedule | RRuleSchedule
+    mode: Literal["added", "removed", None] = None
+
+
+class ParameterChange(NamedTuple):
+    path: str
+    mode: Literal["added", "removed", "changed"]
+    old: Any = None
+    new: Any = None
+
+
+class ParameterDiff(NamedTuple):
+    name: str
+    mode: Literal["added", "removed", "changed", None]
+    new: Any = None
+    old: Any = None
+    changes: tuple[ParameterChange, ...] = ()  # leaf-level changes, when a dict/list parameter changed
+
+
+class SettingChange(NamedTuple):
+    name: str
+    old: Any = None
+    new: Any = None
+
+
+# the deployment settings besides entrypoint, tags, schedules and parameters that applying a deployment sends (the
+# fields `fingerprint.local_fingerprint` hashes), so a change to any of them is an update
+DEPLOYMENT_SETTINGS = (
+    "version",
+    "description",
+    "work_pool_name",
+    "work_queue_name",
+    "job_variables",
+    "pull_steps",
+    "parameter_openapi_schema",
+)
+
+
+class DeploymentDiff(NamedTuple):
+    """
+    What changed between two states of one deployment, as plain data (no rendering or markup)
+    - `new`/`old` can be server `DeploymentResponse`s or locally built `RunnerDeployment`s; `old=None` means the
+      deployment does not exist yet
+    - Parameters are listed added, removed, then common ones, each group sorted by name
+    - `settings` lists only the changed `DEPLOYMENT_SETTINGS`, in that order (empty when the deployment does not exist)
+
+    """
+
+    name: str
+    exists: bool
+    entrypoint: str | None
+    old_entrypoint: str | None
+    tags_added: list[str]
+    tags_removed: list[str]
+    tags_unchanged: list[str]
+    schedules: list[ScheduleChange]
+    parameters: list[ParameterDiff]
+    settings: list[SettingChange]
+
+    @classmethod
+    def build(cls, name: str, new, old=None, *, max_depth: int | None = None) -> DeploymentDiff:
+        new_tags, old_tags = set(new.tags), set(old.tags if old else [])
+        return cls(
+            name=name,
+            exists=old is not None,
+            entrypoint=new.entrypoint,
+            old_entrypoint=old.entrypoint if old else None,
+            tags_added=sorted(new_tags - old_tags),
+            tags_removed=sorted(old_tags - new_tags),
+            tags_unchanged=sorted(new_tags & old_tags),
+            schedules=diff_schedules(new.schedules, old.schedules if old else None),
+            parameters=cls.__diff_parameter_dicts(new.parameters, old.parameters if old else {}, max_depth),
+            settings=cls.__diff_settings(new, old) if old else [],
+        )
+
+    @property
+    def entrypoint_changed(self) -> bool:
+        return self.old_entrypoint not in (None, "", self.entrypoint)
+
+    @property
+    def changed(self) -> bool:
+        return (
+            not self.exists
+            or self.entrypoint_changed
+            or bool(self.tags_added or self.tags_removed)
+            or any(x.mode is not None for x in self.schedules)
+            or any(x.mode is not None for x in self.parameters)
+            or bool(self.settings)
+        )
+
+    @property
+    def action(self) -> Literal["create", "update", "unchanged"]:
+        if not self.exists:
+            return "create"
+        return "update" if self.changed else "unchanged"
+
+    def to_dict(self) -> dict:
+        """
+        JSON-ready form: only changed parameters, with leaf-level `changes` for changed dict/list parameters
+
+        """
+        return {
+            "name": self.name,
+            "action": self.action,
+            "entrypoint": {"new": self.entrypoint, "old": self.old_entrypoint},
+            "tags": {"added": self.tags_added, "removed": self.tags_removed, "unchanged": self.tags_unchanged},
+            "schedules": [
+                {"mode": x.mode or "unchanged", "active": x.active, "schedule": json.loads(x.schedule.json())}
+                for x in self.schedules
+            ],
+            "parameters": [
+                {
+                    "name": x.name,
+                    "mode": x.mode,
+                    **({"changes": [y._asdict() for y in x.changes]} if x.changes else {"new": x.new, "old": x.old}),
+                }
+                for x in self.parameters
+                if x.mode is not None
+            ],
+            "settings": [x._asdict() for x in self.settings],
+        }
+
+    @staticmethod
+    def __diff_parameter_dicts(new: dict, old: dict, max_depth: int | None) -> list[ParameterDiff]:
+        parameters = [ParameterDiff(x, "added", new=new[x]) for x in sorted(new.keys() - old.keys())]
+        parameters += [ParameterDiff(x, "removed", old=old[x]) for x in sorted(old.keys() - new.keys())]
+        for name in sorted(new.keys() & old.keys()):
+            if new[name] == old[name]:
+                parameters.append(ParameterDiff(name, None, new=new[name], old=old[name]))
+            elif isinstance(new[name], (dict, list)):
+                changes = tuple(diff_parameters(new[name], old[name], max_depth=max_depth))
+                parameters.append(ParameterDiff(name, "changed", new[name], old[name], changes))
+            else:
+                parameters.append(ParameterDiff(name, "changed", new[name], old[name]))
+        return parameters
+
+    @staticmethod
+    def __diff_settings(new, old) -> list[SettingChange]:
+        new_d, old_d = DeploymentDiff.__settings(new), DeploymentDiff.__settings(old)
+        return [SettingChange(x, old_d[x], new_d[x]) for x in DEPLOYMENT_SETTINGS if new_d[x] != old_d[x]]
+
+    @staticmethod
+    def __settings(deployment) -> dict:
+        # a `RunnerDeployment` keeps its source as `storage` and its schema as `_parameter_openapi_schema`; the server
+        # copy has the `pull_steps` and schema `apply()` sent from them
+        storage = getattr(deployment, "storage", None)
+        pull_steps = [storage.to_pull_step()] if storage is not None else getattr(deployment, "pull_steps", None)
+        schema = getattr(deployment, "_parameter_openapi_schema", None) or getattr(
+            deployment, "parameter_openapi_schema", None
+        )
+        return {
+            "version": getattr(deployment, "version", None),
+            "description": getattr(deployment, "description", None),
+            "work_pool_name": getattr(deployment, "work_pool_name", None),
+            "work_queue_name": getattr(deployment, "work_queue_name", None),
+            "job_variables": getattr(deployment, "job_variables", None) or {},
+            "pull_steps": pull_steps or [],
+            "parameter_openapi_schema": (schema.dict() if hasattr(schema, "dict") else schema) or {},
+        }
+
+
+def schedule_key(active: bool, schedule: CronSchedule | IntervalSchedule | RRuleSchedule) -> tuple:
+    """
+    Canonical, hashable identity of a schedule: equal keys mean equal schedules (including the active flag)
+    - cron + timezone + day_or, interval + anchor + timezone, or rrule + timezone
+    - Any other schedule type falls back to its JSON
+
+    """
+    if isinstance(schedule, CronSchedule):
+        return (active, "cron", schedule.cron, schedule.timezone, schedule.day_or)
+    if isinstance(schedule, IntervalSchedule):
+        anchor_date = schedule.anchor_date.isoformat() if schedule.anchor_date else None
+        return (active, "interval", schedule.interval.total_seconds(), anchor_date, schedule.timezone)
+    if isinstance(schedule, RRuleSchedule):
+        return (active, "rrule", schedule.rrule, schedule.timezone)
+    return (active, type(schedule).__name__, schedule.json())
+
+
+def diff_schedules(new: list, old: list | None = None) -> list[ScheduleChange]:
+    """
+    Classifies schedules as added, removed or unchanged (`mode=None`) with set lookups on `schedule_key`
+    - `new`/`old` items need `.active` and `.schedule` (deployment schedules of any kind)
+    - Returns added (in `new` order), then removed (in `old` order), then unchanged (in `new` order); duplicates are
+      listed once
+
+    """
+    new_d = __keyed(new)
+    old_d = __keyed(old or [])
+    changes = [ScheduleChange(x.active, x.schedule, "added") for k, x in new_d.items() if k not in old_d]
+    changes += [ScheduleChange(x.active, x.schedule, "removed") for k, x in old_d.items() if k not in new_d]
+    changes += [ScheduleChange(x.active, x.schedule) for k, x in new_d.items() if k in old_d]
+    return changes
+
+
+def __keyed(schedules: list) -> dict:
+    keyed = {}
+    for x in schedules:
+        keyed.setdefault(schedule_key(x.active, x.schedule), x)
+    return keyed
+
+
+def diff_parameters(new: Any, old: Any, *, max_depth: int | None = None) -> Iterator[ParameterChange]:
+    """
+    Yields the differences between two JSON-like values, one per changed leaf, as paths like `a.b[3].c`
+    - Equal subtrees are skipped with a single `==` (compared in C) instead of being walked
+    - Lists are compared by position; a dict/list replaced by another type is one change at its path
+    - Below `max_depth`, a differing subtree is yielded as one change at its path
+    - Lazy, so callers that only show the first N changes only pay for those
+
+    """
+    yield from __diff_values(new, old, "", 0, max_depth)
+
+
+def truncated_repr(value: Any, *, max_length: int = 80, max_depth: int = 2) -> str:
+    """
+    `repr` of `value` bounded in both work and size (nested levels, items and strings are elided while it is built)
+
+    """
+    short_repr = reprlib.Repr()
+    short_repr.maxlevel = max_depth
+    short_repr.maxdict = short_repr.maxlist = short_repr.maxtuple = short_repr.maxset = 6
+    short_repr.maxstring = short_repr.maxother = short_repr.maxlong = max_length
+    text = short_repr.repr(value)
+    return text if len(text) <= max_length else f"{text[: max_length - 3]}..."
+
+
+def __diff_values(new: Any, old: Any, path: str, depth: int, max_depth: int | None) -> Iterator[ParameterChange]:
+    if new == old:
+        return
+    within_depth = max_depth is None or depth < max_depth
+    if isinstance(new, dict) and isinstance(old, dict) and within_depth:
+        for key, value in new.items():
+            key_path = f"{path}.{key}" if path else str(key)
+            if key in old:
+                yield from __diff_values(value, old[key], key_path, depth + 1, max_depth)
+            else:
+                yield ParameterChange(key_path, "added", new=value)
+        for key, value in old.items():
+            if key not in new:
+                yield ParameterChange(f"{path}.{key}" if path else str(key), "removed", old=value)
+    elif isinstance(new, list) and isinstance(old, list) and within_depth:
+        for i, value in enumerate(new):
+            if i < len(old):
+                yield from __diff_values(value, old[i], f"{path}[{i}]", depth + 1, max_depth)
+            else:
+                yield ParameterChange(f"{path}[{i}]", "added", new=value)
+        for i in range(len(new), len(old)):
+            yield ParameterChange(f"{path}[{i}]", "removed", old=old[i])
+    else:
+        yield ParameterChange(path, "changed", old, new)
+
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
-from collections import OrderedDict, namedtuple
-from typing import Literal
+import functools
 
 from cron_descriptor import get_description
 from prefect.client.schemas.responses import DeploymentResponse
-from prefect.client.schemas.schedules import CronSchedule, IntervalSchedule, RRuleSchedule
+from prefect.client.schemas.schedules import CronSchedule
 from pydantic.v1 import BaseModel
+from rich.cells import cell_len
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.pretty import Pretty
 from rich.rule import Rule
 from rich.table import Table, box
+from rich.text import Text
 from rich.tree import Tree
 
+from .deployment_diff import (
+    DeploymentDiff,
+    ParameterChange,
+    ParameterDiff,
+    ScheduleChange,
+    SettingChange,
+    truncated_repr,
+)
+
 console = Console()
 
 SCHEDULE_ACTIVE = "[dark_green]Active[/dark_green]"
@@ -22,148 +33,151 @@ SCHEDULE_ARROW = "[bold bright_cyan]->[/bold bright_cyan]"
 OPEN_PARENTHESIS = "[bold bright_cyan]([/bold bright_cyan]"
 CLOSE_PARENTHESIS = "[bold bright_cyan])[/bold bright_cyan]"
 
+# bounds for rendering parameter values, so large nested parameters print only what changed
+PARAMETER_VALUE_MAX_LENGTH = 80  # characters per rendered value
+PARAMETER_DIFF_MAX_DEPTH = 8  # nesting levels walked by the parameter diff; deeper changes show as one subtree
+PARAMETER_DIFF_MAX_CHANGES = 50  # changed leaves listed per parameter
+PARAMETER_PRETTY_MAX_DEPTH = 3  # nesting levels shown for unchanged dict/list parameters
+PARAMETER_PRETTY_MAX_LENGTH = 10  # items shown per container for unchanged dict/list parameters
 
-class Entrypoint(BaseModel):
-    @staticmethod
-    def build(new: DeploymentResponse, old: DeploymentResponse = None) -> str:
-        new = new.entrypoint
-        old = None if old is None else old.entrypoint
 
-        if old == new or old in (None, ""):
-            return f"[bold orange4]`{new}`[/bold orange4]"
+class Entrypoint:
+    @staticmethod
+    def build(diff: DeploymentDiff) -> str:
+        if not diff.entrypoint_changed:
+            return f"[bold orange4]`{diff.entrypoint}`[/bold orange4]"
         else:
-            return f"[green]`{new}`[/green] [red][strike]`{old}`[/strike][/red]"
+            return f"[green]`{diff.entrypoint}`[/green] [red][strike]`{diff.old_entrypoint}`[/strike][/red]"
 
 
-class TagsRow(BaseModel):
+class TagsRow:
     @staticmethod
-    def build(new: DeploymentResponse, old: DeploymentResponse = None) -> list:
-        new_tags = new.tags
-        old_tags = None if old is None else old.tags
-
-        if not old_tags:
-            old_tags = []
-
-        added = set(new_tags).difference(set(old_tags))
-        removed = set(old_tags).difference(set(new_tags))
-        if old_tags:
-            unchanged = set(new_tags).intersection(set(old_tags))
-
+    def build(diff: DeploymentDiff) -> list:
         tags_l = []
-        if old_tags:
-            tags_l += [f"{OPEN_PARENTHESIS}{x}{CLOSE_PARENTHESIS}" for x in unchanged]
-        tags_l += [f"[green]{OPEN_PARENTHESIS}{x}{CLOSE_PARENTHESIS}[/green]" for x in added]
-        tags_l += [f"[red][strike]{OPEN_PARENTHESIS}{x}{CLOSE_PARENTHESIS}[/strike][/red]" for x in removed]
+        tags_l += [f"{OPEN_PARENTHESIS}{x}{CLOSE_PARENTHESIS}" for x in diff.tags_unchanged]
+        tags_l += [f"[green]{OPEN_PARENTHESIS}{x}{CLOSE_PARENTHESIS}[/green]" for x in diff.tags_added]
+        tags_l += [f"[red][strike]{OPEN_PARENTHESIS}{x}{CLOSE_PARENTHESIS}[/strike][/red]" for x in diff.tags_removed]
         return sorted(tags_l)
 
 
-class ScheduleRows(BaseModel):
-    active: bool
-    schedule: CronSchedule | IntervalSchedule | RRuleSchedule
-    mode: Literal["added", "removed", None] = None
+class ScheduleRows:
+    @staticmethod
+    def build(diff: DeploymentDiff) -> list[str]:
+        return [ScheduleRows.__resolve(x) for x in diff.schedules]
 
     @staticmethod
-    def build(new: DeploymentResponse, old: DeploymentResponse = None):
-        new_schedules = new.schedules
-        old_schedules = None if old is None else old.schedules
-
-        ScheduleTuple = namedtuple("ScheduleTuple", "active schedule")
-
-        old_schedules = [] if old_schedules is None else [ScheduleTuple(x.active, x.schedule) for x in old_schedules]
-        new_schedules = [ScheduleTuple(x.active, x.schedule) for x in new_schedules]
-
-        added_l, removed_l, unchanged_l = [], [], []
-        for s in new_schedules:
-            if s not in old_schedules:
-                added_l.append(s)
-            elif s not in unchanged_l:
-                unchanged_l.append(s)
-        for s in old_schedules:
-            if s not in new_schedules:
-                removed_l.append(s)
-            elif s not in unchanged_l:
-                unchanged_l.append(s)
-
-        schedules_l = []
-        schedules_l += [ScheduleRows(active=x.active, schedule=x.schedule, mode="added").__resolve() for x in added_l]
-        schedules_l += [
-            ScheduleRows(active=x.active, schedule=x.schedule, mode="removed").__resolve() for x in removed_l
-        ]
-        schedules_l += [ScheduleRows(active=x.active, schedule=x.schedule, mode=None).__resolve() for x in unchanged_l]
-        return schedules_l
-
-    def __resolve(self):
-        schedule_string = f"{SCHEDULE_ACTIVE if self.active else SCHEDULE_INACIVE} {SCHEDULE_ARROW} [:schedule_color]{self.schedule}[/:schedule_color]"
-        if isinstance(self.schedule, CronSchedule):
-            schedule_string = f"{schedule_string} ([gray50]{get_description(self.schedule.cron)}[/gray50])"
-        if self.mode == "added":
+    def __resolve(change: ScheduleChange) -> str:
+        schedule_string = f"{SCHEDULE_ACTIVE if change.active else SCHEDULE_INACIVE} {SCHEDULE_ARROW} [:schedule_color]{change.schedule}[/:schedule_color]"
+        if isinstance(change.schedule, CronSchedule):
+            description = ScheduleRows.__cron_description(change.schedule.cron)
+            schedule_string = f"{schedule_string} ([gray50]{description}[/gray50])"
+        if change.mode == "added":
             return schedule_string.replace(":schedule_color", "green")
-        elif self.mode == "removed":
+        elif change.mode == "removed":
             return f"[strike]{schedule_string.replace(':schedule_color', 'red')}[/strike]"
         else:
             return schedule_string.replace("[:schedule_color]", "").replace("[/:schedule_color]", "")
 
+    @staticmethod
+    @functools.cache
+    def __cron_description(cron: str) -> str:
+        return get_description(cron)
+
+
+class SettingRows:
+    @staticmethod
+    def build(diff: DeploymentDiff) -> list[str]:
+        return [SettingRows.__resolve(x) for x in diff.settings]
 
-class ParameterRows(BaseModel):
     @staticmethod
-    def build(new: DeploymentResponse, old: DeploymentResponse = None):
-        new = new.parameters
-        old = None if old is None else old.parameters
-
-        old = OrderedDict() if old is None else OrderedDict(sorted(old.items()))
-        new = OrderedDict(sorted(new.items()))
-
-        added_l = ParameterRows.__get_added(new, old)
-        removed_l = ParameterRows.__get_removed(new, old)
-        changed, common_l = ParameterRows.__get_common(new, old)
-
-        param_changed = ParameterRows.__determine_changed(added_l, removed_l, changed)
-        parameters_l = added_l + removed_l + common_l
-
-        return ParameterRows.__build_table(parameters_l, param_changed)
-
-    def __get_added(new: dict, old: dict = None) -> list:
-        added_params = sorted(set(new.keys()).difference(old.keys()))
-        return [[f"{x} :star:", f"[green]{new[x]}[/green]", None] for x in added_params]
-
-    def __get_removed(new: dict, old: dict = None) -> list:
-        removed_params = sorted(set(old.keys()).difference(new.keys()))
-        return [[f"{x} :star:", f"[red]{old[x]}[/red]"] for x in removed_params]
-
-    def __get_common(new: dict, old: dict = None) -> tuple[bool, list]:
-        parameters_l = []
-        param_changed = False
-        common_params = sorted(set(new.keys()).intersection(old.keys()))
-        for param_name in common_params:
-            changed = new[param_name] != old[param_name]
-            if isinstance(new[param_name], dict) or isinstance(new[param_name], list):
-                if changed:
-                    param_changed = True
-                    name = f"{param_name} :star:"
-                    value = Panel(Pretty(new[param_name]), style="medium_spring_green")
-                    old_value = Panel(Pretty(old[param_name]), style="red")
-                else:
-                    name = param_name
-                    value = Pretty(new[param_name])
-                    old_value = None
+    def __resolve(change: SettingChange) -> str:
+        old_value, new_value = SettingRows.__format(change.old), SettingRows.__format(change.new)
+        return f"[bold]{change.name}:[/bold] [red]{old_value}[/red] {SCHEDULE_ARROW} [green]{new_value}[/green]"
+
+    @staticmethod
+    def __format(value) -> str:
+        return escape(truncated_repr(value, max_length=PARAMETER_VALUE_MAX_LENGTH))
+
+
+class ParameterRow:
+    __slots__ = ("name", "value", "old_value", "changes")
+
+    def __init__(self, name: str, value, old_value: str | None = None, changes: list[str] | None = None):
+        self.name = name
+        self.value = value
+        self.old_value = old_value
+        self.changes = changes  # one markup line per changed leaf of a dict/list parameter
+
+
+class ParameterRows:
+    @staticmethod
+    def build(diff: DeploymentDiff) -> Table:
+        rows = ParameterRows.rows(diff)
+        param_changed = any(x.mode is not None for x in diff.parameters)
+        return ParameterRows.__build_table(rows, param_changed)
+
+    @staticmethod
+    def rows(diff: DeploymentDiff, *, plain: bool = False) -> list[ParameterRow]:
+        """
+        One row per parameter; `plain=True` keeps every value a markup string (no `Pretty`/`Panel` renderables)
+
+        """
+        return [ParameterRows.__row(x, plain) for x in diff.parameters]
+
+    def __row(parameter: ParameterDiff, plain: bool) -> ParameterRow:
+        if parameter.mode == "added":
+            return ParameterRow(f"{parameter.name} :star:", f"[green]{ParameterRows.__format(parameter.new)}[/green]")
+        if parameter.mode == "removed":
+            return ParameterRow(f"{parameter.name} :star:", f"[red]{ParameterRows.__format(parameter.old)}[/red]")
+        if isinstance(parameter.new, dict) or isinstance(parameter.new, list):
+            if parameter.mode == "changed":
+                changes = ParameterRows.__changed_leaves(parameter.changes)
+                if plain:
+                    return ParameterRow(f"{parameter.name} :star:", "", changes=changes)
+                value = Panel("\n".join(changes), border_style="medium_spring_green")
+                return ParameterRow(f"{parameter.name} :star:", value)
+            if plain:
+                return ParameterRow(parameter.name, f"[grey50]{ParameterRows.__format(parameter.new)}[/grey50]")
+            value = Pretty(
+                parameter.new,
+                max_depth=PARAMETER_PRETTY_MAX_DEPTH,
+                max_length=PARAMETER_PRETTY_MAX_LENGTH,
+                max_string=PARAMETER_VALUE_MAX_LENGTH,
+            )
+            return ParameterRow(parameter.name, value)
+        if parameter.mode == "changed":
+            return ParameterRow(
+                f"{parameter.name} :star:",
+                f"[green]{ParameterRows.__format(parameter.new)}[/green]",
+                f"[red]{ParameterRows.__format(parameter.old)}[/red]",
+            )
+        return ParameterRow(parameter.name, f"[grey50]{ParameterRows.__format(parameter.new)}[/grey50]")
+
+    def __changed_leaves(changes: tuple[ParameterChange, ...]) -> list[str]:
+        # one line per changed leaf (`a.b[3].c: old -> new`), instead of printing both values in full
+        lines = []
+        for change in changes[:PARAMETER_DIFF_MAX_CHANGES]:
+            path = escape(change.path) or "(value)"
+            if change.mode == "added":
+                lines.append(f"[green]+ {path}: {ParameterRows.__format(change.new)}[/green]")
+            elif change.mode == "removed":
+                lines.append(f"[red][strike]- {path}: {ParameterRows.__format(change.old)}[/strike][/red]")
             else:
-                if changed:
-                    param_changed = True
-                    name = f"{param_name} :star:"
-                    value = f"[green]{new[param_name]}[/green]"
-                    old_value = f"[red]{old[param_name]}[/red]"
-                else:
-                    name = param_name
-                    value = f"[grey50]{new[param_name]}[/grey50]"
-                    old_value = None
-            parameters_l.append([name, value, old_value])
-        return param_changed, parameters_l
-
-    def __determine_changed(added: list, removed: list, common_changed: bool) -> bool:
-        if added or removed or common_changed:
-            return True
-
-    def __build_table(parameters: list, old_value_col: bool) -> Table:
+                old_value, new_value = ParameterRows.__format(change.old), ParameterRows.__format(change.new)
+                lines.append(f"[bold]{path}:[/bold] [red]{old_value}[/red] {SCHEDULE_ARROW} [green]{new_value}[/green]")
+        if (remaining := len(changes) - PARAMETER_DIFF_MAX_CHANGES) > 0:
+            lines.append(f"[grey50]... {remaining} more change(s)[/grey50]")
+        return lines
+
+    def __format(value) -> str:
+        if isinstance(value, (dict, list)):
+            return escape(truncated_repr(value, max_length=PARAMETER_VALUE_MAX_LENGTH))
+        text = str(value)
+        if len(text) > PARAMETER_VALUE_MAX_LENGTH:
+            text = f"{text[: PARAMETER_VALUE_MAX_LENGTH - 3]}..."
+        return escape(text)
+
+    def __build_table(rows: list[ParameterRow], old_value_col: bool) -> Table:
         parameters_table = Table(
             show_header=True,
             title_justify="left",
@@ -177,9 +191,8 @@ class ParameterRows(BaseModel):
         if old_value_col is True:
             parameters_table.add_column("Old Value")
 
-        for p in parameters:
-            p = [x for x in p if x is not None]
-            parameters_table.add_row(*p)
+        for row in rows:
+            parameters_table.add_row(*[x for x in (row.name, row.value, row.old_value) if x is not None])
         return parameters_table
 
 
@@ -194,27 +207,108 @@ class Container(BaseModel):
         return f"Container(name={self.name}, target={self.target})"
 
 
-def show_deployment_results(name: str, new: DeploymentResponse, old: DeploymentResponse = None):
-    tree = Tree(f":rocket: [bold bright_cyan]{name}")
+class RichDiffSink:
+    """
+    Renders each `DeploymentDiff` to the terminal
+    - `mode="tree"`: a tree with a parameters table (the default view)
+    - `mode="compact"`: the same tree, with parameters as aligned text rows instead of a table (much cheaper to lay
+      out for large batches)
+    - `mode="summary"`: one line per deployment with counts of what changed
+    - Output is buffered and written every `batch_size` deployments, and on `flush()`/`close()`
 
-    if new is None:
-        return None
-
-    entrypoint = Entrypoint.build(new, old or None)
-    tree.add(f"[bold blue]entrypoint:[/bold blue] {entrypoint}")
+    """
 
-    tags = TagsRow.build(new, old or None)
-    tree.add(f"[bold blue]tags:[/bold blue] {" ".join(tags)}")
+    def __init__(self, output: Console = console, *, mode: str = "tree", batch_size: int = 1):
+        self.console = output
+        self.mode = mode
+        self.batch_size = batch_size
+        self._pending = []
 
-    schedules_l = ScheduleRows.build(new, old or None)
-    schedule_tree = tree.add("[bold blue]schedules:")
-    for s in schedules_l:
-        schedule_tree.add(s)
+    def write(self, diff: DeploymentDiff):
+        if self.mode == "summary":
+            self._pending.append(self.__summary(diff))
+        else:
+            self._pending += [self.__tree(diff, compact=self.mode == "compact"), Rule(style="white")]
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        # `compact`/`summary` lines are cropped instead of word-wrapped; their values are already truncated
+        crop = {"no_wrap": True, "overflow": "ellipsis"} if self.mode != "tree" else {}
+        # inside `with console` rich buffers every print and writes them to the terminal at once
+        with self.console:
+            for renderable in pending:
+                self.console.print(renderable, highlight=False, **crop)
+
+    def close(self):
+        self.flush()
+
+    def __tree(self, diff: DeploymentDiff, *, compact: bool) -> Tree | Text:
+        if not compact:
+            tree = Tree(f":rocket: [bold bright_cyan]{diff.name}")
+            tree.add(f"[bold blue]entrypoint:[/bold blue] {Entrypoint.build(diff)}")
+            tree.add(f"[bold blue]tags:[/bold blue] {' '.join(TagsRow.build(diff))}")
+            schedule_tree = tree.add("[bold blue]schedules:")
+            for s in ScheduleRows.build(diff):
+                schedule_tree.add(s)
+            if diff.settings:
+                settings_tree = tree.add("[bold blue]settings:")
+                for s in SettingRows.build(diff):
+                    settings_tree.add(s)
+            tree.add(ParameterRows.build(diff))
+            return tree
+
+        lines = [
+            f":rocket: [bold bright_cyan]{diff.name}[/bold bright_cyan]",
+            f"├── [bold blue]entrypoint:[/bold blue] {Entrypoint.build(diff)}",
+            f"├── [bold blue]tags:[/bold blue] {' '.join(TagsRow.build(diff))}",
+            "├── [bold blue]schedules:[/bold blue]",
+        ]
+        schedules = ScheduleRows.build(diff)
+        lines += [f"│   {'└' if i == len(schedules) - 1 else '├'}── {x}" for i, x in enumerate(schedules)]
+        if settings := SettingRows.build(diff):
+            lines.append("├── [bold blue]settings:[/bold blue]")
+            lines += [f"│   {'└' if i == len(settings) - 1 else '├'}── {x}" for i, x in enumerate(settings)]
+        lines.append("└── [bold blue]parameters:[/bold blue]")
+        rows = ParameterRows.rows(diff, plain=True)
+        name_widths = [cell_len(x.name.replace(":star:", "⭐")) for x in rows]
+        width = max(name_widths, default=0)
+        for row, name_width in zip(rows, name_widths):
+            padding = " " * (width - name_width)
+            old_value = f" [grey50](was[/grey50] {row.old_value}[grey50])[/grey50]" if row.old_value else ""
+            lines.append(f"    [bold magenta]{row.name}[/bold magenta]{padding}  {row.value}{old_value}".rstrip())
+            lines += [f"    {' ' * width}  {x}" for x in row.changes or []]
+        return Text.from_markup("\n".join(lines))
+
+    def __summary(self, diff: DeploymentDiff) -> str:
+        counts = []
+        if diff.entrypoint_changed:
+            counts.append("entrypoint")
+        if diff.tags_added or diff.tags_removed:
+            counts.append(f"tags [green]+{len(diff.tags_added)}[/green]/[red]-{len(diff.tags_removed)}[/red]")
+        added = sum(x.mode == "added" for x in diff.schedules)
+        removed = sum(x.mode == "removed" for x in diff.schedules)
+        if added or removed:
+            counts.append(f"schedules [green]+{added}[/green]/[red]-{removed}[/red]")
+        if changed := sum(x.mode is not None for x in diff.parameters):
+            counts.append(f"parameters [yellow]~{changed}[/yellow]")
+        if diff.settings:
+            counts.append(f"settings [yellow]{' '.join(x.name for x in diff.settings)}[/yellow]")
+        color = {"create": "green", "update": "yellow", "unchanged": "grey50"}[diff.action]
+        name = f":rocket: [bold bright_cyan]{diff.name}[/bold bright_cyan]"
+        return f"{name} [{color}]{diff.action}[/{color}] {', '.join(counts)}".rstrip()
+
+
+def build_diff(name: str, new, old=None) -> DeploymentDiff:
+    return DeploymentDiff.build(name, new, old or None, max_depth=PARAMETER_DIFF_MAX_DEPTH)
 
-    parameters_table = ParameterRows.build(new, old or None)
-    tree.add(parameters_table)
 
-    console.print(tree)
-    console.print(Rule(style="white"))
+def show_deployment_results(name: str, new: DeploymentResponse, old: DeploymentResponse = None):
+    if new is None:
+        return None
 
+    RichDiffSink().write(build_diff(name, new, old))
     return True
@@ -1,31 +1,57 @@
 from __future__ import annotations
 
-import os
+import asyncio
+import functools
 import sys
-import time
+from contextlib import nullcontext
+from contextvars import ContextVar
 from pathlib import Path
+from uuid import UUID
 
 from git import Repo
-from prefect import Flow, deploy, get_client
-from prefect.client.schemas.objects import DeploymentSchedule, MinimalDeploymentSchedule
+from prefect import Flow, get_client
+from prefect.client.orchestration import PrefectClient
+from prefect.client.schemas.objects import MinimalDeploymentSchedule
 from prefect.client.schemas.responses import DeploymentResponse
+from prefect.deployments.runner import RunnerDeployment
 from prefect.exceptions import ObjectNotFound
 from prefect.runner.storage import GitRepository
-from pydantic.v1 import BaseModel
 from rich.console import Console
 from rich.rule import Rule
 from rich.status import Status
 
 from . import deployment_output as rich_deploy
-from .manage_config import AddlGitRepo
-
-if get_repo_envar := os.environ.get("GIT_REPO_ROOT"):
-    repo = Repo(get_repo_envar)
-else:
-    repo = AddlGitRepo.get()
+from . import profiling
+from .clone_cache import CloneCache
+from .deployment_config import DeploymentConfig
+from .deployment_state import prefetch_deployments, read_deployed_deployments
+from .diff_sinks import DiffSink, open_diff_sink, stdout_reserved_for_diffs
+from .entrypoint import check_entrypoint
+from .fingerprint import local_fingerprint, server_fingerprint
+from .flow_source import attach_source, build_deployment, load_flow_from_checkout
+from .manage_config import get_repo
+from .repo_status import ChangedSince, RepoStatus
+from .state_cache import DeploymentStateCache
 
 console = Console()
 
+# `--plan` exit code when applying the plan would change at least one deployment (0 when nothing would change)
+PLAN_CHANGES_EXIT_CODE = 2
+DEPLOY_POOL_CONCURRENCY = 4  # work pools applying deployments at once, unless `--jobs` is set
+
+# set by `monorepo` to collect `execute_deploy_process` calls instead of running them, and while running
+# several of them concurrently in one process
+_collected_runs: ContextVar[list[dict] | None] = ContextVar("collected_runs", default=None)
+_shared_pipeline: ContextVar[bool] = ContextVar("shared_pipeline", default=False)
+
+
+def __getattr__(name: str):
+    # `repo` used to be resolved when this module was imported; it is now resolved on first use
+    if name == "repo":
+        return get_repo()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def help_text():
     print("""
 `_deloy.py` executes deployment process
@@ -37,10 +63,70 @@ To...
 - update schedules, pass `--schedules`
 - update tags, pass `--tags`
 - update all config, pass `--update-all`
+
+To prep deployments concurrently, pass `--jobs N` (N = max deployments prepped, and work pools deployed, at once)
+To skip deployments that are unchanged on the server, pass `--incremental`
+To load the flow from the local checkout instead of cloning the source, pass `--local-source`
+  (HEAD must be the source branch, pushed: the commit `origin/<branch>` points to)
+To reuse a persistent, commit-keyed clone of the source between runs, pass `--clone-cache`
+To only download server deployment state that changed since the last run, pass `--state-cache`
+To only deploy when the `_deploy.py` directory changed since a git ref (e.g., in CI), pass `--since REF`
+  (compares HEAD with where it branched off REF; `deploy-dependencies` in `[tool.prefect-addl-utils]` maps
+  directories to shared paths)
+To show what would change on the server without deploying or cloning, pass `--plan`
+  (exits with 2 when there are changes and 0 when there are none)
+To write deployment diffs as JSON lines or Markdown instead of the terminal view, pass `--diff-format ndjson|markdown`
+  (add `--diff-file PATH` to append them to a file instead of printing them; printed to stdout, everything else the
+  run prints goes to stderr)
+  (`--diff-format compact|summary` keeps the terminal view, as text-only trees or one line per deployment)
+To time each phase of the deploy, pass `--profile` (prints a summary and writes a JSON report)
+  (`--profile-file PATH` sets the report path; `--profile-memory` adds tracemalloc memory peaks)
 """)
     exit()
 
 
+def __collectable(execute):
+    @functools.wraps(execute)
+    async def wrapper(**kwargs):
+        if (collected_runs := _collected_runs.get()) is not None:
+            collected_runs.append(kwargs)
+            return
+        return await execute(**kwargs)
+
+    return wrapper
+
+
+def __stdout_for_diffs(execute):
+    # `--diff-format ndjson|markdown` without `--diff-file` keeps stdout for the diffs; everything else goes to stderr
+    @functools.wraps(execute)
+    async def wrapper(**kwargs):
+        cli_flags = kwargs.get("cli_flags")
+        cli_flags = sys.argv[1:] if cli_flags is None else cli_flags
+        diff_format = cli_option_value(cli_flags, "--diff-format") or "rich"
+        with stdout_reserved_for_diffs(diff_format, cli_option_value(cli_flags, "--diff-file")):
+            return await execute(**kwargs)
+
+    return wrapper
+
+
+def __profiled(execute):
+    # `--profile` times every phase of the run and reports it when the run ends (including `sys.exit`s)
+    @functools.wraps(execute)
+    async def wrapper(**kwargs):
+        cli_flags = kwargs.get("cli_flags")
+        cli_flags = sys.argv[1:] if cli_flags is None else cli_flags
+        with profiling.profile(
+            "--profile" in cli_flags or "--profile-memory" in cli_flags,
+            trace_memory="--profile-memory" in cli_flags,
+            report_path=cli_option_value(cli_flags, "--profile-file"),
+        ):
+            flow_name = kwargs.get("flow_name") or getattr(kwargs.get("flow"), "name", None)
+            with profiling.span("deploy run", flow=flow_name):
+                return await execute(**kwargs)
+
+    return wrapper
+
+
 def build_entrypoint_str(deploy__file__: str, *, flow_module: str = "flow.py", flow_func: str = "main") -> str:
     """
     Generates "entrypoint" using `_deploy.py` file location (i.e., intended to be used in a flow specific deployment file)
@@ -50,45 +136,92 @@ def build_entrypoint_str(deploy__file__: str, *, flow_module: str = "flow.py", f
       - Example entrypoint result: `/project_root/dir1/flow.py:main`
 
     """
-    relative_from_repo_root = Path(deploy__file__).parent.relative_to(Path(repo.common_dir).parent) / flow_module
+    repo_root = Path(get_repo().common_dir).parent
+    relative_from_repo_root = Path(deploy__file__).parent.relative_to(repo_root) / flow_module
     return f"{relative_from_repo_root.as_posix()}:{flow_func}"
 
 
-class DeploymentConfig(BaseModel):
-    name: str = None
-    version: str
-    work_queue_name: str = "default"
-    job_variables: dict | None = None
-    parameters: dict | None = None
-    description: str | None = None
-    schedules: list[MinimalDeploymentSchedule] | list[DeploymentSchedule] | None = None
-    tags: list | None = None
-
-
+@__collectable
+@__stdout_for_diffs
+@__profiled
 async def execute_deploy_process(
     *,
-    flow: Flow,
+    flow: Flow | None = None,
+    flow_name: str | None = None,
     source: GitRepository,
     entrypoint: str = None,
     flow_path: str = None,
     deployments: list[DeploymentConfig] | DeploymentConfig,
-    work_pool_name: str,
-
-    cwd: str | Path = Path.cwd()
+    work_pool_name: str | None = None,
+    max_concurrency: int | None = None,
+    client: PrefectClient | None = None,
+    incremental: bool = False,
+    source_checkout: str | Path | None = None,
+    local_source: bool = False,
+    clone_cache: CloneCache | None = None,
+    state_cache: DeploymentStateCache | None = None,
+    diff_sink: DiffSink | None = None,
+    since: str | None = None,
+    cli_flags: list[str] | None = None,
+    cwd: str | Path | None = None
 ):
-    cli_flags = sys.argv[1:]
+    if cli_flags is None:
+        cli_flags = sys.argv[1:]
 
     if "--help" in cli_flags:
         help_text()
 
+    if max_concurrency is None and (jobs := cli_option_value(cli_flags, "--jobs")):
+        try:
+            max_concurrency = int(jobs)
+        except ValueError:
+            raise ValueError(f"`--jobs` must be an integer, got '{jobs}'") from None
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("`max_concurrency` (`--jobs`) must be 1 or greater")
+    incremental = incremental or "--incremental" in cli_flags
+    plan = "--plan" in cli_flags
+    local_source = local_source or "--local-source" in cli_flags
+    since = since or cli_option_value(cli_flags, "--since")
+    if clone_cache is None and "--clone-cache" in cli_flags:
+        clone_cache = CloneCache()
+    if state_cache is None and "--state-cache" in cli_flags:
+        state_cache = DeploymentStateCache()
+    owns_diff_sink = diff_sink is None
+    if owns_diff_sink:
+        diff_format = cli_option_value(cli_flags, "--diff-format") or "rich"
+        diff_sink = open_diff_sink(diff_format, cli_option_value(cli_flags, "--diff-file"))
+
+    cwd = cwd or Path.cwd()
     print(cwd)
-    if repo.is_dirty(path=cwd, untracked_files=True):
+    with profiling.span("repo discovery"):
+        repo = get_repo()
+    with profiling.span("dirty check"):
+        is_dirty = RepoStatus.for_repo(repo).is_dirty(cwd)
+    if is_dirty:
         console.print(
             "\n[bold yellow]WARNING:[/bold yellow] Unstaged/uncommitted/untracked changed detected in "
             "the `_deploy.py` directory. When deploying against the deployment source branch uncommitted "
             "changes may be missing from actual deployment. Commit or remove changes and try again.\n"
         )
-        exit()
+        if not plan:
+            exit()
+    if since:
+        with profiling.span("change detection"):
+            affected = ChangedSince.for_repo(repo, since).affects(cwd)
+        if not affected:
+            console.print(
+                f"Nothing in [blue]{cwd}[/blue] or its dependencies changed since [blue]{since}[/blue]; skipping"
+            )
+            if owns_diff_sink:
+                diff_sink.close()
+            if plan and not _shared_pipeline.get():
+                sys.exit(0)
+            return False if plan else None
+
+    if flow_name is None:
+        if flow is None:
+            raise ValueError("`execute_deploy_process` requires `flow` or `flow_name`")
+        flow_name = flow.name
 
     # Determine "entrypoint"
     if flow_path and not entrypoint:
@@ -100,51 +233,307 @@ async def execute_deploy_process(
 
     if not isinstance(deployments, list):
         deployments = [deployments]
-    flow_ready = await flow.from_source(source=source, entrypoint=entrypoint)
-
-    previous_deployments_d = {}
-    with console.status("[bold green]Prepping deployment(s)...\n") as spinner_status:
-        prepped_deployments_l = []
-        for deployment in deployments:
-            deployment_name = f"{flow.name}/{deployment.name}"
-            previous_deployment = await __read_deployment(deployment_name)
-            if previous_deployment:
-                deployment = __deployment_updates(
-                    deployment_name, deployment, previous_deployment, cli_flags, spinner_status
+    if missing_pool := [x.name for x in deployments if not (x.work_pool_name or work_pool_name)]:
+        raise ValueError(f"No `work_pool_name` for deployment(s) {', '.join(missing_pool)}, and no default was given")
+    with profiling.span("check entrypoint"):
+        # parsed, not imported: a wrong entrypoint fails here instead of after cloning and loading the source
+        check_entrypoint(entrypoint, flow_name, repo.working_tree_dir)
+    with profiling.span("load flow"):
+        if plan and flow is not None:
+            # a plan only compares configs with the server, so the locally imported flow stands in for the source
+            flow_ready = attach_source(flow, source, entrypoint)
+        elif plan:
+            flow_ready = await load_flow_from_checkout(source, entrypoint, repo.working_tree_dir)
+        elif source_checkout:
+            flow_ready = await load_flow_from_checkout(source, entrypoint, source_checkout)
+        elif local_source:
+            # load the flow from the working tree instead of cloning; `source` is still what the deployments pull from
+            # at run time, so the working tree must match it
+            __check_local_source(repo, source, entrypoint)
+            console.print(f"Loading flow from local working tree at [blue]{repo.head.commit.hexsha[:12]}[/blue]")
+            flow_ready = await load_flow_from_checkout(source, entrypoint, repo.working_tree_dir)
+        elif clone_cache:
+            with __status("[bold green]Updating cached clone of the source..."):
+                source_checkout = await clone_cache.checkout_source(source)
+            flow_ready = await load_flow_from_checkout(source, entrypoint, source_checkout)
+        else:
+            flow_ready = await Flow.from_source(source=source, entrypoint=entrypoint)
+    if flow_ready.name != flow_name:
+        raise ValueError(f"The flow at `{entrypoint}` is named '{flow_ready.name}', but '{flow_name}' was expected")
+
+    async with nullcontext(client) if client else get_client() as client:
+        with __status("[bold green]Reading existing deployment(s)..."), profiling.span("read deployments"):
+            read_previous = state_cache.read if state_cache else prefetch_deployments
+            previous_deployments_d = await read_previous(client, flow_name, [x.name for x in deployments])
+
+        with __status("[bold green]Prepping deployment(s)...\n") as spinner_status:
+            with profiling.span("prep deployments"):
+                deployments = await __bounded_gather(
+                    [
+                        __merge_previous(flow_name, x, previous_deployments_d, cli_flags, spinner_status)
+                        for x in deployments
+                    ],
+                    len(deployments) if plan else max_concurrency,
                 )
-            deployment.schedules = [
-                MinimalDeploymentSchedule(schedule=x.schedule, active=x.active) for x in deployment.schedules
-            ]
-            deployment_ready = await flow_ready.to_deployment(**deployment.dict())
-            prepped_deployments_l.append(deployment_ready)
-            # add to dictionary, for use in the results section below
-            previous_deployments_d[deployment_name] = previous_deployment
+            applied_l, skipped_l = deployments, []
+            if incremental or plan:
+                with profiling.span("fingerprint"):
+                    applied_l, skipped_l = __split_unchanged(
+                        deployments,
+                        previous_deployments_d,
+                        flow=flow_ready,
+                        source=source,
+                        entrypoint=entrypoint,
+                        work_pool_name=work_pool_name,
+                    )
+            prepped_deployments_l = []
+            for deployment in applied_l:
+                with profiling.span("build deployment", deployment=deployment.name):
+                    options = {**deployment.dict(), "work_pool_name": deployment.work_pool_name or work_pool_name}
+                    prepped_deployments_l.append(build_deployment(flow_ready, **options))
 
-    await deploy(*prepped_deployments_l, work_pool_name=work_pool_name, ignore_warnings=True)
+        if plan:
+            with profiling.span("render plan"):
+                has_changes = __show_plan(
+                    flow_name, prepped_deployments_l, skipped_l, previous_deployments_d, diff_sink
+                )
+            if owns_diff_sink:
+                diff_sink.close()
+            if not _shared_pipeline.get():
+                sys.exit(PLAN_CHANGES_EXIT_CODE if has_changes else 0)
+            return has_changes
+
+        if prepped_deployments_l:
+            with profiling.span("deploy", deployments=len(prepped_deployments_l)):
+                deploy_results = await deploy_by_pool(client, prepped_deployments_l, max_concurrency)
+            __report_deploy_results(flow_name, prepped_deployments_l, deploy_results)
+            sent = [(x, y) for x, y in zip(prepped_deployments_l, deploy_results) if not isinstance(y, BaseException)]
+            failed_names = {x.name for x in prepped_deployments_l} - {x.name for x, _ in sent}
 
-    console.print(Rule(title="Deployment Results", style="white"))
+            console.print(Rule(title="Deployment Results", style="white"))
+            with __status("[bold green]Generating results..."), profiling.span("read results"):
+                updated_deployments_d = await read_deployed_deployments(
+                    client, flow_name, [x for x, _ in sent], [x for _, x in sent], previous_deployments_d
+                )
+            if state_cache:
+                with profiling.span("store state cache"):
+                    state_cache.store_deployed(
+                        str(client.api_url), flow_name, updated_deployments_d, previous_deployments_d
+                    )
+            with profiling.span("render results"):
+                for deployment in applied_l:
+                    if deployment.name in failed_names:
+                        continue  # reported above
+                    name = f"{flow_name}/{deployment.name}"
+                    updated_deployment = updated_deployments_d.get(name)
+                    previous_deployment = previous_deployments_d.get(name)
+                    if updated_deployment is not None:
+                        with profiling.span("render", deployment=deployment.name):
+                            diff_sink.write(rich_deploy.build_diff(name, updated_deployment, previous_deployment))
+                    else:
+                        diff_sink.flush()
+                        console.print(
+                            f"[yellow]***WARNING***:[/yellow] Updated deployment information is missing for [blue]{name}[/blue]. Often, this happens when attempting to deploy changes not yet committed in git.\n"
+                        )
+                diff_sink.flush()
+
+    if incremental:
+        console.print(
+            f"[bold blue]Incremental deploy:[/bold blue] {len(applied_l)} applied, {len(skipped_l)} skipped (unchanged)"
+        )
+        for deployment in skipped_l:
+            console.print(f"  [grey50]skipped[/grey50] {flow_name}/{deployment.name}")
+    if owns_diff_sink:
+        diff_sink.close()
+
+
+def __check_local_source(repo: Repo, source: GitRepository, entrypoint: str):
+    # the dirty check only covers the `_deploy.py` directory, and the entrypoint module may live elsewhere
+    repo_status = RepoStatus.for_repo(repo)
+    if source._branch and not repo_status.head_is_on(source._branch):
+        raise ValueError(
+            f"`--local-source` requires HEAD to be on the source branch '{source._branch}' "
+            f"(HEAD is at {repo.head.commit.hexsha[:12]}); check it out or deploy without `--local-source`"
+        )
+    if source._branch and not repo_status.head_is_pushed(source._branch):
+        # deployments pull `origin/{branch}` at run time, so unpushed (or unfetched) commits would not be what runs
+        raise ValueError(
+            f"`--local-source` requires HEAD ({repo.head.commit.hexsha[:12]}) to match `origin/{source._branch}`, "
+            "which deployments pull at run time; push (or fetch) the branch, or deploy without `--local-source`"
+        )
+    module_path = Path(repo.working_tree_dir) / entrypoint.rsplit(":", 1)[0]
+    if ":" in entrypoint and repo_status.is_dirty(module_path):
+        raise ValueError(
+            f"`--local-source` would deploy uncommitted changes in {module_path}; commit or remove them and try again"
+        )
+
+
+async def deploy_by_pool(
+    client: PrefectClient, deployments: list[RunnerDeployment], max_concurrency: int | None = None
+) -> list[UUID | Exception]:
+    """
+    Applies each deployment to its work pool (`deployment.work_pool_name`), with up to `max_concurrency` (default:
+    `DEPLOY_POOL_CONCURRENCY`) pools applying at once and one deployment at a time within a pool
+    - What prefect's `deploy()` does for image-less deployments, minus its console output: `deploy()` takes a single
+      work pool, and its progress bar and tables interleave when several calls run at once
+    - Returns each deployment's ID, or the exception that kept it from applying, in input order; a failure never stops
+      the other deployments, and a missing work pool fails every deployment in it
+
+    """
+    pools = {}
     for deployment in deployments:
-        name = f"{flow.name}/{deployment.name}"
-        with console.status("[bold green]Generating results..."):
-            updated_deployment = await __read_deployment(name)
-        previous_deployment = previous_deployments_d[name]
-        success = rich_deploy.show_deployment_results(name, updated_deployment, previous_deployment)
-        if success is None:
+        pools.setdefault(deployment.work_pool_name, []).append(deployment)
+
+    async def deploy_pool(work_pool_name: str, pool_deployments: list[RunnerDeployment]) -> list[UUID | Exception]:
+        with profiling.span("deploy pool", work_pool=work_pool_name, deployments=len(pool_deployments)):
+            try:
+                await client.read_work_pool(work_pool_name)
+            except ObjectNotFound as e:
+                raise ValueError(f"Could not find work pool '{work_pool_name}'; create it before deploying") from e
+            results = []
+            for deployment in pool_deployments:
+                try:
+                    results.append(await deployment.apply(work_pool_name=work_pool_name))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    pool_results = await __bounded_gather(
+        [deploy_pool(*x) for x in pools.items()], max_concurrency or DEPLOY_POOL_CONCURRENCY, return_exceptions=True
+    )
+    results_by_deployment = {}
+    for pool_deployments, results in zip(pools.values(), pool_results):
+        for i, deployment in enumerate(pool_deployments):
+            results_by_deployment[id(deployment)] = results if isinstance(results, BaseException) else results[i]
+    return [results_by_deployment[id(x)] for x in deployments]
+
+
+def __report_deploy_results(flow_name: str, deployments: list[RunnerDeployment], results: list[UUID | Exception]):
+    applied_by_pool = {}
+    for deployment, result in zip(deployments, results):
+        applied_by_pool.setdefault(deployment.work_pool_name, 0)
+        if isinstance(result, BaseException):
             console.print(
-                f"[yellow]***WARNING***:[/yellow] Updated deployment information is missing for [blue]{name}[/blue]. Often, this happens when attempting to deploy changes not yet committed in git.\n"
+                f"[bold red]ERROR:[/bold red] [blue]{flow_name}/{deployment.name}[/blue] failed to apply to work pool "
+                f"[blue]{deployment.work_pool_name}[/blue]: {result}"
             )
+        else:
+            applied_by_pool[deployment.work_pool_name] += 1
+    for work_pool_name, applied in applied_by_pool.items():
+        console.print(f"Applied {applied} deployment(s) to work pool [blue]{work_pool_name}[/blue]")
+
+
+async def __bounded_gather(coroutines: list, max_concurrency: int | None, *, return_exceptions: bool = False) -> list:
+    if not max_concurrency or max_concurrency == 1:
+        if not return_exceptions:
+            return [await x for x in coroutines]
+        results = []
+        for coroutine in coroutines:
+            try:
+                results.append(await coroutine)
+            except Exception as e:
+                results.append(e)
+        return results
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(coroutine):
+        async with semaphore:
+            return await coroutine
 
+    # `gather` returns results in input order, so output stays deterministic
+    return await asyncio.gather(*[bounded(x) for x in coroutines], return_exceptions=return_exceptions)
 
-async def __read_deployment(name: str) -> DeploymentResponse:
-    try:
-        async with get_client() as client:
-            deployment_obj = await client.read_deployment_by_name(name)
-            return deployment_obj
-    except ObjectNotFound:
-        return None
 
+async def __merge_previous(
+    flow_name: str,
+    deployment: DeploymentConfig,
+    previous_deployments_d: dict[str, DeploymentResponse],
+    cli_flags: list,
+    spinner_status: Status,
+) -> DeploymentConfig:
+    deployment_name = f"{flow_name}/{deployment.name}"
+    previous_deployment = previous_deployments_d.get(deployment_name)
+    with profiling.span("merge", deployment=deployment.name):
+        if previous_deployment:
+            deployment = await __deployment_updates(
+                deployment_name, deployment, previous_deployment, cli_flags, spinner_status
+            )
+        deployment.schedules = [
+            MinimalDeploymentSchedule(schedule=x.schedule, active=x.active) for x in deployment.schedules or []
+        ]
+    return deployment
 
-def __deployment_updates(
+
+def __split_unchanged(
+    deployments: list[DeploymentConfig],
+    previous_deployments_d: dict[str, DeploymentResponse],
+    *,
+    flow: Flow,
+    source: GitRepository,
+    entrypoint: str,
+    work_pool_name: str,
+) -> tuple[list[DeploymentConfig], list[DeploymentConfig]]:
+    changed_l, unchanged_l = [], []
+    for deployment in deployments:
+        previous_deployment = previous_deployments_d.get(f"{flow.name}/{deployment.name}")
+        fingerprint = local_fingerprint(
+            deployment,
+            flow=flow,
+            source=source,
+            entrypoint=entrypoint,
+            work_pool_name=deployment.work_pool_name or work_pool_name,
+        )
+        if previous_deployment and server_fingerprint(previous_deployment) == fingerprint:
+            unchanged_l.append(deployment)
+        else:
+            changed_l.append(deployment)
+    return changed_l, unchanged_l
+
+
+def __show_plan(
+    flow_name: str,
+    changed_l: list[RunnerDeployment],
+    unchanged_l: list[DeploymentConfig],
+    previous_deployments_d: dict[str, DeploymentResponse],
+    diff_sink: DiffSink,
+) -> bool:
+    console.print(Rule(title=f"Plan: {flow_name}", style="white"))
+    created = 0
+    for deployment in changed_l:
+        name = f"{flow_name}/{deployment.name}"
+        previous_deployment = previous_deployments_d.get(name)
+        created += previous_deployment is None
+        diff_sink.write(rich_deploy.build_diff(name, deployment, previous_deployment))
+    diff_sink.flush()
+    for deployment in unchanged_l:
+        name = f"{flow_name}/{deployment.name}"
+        if isinstance(diff_sink, rich_deploy.RichDiffSink):
+            console.print(f"  [grey50]no changes[/grey50] {name}")
+        else:
+            diff_sink.write(rich_deploy.build_diff(name, previous_deployments_d[name], previous_deployments_d[name]))
+    diff_sink.flush()
+    console.print(
+        f"[bold blue]Plan:[/bold blue] {created} to create, {len(changed_l) - created} to update, "
+        f"{len(unchanged_l)} unchanged"
+    )
+    return bool(changed_l)
+
+
+def __status(message: str) -> Status:
+    # runs sharing one pipeline share `console`, which can only show one live spinner at a time
+    return Status(message, console=Console(quiet=True) if _shared_pipeline.get() else console)
+
+
+def cli_option_value(cli_flags: list, option: str) -> str | None:
+    for i, flag in enumerate(cli_flags):
+        if flag == option and i + 1 < len(cli_flags):
+            return cli_flags[i + 1]
+        if flag.startswith(f"{option}="):
+            return flag.split("=", 1)[1]
+    return None
+
+
+async def __deployment_updates(
     name: str,
     deployment: DeploymentResponse,
     previous_deployment: DeploymentResponse,
@@ -153,18 +542,24 @@ def __deployment_updates(
 ):
     update_all = True if "--update-all" in cli_flags else False
     if "--parameters" in cli_flags or update_all:
-        spinner_status.update(f"{name} [blue]-> [yellow]`parameters`: prepping to update")
-        time.sleep(2)
+        await __pause(spinner_status, f"{name} [blue]-> [yellow]`parameters`: prepping to update")
     else:
         deployment.parameters = previous_deployment.parameters
     if "--schedules" in cli_flags or "--schedule" in cli_flags or update_all:
-        spinner_status.update(f"{name} [blue]-> [yellow]`schedules`: prepping to update")
-        time.sleep(2)
+        await __pause(spinner_status, f"{name} [blue]-> [yellow]`schedules`: prepping to update")
     else:
         deployment.schedules = previous_deployment.schedules
     if "--tags" in cli_flags or update_all:
-        spinner_status.update(f"{name} [blue]-> [yellow]`tags`: prepping to update")
-        time.sleep(2)
+        await __pause(spinner_status, f"{name} [blue]-> [yellow]`tags`: prepping to update")
     else:
         deployment.tags = previous_deployment.tags
     return deployment
+
+
+async def __pause(spinner_status: Status, message: str):
+    # leaves each update message on screen for a moment; timed as its own span so profiles show the wait
+    spinner_status.update(message)
+    if _shared_pipeline.get():
+        return  # the spinner is silent in a shared pipeline (`deploy-all`, `watch`), so there is nothing to read
+    with profiling.span("update message pause"):
+        await asyncio.sleep(2)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+from uuid import UUID
+
+from prefect.client.orchestration import PrefectClient
+from prefect.client.schemas.filters import (
+    DeploymentFilter,
+    DeploymentFilterId,
+    DeploymentFilterName,
+    FlowFilter,
+    FlowFilterName,
+)
+from prefect.client.schemas.responses import DeploymentResponse
+from prefect.deployments.runner import RunnerDeployment
+
+from .deployment_diff import DeploymentDiff
+
+PREFETCH_PAGE_SIZE = 200
+
+
+async def prefetch_deployments(
+    client: PrefectClient, flow_name: str, deployment_names: list[str]
+) -> dict[str, DeploymentResponse]:
+    """
+    Reads every existing deployment in `deployment_names` for `flow_name` using a single client
+    - Filters server side by flow name and deployment name, paging through the results
+    - Returns an index of `{flow_name}/{deployment_name}` -> `DeploymentResponse`, in `deployment_names` order
+      - Deployments that do not exist yet are not included in the index
+
+    """
+    flow_filter, deployment_filter = deployment_name_filters(flow_name, deployment_names)
+
+    index = {}
+    offset = 0
+    while True:
+        page = await client.read_deployments(
+            flow_filter=flow_filter,
+            deployment_filter=deployment_filter,
+            limit=PREFETCH_PAGE_SIZE,
+            offset=offset,
+        )
+        for deployment in page:
+            index[f"{flow_name}/{deployment.name}"] = deployment
+        if len(page) < PREFETCH_PAGE_SIZE:
+            return in_name_order(index, flow_name, deployment_names)
+        offset += PREFETCH_PAGE_SIZE
+
+
+def in_name_order(
+    index: dict[str, DeploymentResponse], flow_name: str, deployment_names: list[str]
+) -> dict[str, DeploymentResponse]:
+    # the server pages in its own order; callers iterate the index in config order
+    return {name: index[name] for name in (f"{flow_name}/{x}" for x in deployment_names) if name in index}
+
+
+def deployment_name_filters(flow_name: str, deployment_names: list[str]) -> tuple[FlowFilter, DeploymentFilter]:
+    flow_filter = FlowFilter(name=FlowFilterName(any_=[flow_name]))
+    deployment_filter = DeploymentFilter(name=DeploymentFilterName(any_=sorted(set(deployment_names))))
+    return flow_filter, deployment_filter
+
+
+async def count_deployments(client: PrefectClient, flow_name: str, deployment_names: list[str]) -> int:
+    """
+    Counts the deployments in `deployment_names` that exist for `flow_name` (the response is a single integer)
+
+    """
+    flow_filter, deployment_filter = deployment_name_filters(flow_name, deployment_names)
+    return await __post_api(
+        client,
+        "/deployments/count",
+        {"flows": flow_filter.dict(json_compatible=True), "deployments": deployment_filter.dict(json_compatible=True)},
+    )
+
+
+async def read_deployments_by_id(client: PrefectClient, deployment_ids: list[UUID]) -> list[DeploymentResponse]:
+    """
+    Reads deployments by ID in one concurrent batch (one filtered request per `PREFETCH_PAGE_SIZE` IDs)
+
+    """
+    chunks = [deployment_ids[i : i + PREFETCH_PAGE_SIZE] for i in range(0, len(deployment_ids), PREFETCH_PAGE_SIZE)]
+    pages = await asyncio.gather(
+        *[
+            client.read_deployments(
+                deployment_filter=DeploymentFilter(id=DeploymentFilterId(any_=chunk)), limit=len(chunk)
+            )
+            for chunk in chunks
+        ]
+    )
+    return [deployment for page in pages for deployment in page]
+
+
+async def read_deployed_deployments(
+    client: PrefectClient,
+    flow_name: str,
+    sent: list[RunnerDeployment],
+    deployment_ids: list[UUID],
+    previous_deployments_d: dict[str, DeploymentResponse],
+) -> dict[str, DeploymentResponse]:
+    """
+    Reads the server state of `sent` after `deploy_by_pool` applied it, skipping anything that provably did not change
+    - A deployment is not re-read when applying it updated the same deployment ID and everything the results
+      output shows (`DeploymentDiff`: entrypoint, tags, schedules, parameters and settings) already matched its
+      previous server state
+    - Everything else is read in one batch using the IDs `deploy_by_pool` returned
+      - Falls back to reading by name when there is not one ID per deployment in `sent`
+
+    """
+    if len(deployment_ids) != len(sent):
+        return await prefetch_deployments(client, flow_name, [x.name for x in sent])
+
+    index = {}
+    names_by_id = {}
+    for deployment, deployment_id in zip(sent, deployment_ids):
+        name = f"{flow_name}/{deployment.name}"
+        previous_deployment = previous_deployments_d.get(name)
+        same_deployment = previous_deployment is not None and previous_deployment.id == deployment_id
+        if same_deployment and matches_sent(deployment, previous_deployment):
+            index[name] = previous_deployment
+        else:
+            names_by_id[deployment_id] = name
+
+    if names_by_id:
+        for deployment in await read_deployments_by_id(client, list(names_by_id)):
+            index[names_by_id[deployment.id]] = deployment
+    return index
+
+
+async def __post_api(client: PrefectClient, path: str, body: dict):
+    # the only call through the private `client._client`: prefect 2's `PrefectClient` has no method for some public
+    # REST endpoints (e.g., `/deployments/count`), and its httpx client carries the API URL, auth and retries
+    response = await client._client.post(path, json=body)
+    return response.json()
+
+
+def matches_sent(sent: RunnerDeployment, server: DeploymentResponse) -> bool:
+    # everything the results diff shows, so a reused server copy renders the same as a re-read one would
+    return not DeploymentDiff.build(server.name, sent, server).changed
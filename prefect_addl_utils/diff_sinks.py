@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import sys
+from contextvars import ContextVar
+from typing import IO, Iterator, Protocol
+
+from .deployment_diff import DeploymentDiff, truncated_repr
+
+DIFF_FORMATS = ("rich", "compact", "summary", "ndjson", "markdown")
+TERMINAL_DIFF_FORMATS = ("rich", "compact", "summary")
+TERMINAL_BATCH_SIZE = 50  # deployments rendered per terminal write
+
+# the real stdout while `stdout_reserved_for_diffs` sends everything else to stderr
+_diff_stdout: ContextVar[IO[str] | None] = ContextVar("diff_stdout", default=None)
+
+
+class DiffSink(Protocol):
+    def write(self, diff: DeploymentDiff): ...
+
+    def flush(self): ...
+
+    def close(self): ...
+
+
+class NdjsonDiffSink:
+    """
+    Writes each `DeploymentDiff` as one JSON line (`DeploymentDiff.to_dict()`), flushed as soon as it is written
+
+    """
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self.closes_stream = stream not in (sys.stdout, sys.stderr, _diff_stdout.get())
+
+    def write(self, diff: DeploymentDiff):
+        self.stream.write(json.dumps(diff.to_dict(), default=str) + "\n")
+        self.stream.flush()
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        if self.closes_stream:
+            self.stream.close()
+
+
+class MarkdownDiffSink:
+    """
+    Writes each `DeploymentDiff` as a compact Markdown section (e.g., for a pull request comment)
+    - Unchanged deployments are one line; only changed schedules, parameters and settings are listed
+
+    """
+
+    def __init__(self, stream: IO[str], *, max_changes: int = 20, max_length: int = 60):
+        self.stream = stream
+        self.closes_stream = stream not in (sys.stdout, sys.stderr, _diff_stdout.get())
+        self.max_changes = max_changes
+        self.max_length = max_length
+
+    def write(self, diff: DeploymentDiff):
+        if not diff.changed:
+            self.stream.write(f"- `{diff.name}`: no changes\n")
+            self.stream.flush()
+            return
+
+        lines = [f"#### `{diff.name}` ({diff.action})", ""]
+        if diff.entrypoint_changed:
+            lines.append(f"- entrypoint: `{diff.old_entrypoint}` → `{diff.entrypoint}`")
+        if diff.tags_added or diff.tags_removed:
+            tags = [f"+`{x}`" for x in diff.tags_added] + [f"-`{x}`" for x in diff.tags_removed]
+            lines.append(f"- tags: {' '.join(tags)}")
+        for schedule in diff.schedules:
+            if schedule.mode is not None:
+                sign = "+" if schedule.mode == "added" else "-"
+                state = "active" if schedule.active else "inactive"
+                lines.append(f"- schedule {sign} `{schedule.schedule}` ({state})")
+        for parameter in diff.parameters:
+            if parameter.mode == "added":
+                lines.append(f"- parameter `{parameter.name}` added: `{self.__value(parameter.new)}`")
+            elif parameter.mode == "removed":
+                lines.append(f"- parameter `{parameter.name}` removed (was `{self.__value(parameter.old)}`)")
+            elif parameter.changes:
+                lines.append(f"- parameter `{parameter.name}`:")
+                for change in parameter.changes[: self.max_changes]:
+                    lines.append(
+                        f"  - `{change.path or '(value)'}`: `{self.__value(change.old)}` → `{self.__value(change.new)}`"
+                    )
+                if (remaining := len(parameter.changes) - self.max_changes) > 0:
+                    lines.append(f"  - ... {remaining} more change(s)")
+            elif parameter.mode == "changed":
+                lines.append(
+                    f"- parameter `{parameter.name}`: `{self.__value(parameter.old)}` → `{self.__value(parameter.new)}`"
+                )
+        for setting in diff.settings:
+            lines.append(f"- {setting.name}: `{self.__value(setting.old)}` → `{self.__value(setting.new)}`")
+        self.stream.write("\n".join(lines) + "\n\n")
+        self.stream.flush()
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        if self.closes_stream:
+            self.stream.close()
+
+    def __value(self, value) -> str:
+        return truncated_repr(value, max_length=self.max_length).replace("`", "'")
+
+
+def open_diff_sink(diff_format: str = "rich", path: str | None = None) -> DiffSink:
+    """
+    Opens the sink for `--diff-format` (`rich`, `compact`, `summary`, `ndjson` or `markdown`), writing to `path`
+    (appended) or stdout
+    - `rich`, `compact` and `summary` always render to the terminal, `TERMINAL_BATCH_SIZE` deployments per write
+    - Inside `stdout_reserved_for_diffs`, "stdout" is the real stdout, not the stderr everything else is sent to
+
+    """
+    if diff_format not in DIFF_FORMATS:
+        raise ValueError(f"`--diff-format` must be one of {', '.join(DIFF_FORMATS)}; got '{diff_format}'")
+    if diff_format in TERMINAL_DIFF_FORMATS:
+        from .deployment_output import RichDiffSink
+
+        mode = "tree" if diff_format == "rich" else diff_format
+        return RichDiffSink(mode=mode, batch_size=TERMINAL_BATCH_SIZE)
+    stream = open(path, "a") if path else _diff_stdout.get() or sys.stdout
+    return NdjsonDiffSink(stream) if diff_format == "ndjson" else MarkdownDiffSink(stream)
+
+
+@contextlib.contextmanager
+def stdout_reserved_for_diffs(diff_format: str = "rich", path: str | None = None) -> Iterator[None]:
+    """
+    Keeps stdout for the diffs while `ndjson` or `markdown` is written to it (no `path`), so it stays parseable
+    - Everything else printed inside (`print`, rich consoles and their spinners) goes to stderr; sinks opened inside
+      still write to stdout
+    - Does nothing for terminal formats or a `path`, and when already inside
+
+    """
+    if diff_format in TERMINAL_DIFF_FORMATS or path or _diff_stdout.get() is not None:
+        yield
+        return
+    token = _diff_stdout.set(sys.stdout)
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            yield
+    finally:
+        _diff_stdout.reset(token)
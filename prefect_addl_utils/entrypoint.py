@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+from pathlib import Path
+from typing import NamedTuple
+
+# parse results per (module content hash, function name); an error reason string when the entrypoint is invalid
+_resolved: dict[tuple[str, str], StaticFlow | str | None] = {}
+# a top-level binding that is not followed (star import, `for`/`with` target, tuple assignment, `globals()`, ...)
+_UNMODELED = ast.Pass()
+# calls that can bind module globals by name
+DYNAMIC_BINDING_CALLS = {"globals", "vars", "exec", "setattr"}
+
+
+class FlowParameter(NamedTuple):
+    name: str
+    kind: str  # "positional", "keyword", "var_positional" or "var_keyword"
+    annotation: str | None  # source text
+    default: str | None  # source text; `None` when the parameter is required
+
+
+class StaticFlow(NamedTuple):
+    function_name: str
+    flow_name: str | None  # `None` when the `name=` passed to `@flow` is not a literal
+    parameters: tuple[FlowParameter, ...]
+    is_async: bool
+
+
+def resolve_entrypoint(entrypoint: str, root: str | Path | None = None) -> StaticFlow | None:
+    """
+    Finds the `@flow` function at `entrypoint` (`path/to/flow.py:func`, relative to `root`) by parsing the module with
+    `ast`, without importing it
+    - Raises `ValueError` when the module is missing or invalid, or the function is missing or not a `@flow`
+    - Returns `None` when it cannot be checked statically (e.g., the function is imported from another module,
+      wrapped by another decorator, or the name may be bound by a star import, a `for`/`with` target, ...); only a
+      module whose every top-level binding of the name is understood is rejected
+    - Cached by module content hash, so an unchanged module is parsed once per process
+
+    """
+    if ":" not in entrypoint:
+        return None  # a `module.path.func` entrypoint is resolved through the import system
+    module_path, function_name = entrypoint.rsplit(":", 1)
+    path = Path(root or ".") / module_path
+    try:
+        source = path.read_bytes()
+    except OSError as e:
+        raise ValueError(f"Invalid entrypoint `{entrypoint}`: cannot read {path} ({e.strerror})") from e
+    key = (hashlib.sha256(source).hexdigest(), function_name)
+    if key not in _resolved:
+        _resolved[key] = __analyze(source, function_name)
+    resolved = _resolved[key]
+    if isinstance(resolved, str):
+        raise ValueError(f"Invalid entrypoint `{entrypoint}`: {resolved}")
+    return resolved
+
+
+def check_entrypoint(entrypoint: str, flow_name: str, root: str | Path | None = None) -> StaticFlow | None:
+    """
+    `resolve_entrypoint`, also raising `ValueError` when the flow is statically known to have another name
+
+    """
+    static_flow = resolve_entrypoint(entrypoint, root)
+    if static_flow and static_flow.flow_name and static_flow.flow_name != flow_name:
+        raise ValueError(
+            f"The flow at `{entrypoint}` is named '{static_flow.flow_name}', but '{flow_name}' was expected"
+        )
+    return static_flow
+
+
+def __analyze(source: bytes, function_name: str) -> StaticFlow | str | None:
+    try:
+        module = ast.parse(source)
+    except SyntaxError as e:
+        return f"the module is not valid Python (line {e.lineno}: {e.msg})"
+    flow_names, prefect_names = set(), set()
+    binding = None
+    functions = {}
+    for node in __top_level(module.body):
+        if isinstance(node, ast.ImportFrom) and node.module == "prefect":
+            flow_names |= {x.asname or x.name for x in node.names if x.name == "flow"}
+        elif isinstance(node, ast.Import):
+            prefect_names |= {x.asname or x.name for x in node.names if x.name == "prefect"}
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions[node.name] = node
+        if function_name in __bound_names(node):
+            binding = node  # the last top-level binding is the one an import would see
+        elif __may_bind(node, function_name):
+            binding = _UNMODELED
+
+    def is_flow(node: ast.expr) -> bool:
+        if isinstance(node, ast.Call):
+            return is_flow(node.func)
+        if isinstance(node, ast.Attribute):
+            return node.attr == "flow" and isinstance(node.value, ast.Name) and node.value.id in prefect_names
+        return isinstance(node, ast.Name) and node.id in flow_names
+
+    if binding is None:
+        return f"there is no top-level `{function_name}` in the module"
+    if binding is _UNMODELED:
+        return None
+    if isinstance(binding, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        decorator = next((x for x in binding.decorator_list if is_flow(x)), None)
+        if decorator is None:
+            return None if binding.decorator_list else f"`{function_name}` is not decorated with `@flow`"
+        return __static_flow(binding, decorator)
+    if isinstance(binding, ast.Assign) and isinstance(binding.value, ast.Call) and is_flow(binding.value.func):
+        # `main = flow(fn)` or `main = flow(name=...)(fn)`
+        wrapped = binding.value.args[0] if binding.value.args else None
+        if isinstance(wrapped, ast.Name) and wrapped.id in functions:
+            decorator = binding.value.func if isinstance(binding.value.func, ast.Call) else binding.value
+            return __static_flow(functions[wrapped.id], decorator)
+    return None
+
+
+def __top_level(body: list[ast.stmt]):
+    # module-level statements, including those in `if`/`try`/`with` blocks (e.g., optional imports)
+    for node in body:
+        yield node
+        if isinstance(node, ast.If):
+            yield from __top_level(node.body + node.orelse)
+        elif isinstance(node, (ast.Try, ast.TryStar)):
+            handlers = [x for y in node.handlers for x in y.body]
+            yield from __top_level(node.body + handlers + node.orelse + node.finalbody)
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            yield from __top_level(node.body)
+
+
+def __may_bind(node: ast.stmt, name: str) -> bool:
+    # whether `node` could bind `name` in a way `__bound_names` does not follow; statements inside `if`/`try`/`with`
+    # blocks are visited on their own, so only a `with` statement's own targets count
+    if isinstance(node, (ast.If, ast.Try, ast.TryStar, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return False  # at module level, a `def`/`class` binds only its own name, which `__bound_names` follows
+    if isinstance(node, (ast.With, ast.AsyncWith)):
+        children = [x for item in node.items for x in ast.walk(item)]
+    else:
+        children = ast.walk(node)
+    for child in children:
+        if isinstance(child, ast.ImportFrom) and any(x.name == "*" for x in child.names):
+            return True
+        if isinstance(child, ast.Name) and child.id == name and isinstance(child.ctx, ast.Store):
+            return True
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and child.name == name:
+            return True
+        if isinstance(child, ast.alias) and (child.asname or child.name).split(".")[0] == name:
+            return True
+        if isinstance(child, ast.Call) and isinstance(child.func, ast.Name) and child.func.id in DYNAMIC_BINDING_CALLS:
+            return True
+    return False
+
+
+def __bound_names(node: ast.stmt) -> set[str]:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return {node.name}
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return {(x.asname or x.name).split(".")[0] for x in node.names}
+    if isinstance(node, ast.Assign):
+        return {x.id for x in node.targets if isinstance(x, ast.Name)}
+    if isinstance(node, (ast.AnnAssign, ast.AugAssign)) and isinstance(node.target, ast.Name):
+        return {node.target.id}
+    return set()
+
+
+def __static_flow(function: ast.FunctionDef | ast.AsyncFunctionDef, decorator: ast.expr) -> StaticFlow:
+    # prefect names a flow after its function (`_` replaced by `-`) unless `name=` is passed
+    flow_name = function.name.replace("_", "-")
+    name_arg = next((x.value for x in getattr(decorator, "keywords", []) if x.arg == "name"), None)
+    if name_arg is not None:
+        is_literal = isinstance(name_arg, ast.Constant) and isinstance(name_arg.value, str)
+        flow_name = name_arg.value if is_literal else None
+    return StaticFlow(
+        function_name=function.name,
+        flow_name=flow_name,
+        parameters=tuple(__parameters(function.args)),
+        is_async=isinstance(function, ast.AsyncFunctionDef),
+    )
+
+
+def __parameters(arguments: ast.arguments):
+    def text(node: ast.expr | None) -> str | None:
+        return ast.unparse(node) if node is not None else None
+
+    positional = arguments.posonlyargs + arguments.args
+    defaults = [None] * (len(positional) - len(arguments.defaults)) + arguments.defaults
+    for argument, default in zip(positional, defaults):
+        yield FlowParameter(argument.arg, "positional", text(argument.annotation), text(default))
+    if arguments.vararg:
+        yield FlowParameter(arguments.vararg.arg, "var_positional", text(arguments.vararg.annotation), None)
+    for argument, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+        yield FlowParameter(argument.arg, "keyword", text(argument.annotation), text(default))
+    if arguments.kwarg:
+        yield FlowParameter(arguments.kwarg.arg, "var_keyword", text(arguments.kwarg.annotation), None)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import TYPE_CHECKING
+
+from prefect.client.schemas.responses import DeploymentResponse
+
+if TYPE_CHECKING:
+    from prefect import Flow
+    from prefect.runner.storage import GitRepository
+
+    from .deployment_process import DeploymentConfig
+
+
+def local_fingerprint(
+    deployment: DeploymentConfig, *, flow: Flow, source: GitRepository, entrypoint: str, work_pool_name: str
+) -> str:
+    """
+    Fingerprints what applying `deployment` would send
+    - Mirrors the defaults prefect fills in from the flow (version, description) and for empty job variables
+    - Source and code changes are covered by the source's pull step and the flow's parameter schema, which is
+      everything about the code the server keeps; the flow itself is pulled from the branch at run time
+
+    """
+    return __fingerprint(
+        entrypoint=entrypoint,
+        pull_steps=[source.to_pull_step()],
+        parameter_openapi_schema=flow.parameters.dict(),
+        parameters=deployment.parameters or {},
+        schedules=deployment.schedules or [],
+        tags=deployment.tags or [],
+        job_variables=deployment.job_variables or {},
+        description=deployment.description or flow.description,
+        version=deployment.version or flow.version,
+        work_queue_name=deployment.work_queue_name,
+        work_pool_name=work_pool_name,
+    )
+
+
+def server_fingerprint(deployment: DeploymentResponse) -> str:
+    """
+    Fingerprints the server copy of a deployment over the same fields as `local_fingerprint`
+
+    """
+    return __fingerprint(
+        entrypoint=deployment.entrypoint,
+        pull_steps=deployment.pull_steps or [],
+        parameter_openapi_schema=deployment.parameter_openapi_schema or {},
+        parameters=deployment.parameters or {},
+        schedules=deployment.schedules or [],
+        tags=deployment.tags or [],
+        job_variables=deployment.job_variables or {},
+        description=deployment.description,
+        version=deployment.version,
+        work_queue_name=deployment.work_queue_name,
+        work_pool_name=deployment.work_pool_name,
+    )
+
+
+def __fingerprint(*, schedules: list, tags: list, **fields) -> str:
+    fields["schedules"] = sorted(
+        json.dumps([x.active, json.loads(x.schedule.json())], sort_keys=True) for x in schedules
+    )
+    fields["tags"] = sorted(tags)
+    canonical = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import threading
+from pathlib import Path
+
+from prefect import Flow
+from prefect.deployments.runner import RunnerDeployment
+from prefect.flows import load_flow_from_entrypoint
+from prefect.runner.storage import GitRepository
+
+# prefect's script loader swaps `sys.modules`/`sys.path` entries while it runs, so only one flow loads at a time
+FLOW_LOAD_LOCK = threading.Lock()
+
+
+async def pull_source(source: GitRepository, base_path: Path) -> Path:
+    """
+    Pulls `source` into `base_path` and returns the checkout directory
+    - Pulls with a copy of `source`, so the caller's storage object keeps its own base path
+
+    """
+    storage = copy.copy(source)
+    storage.set_base_path(Path(base_path))
+    await storage.pull_code()
+    return storage.destination
+
+
+async def load_flow_from_checkout(source: GitRepository, entrypoint: str, checkout_dir: Path) -> Flow:
+    """
+    Loads the flow at `entrypoint` from an existing checkout of `source` (i.e., `flow.from_source` without the pull)
+    - `source` is still recorded as the flow's storage, so deployments built from it pull from `source`
+
+    """
+    flow = await asyncio.to_thread(__load_flow, str(Path(checkout_dir) / entrypoint))
+    flow._storage = source
+    flow._entrypoint = entrypoint
+    return flow
+
+
+def attach_source(flow: Flow, source: GitRepository, entrypoint: str) -> Flow:
+    """
+    Returns a copy of a locally imported `flow` that deployments are built from as if it was loaded from `source`
+    - Nothing is pulled; only use it when the local flow matches `source` (e.g., for `--plan`)
+
+    """
+    flow = copy.copy(flow)
+    flow._storage = source
+    flow._entrypoint = entrypoint
+    return flow
+
+
+def build_deployment(flow: Flow, *, name: str, schedules: list | None = None, **kwargs) -> RunnerDeployment:
+    """
+    Builds the `RunnerDeployment` that `flow.to_deployment(...)` would for a flow loaded from a source
+    - `to_deployment` pulls the source and re-loads the flow for every deployment; this reuses the loaded flow
+    - Sets the private attributes `RunnerDeployment.from_storage` sets (prefect is pinned below 3, and
+      `test_build_deployment_matches_from_storage` fails when they change)
+
+    """
+    storage = flow._storage
+    deployment = RunnerDeployment(
+        name=Path(name).stem,
+        flow_name=flow.name,
+        schedules=RunnerDeployment._construct_deployment_schedules(schedules=schedules),
+        entrypoint=flow._entrypoint,
+        storage=storage,
+        tags=kwargs.pop("tags", None) or [],
+        parameters=kwargs.pop("parameters", None) or {},
+        job_variables=kwargs.pop("job_variables", None) or {},
+        **kwargs,
+    )
+    deployment._path = f"$STORAGE_BASE_PATH/{storage.destination.name}"
+    # what `deployment._set_defaults_from_flow(flow)` does, reusing the schema the flow generated when it was loaded
+    # instead of regenerating it for every deployment
+    deployment._parameter_openapi_schema = flow.parameters
+    deployment.version = deployment.version or flow.version
+    deployment.description = deployment.description or flow.description
+    return deployment
+
+
+def __load_flow(full_entrypoint: str) -> Flow:
+    with FLOW_LOAD_LOCK:
+        return load_flow_from_entrypoint(full_entrypoint)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import functools
+import os
+import sys
 from pathlib import Path
 
 import tomllib
@@ -7,85 +10,156 @@ from git import Repo
 from git.exc import InvalidGitRepositoryError
 
 
+@functools.cache
+def get_repo() -> Repo:
+    """
+    Resolves the git repo used for entrypoints and dirty checks, once per process
+    - Uses `$GIT_REPO_ROOT` when set, otherwise discovers it with `AddlGitRepo.get()`
+
+    """
+    if get_repo_envar := os.environ.get("GIT_REPO_ROOT"):
+        return Repo(get_repo_envar)
+    return AddlGitRepo.get()
+
+
+def default_cache_dir() -> Path:
+    """
+    Directory for prefect-addl-utils' on-disk caches: `$PREFECT_ADDL_UTILS_CACHE_DIR`, else the user cache directory
+
+    """
+    if cache_dir := os.environ.get("PREFECT_ADDL_UTILS_CACHE_DIR"):
+        return Path(cache_dir)
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "prefect-addl-utils"
+
+
+class ProjectContext:
+    """
+    Project settings for a directory, found with one upward walk from it
+    - `pyproject_path`: nearest `pyproject.toml`; `config`: its `[tool.prefect-addl-utils]` table (`{}` when absent)
+    - `git_root`: nearest directory with a `.git` (directory, or file for worktrees/submodules)
+    - Memoized per starting directory; re-read when the `pyproject.toml` modification time changes
+    - `Repo` objects are shared by every context resolving to the same root
+
+    """
+
+    _instances: dict[Path, ProjectContext] = {}
+    _repos: dict[Path, Repo] = {}
+
+    def __init__(self, start: Path, pyproject_path: Path | None, git_root: Path | None):
+        self.start = start
+        self.pyproject_path = pyproject_path
+        self.git_root = git_root
+        self.pyproject_mtime = self.__mtime(pyproject_path)
+        self.config: dict = {}
+        if pyproject_path:
+            with open(pyproject_path, "rb") as f:
+                self.config = tomllib.load(f).get("tool", {}).get("prefect-addl-utils") or {}
+
+    @classmethod
+    def discover(cls, start: str | Path | None = None) -> ProjectContext:
+        start = Path(start or Path.cwd()).resolve()
+        context = cls._instances.get(start)
+        if context is None or cls.__mtime(context.pyproject_path) != context.pyproject_mtime:
+            context = cls._instances[start] = cls.__walk(start)
+        return context
+
+    @classmethod
+    def clear_cache(cls):
+        cls._instances.clear()
+        cls._repos.clear()
+
+    @property
+    def repo_root(self) -> Path:
+        """
+        Directory of the git repo to use
+        - `git-repo-root` from `[tool.prefect-addl-utils]` (relative to the `pyproject.toml`; `.` is its directory)
+        - Otherwise, the nearest directory with a `.git`
+
+        """
+        if self.config:
+            repo_root = (self.pyproject_path.parent / self.config.get("git-repo-root", ".")).resolve()
+            if not repo_root.is_dir():
+                raise RuntimeError(
+                    f"'git-repo-root' found in {self.pyproject_path} points to '{repo_root}', "
+                    "but that directory was not found."
+                )
+            return repo_root
+        if self.git_root is None:
+            raise RuntimeError(f"prefect-addl-utils could not find a git repo in {self.start} or its parents")
+        return self.git_root
+
+    @property
+    def repo(self) -> Repo:
+        repo_root = self.repo_root
+        if repo_root not in self._repos:
+            try:
+                self._repos[repo_root] = Repo(repo_root)
+            except InvalidGitRepositoryError:
+                raise RuntimeError(
+                    f"'git-repo-root' in [tool.prefect-addl-utils] from {self.pyproject_path} configured {repo_root} "
+                    "as a directory to find a git repo, but no `.git` file was found."
+                )
+        return self._repos[repo_root]
+
+    @classmethod
+    def __walk(cls, start: Path) -> ProjectContext:
+        pyproject_path = git_root = None
+        for path in [start, *start.parents]:
+            if pyproject_path is None and (path / "pyproject.toml").is_file():
+                pyproject_path = path / "pyproject.toml"
+            if git_root is None and (path / ".git").exists():
+                git_root = path
+            if pyproject_path and git_root:
+                break
+        return cls(start, pyproject_path, git_root)
+
+    @staticmethod
+    def __mtime(path: Path | None) -> int | None:
+        try:
+            return path.stat().st_mtime_ns if path else None
+        except FileNotFoundError:
+            return None
+
+
 class AddlGitRepo:
     def find_pyproject_toml(return_none: bool = False) -> Path:
-        cwd = Path.cwd()
-        candidates = [cwd]
-        candidates.extend(cwd.parents)
-
-        for path in candidates:
-            config_file = path / 'pyproject.toml'
-            if config_file.exists():
-                return config_file
-        else:
-            if return_none is True:
-                return None
+        context = ProjectContext.discover()
+        if context.pyproject_path is None and return_none is not True:
             raise RuntimeError(
-                'prefect-addl-utils could not find a pyproject.toml file in {} or its parents'.format(cwd)
+                'prefect-addl-utils could not find a pyproject.toml file in {} or its parents'.format(context.start)
             )
+        return context.pyproject_path
 
     def read_pyproject_toml(pyproject_toml_path: str | Path, return_none: bool = False) -> dict:
-        with open(pyproject_toml_path, 'rb') as f:
-            config = tomllib.load(f)
-        addl_config = config.get("tool").get("prefect-addl-utils")
+        addl_config = ProjectContext.discover(Path(pyproject_toml_path).parent).config
         if not addl_config:
             if return_none is True:
                 return
             raise RuntimeError(
-                "prefect-addl-utils found a pyproject.toml file in {}, "
+                f"prefect-addl-utils found a pyproject.toml file in {pyproject_toml_path}, "
                 "but did not find a section labelled 'tool.prefect-addl-utils'"
             )
         return addl_config
-        
 
     def config_repo_root(return_none: bool = False):
-        pyproject_toml_path: Path = AddlGitRepo.find_pyproject_toml(return_none)
-        addl_config = AddlGitRepo.read_pyproject_toml(pyproject_toml_path, return_none)
-        if not addl_config and return_none is True:
-            return
-        else:
-            print(f"Using `pyproject.toml` from {pyproject_toml_path}")
-            repo_root = addl_config.get("git-repo-root")
-        if repo_root in (None, "."):
-            repo_root = pyproject_toml_path.parent
-        try:
-            repo_root.exists()
-            return repo_root
-        except AttributeError as e:
-            if "object has no attribute 'exists'" not in str(e):
-                raise AttributeError(e) from e
-        if return_none is True:
-            return
-        raise RuntimeError(
-            f"'git-repo-root' found in {pyproject_toml_path} points to '{repo_root}', but that directory was not found."
-        )
+        context = ProjectContext.discover()
+        if not context.config:
+            if return_none is True:
+                return
+            raise RuntimeError(
+                f"prefect-addl-utils did not find a 'tool.prefect-addl-utils' section from {context.start}"
+            )
+        return context.repo_root
 
     @staticmethod
     def get():
-        if path := AddlGitRepo.config_repo_root(return_none=True):
-            try:
-                candidates = [path]
-            except InvalidGitRepositoryError:
-                raise RuntimeError(
-                    f"'git-repo-root' in [tools.prefect-addl-utils] from `pyproject.toml` configured {path} as a "
-                    "directory to find a git repo, but no `.git` file was found."
-                )
-        else:
-            cwd = Path.cwd()
-            candidates = [cwd]
-            candidates.extend(cwd.parents)
-
-        for path in candidates:
-            try:
-                repo = Repo(path)
-                print(f"Using git project from: {Path(repo.common_dir).parent}")
-                return repo
-            except InvalidGitRepositoryError:
-                pass
-        else:
-            raise RuntimeError(
-                'prefect-addl-utils could not find a pyproject.toml file in {} or its parents'.format(cwd)
-            )
+        # diagnostics go to stderr: `get_repo()` can run before a `--diff-format ndjson` run reserves stdout
+        context = ProjectContext.discover()
+        if context.config:
+            print(f"Using `pyproject.toml` from {context.pyproject_path}", file=sys.stderr)
+        repo = context.repo
+        print(f"Using git project from: {Path(repo.common_dir).parent}", file=sys.stderr)
+        return repo
 
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import tomllib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pendulum
+from prefect.client.schemas.objects import MinimalDeploymentSchedule
+from prefect.client.schemas.schedules import CronSchedule, IntervalSchedule, RRuleSchedule
+from prefect.runner.storage import GitRepository
+from prefect.utilities.asyncutils import sync_compatible
+from pydantic.v1 import BaseModel, Extra, PrivateAttr, ValidationError, root_validator
+
+from .deployment_config import DeploymentConfig
+
+MANIFEST_NAME = "_deploy.toml"
+# prefect anchors intervals at "now" by default, which would make every parse of a manifest a schedule change
+INTERVAL_ANCHOR_DATE = datetime(2020, 1, 1)
+
+
+class ManifestModel(BaseModel):
+    class Config:
+        extra = Extra.forbid  # a misspelled key is an error, not a silently ignored setting
+
+
+class ManifestSchedule(ManifestModel):
+    cron: str | None = None
+    interval: float | None = None  # seconds
+    rrule: str | None = None
+    timezone: str | None = None
+    anchor_date: datetime | None = None  # defaults to `INTERVAL_ANCHOR_DATE` in `timezone`
+    day_or: bool = True
+    active: bool = True
+
+    @root_validator(skip_on_failure=True)
+    def __one_schedule_kind(cls, values):
+        kinds = [x for x in ("cron", "interval", "rrule") if values.get(x) is not None]
+        if len(kinds) != 1:
+            raise ValueError(f"a schedule needs exactly one of `cron`, `interval` or `rrule` (got {kinds or 'none'})")
+        return values
+
+    def to_schedule(self) -> MinimalDeploymentSchedule:
+        if self.cron is not None:
+            schedule = CronSchedule(cron=self.cron, timezone=self.timezone, day_or=self.day_or)
+        elif self.interval is not None:
+            anchor_date = self.anchor_date or pendulum.instance(INTERVAL_ANCHOR_DATE, tz=self.timezone or "UTC")
+            schedule = IntervalSchedule(
+                interval=timedelta(seconds=self.interval), anchor_date=anchor_date, timezone=self.timezone
+            )
+        else:
+            schedule = RRuleSchedule(rrule=self.rrule, timezone=self.timezone)
+        return MinimalDeploymentSchedule(schedule=schedule, active=self.active)
+
+
+class ManifestFlow(ManifestModel):
+    name: str
+    entrypoint: str | None = None  # relative to the git project root; defaults to `flow.py:main` next to the manifest
+    work_pool_name: str | None = None  # default for deployments that do not set their own
+
+
+class ManifestSource(ManifestModel):
+    url: str
+    branch: str | None = None
+    name: str | None = None
+    access_token_secret: str | None = None  # name of the Secret block holding the token for a private repository
+    include_submodules: bool = False
+
+    @sync_compatible
+    async def to_storage(self) -> GitRepository:
+        credentials = None
+        if self.access_token_secret:
+            from .variables import resolve_values
+
+            resolved = await resolve_values(secrets=[self.access_token_secret])
+            credentials = {"access_token": resolved.secrets[self.access_token_secret]}
+        return GitRepository(
+            url=self.url,
+            branch=self.branch,
+            name=self.name,
+            credentials=credentials,
+            include_submodules=self.include_submodules,
+        )
+
+
+class ManifestDeployment(ManifestModel):
+    name: str | None = None
+    version: str | None = None
+    work_queue_name: str | None = None
+    work_pool_name: str | None = None
+    job_variables: dict | None = None
+    parameters: dict | None = None
+    description: str | None = None
+    description_file: str | None = None  # relative to the manifest
+    schedules: list[ManifestSchedule] | None = None
+    tags: list[str] | None = None
+
+
+class DeploymentManifest(ManifestModel):
+    """
+    Declarative alternative to a `_deploy.py`: a `_deploy.toml` that maps directly onto `DeploymentConfig`s
+    - Parsed and validated without importing the flow or contacting the API; the flow is only loaded at deploy time
+    - `[defaults]` applies to every `[[deployments]]` entry: `parameters` and `job_variables` merge key by key,
+      every other field is replaced by the entry's value
+
+    """
+
+    flow: ManifestFlow
+    source: ManifestSource
+    defaults: ManifestDeployment = ManifestDeployment()
+    deployments: list[ManifestDeployment]
+    _path: Path | None = PrivateAttr(default=None)
+
+    @classmethod
+    def load(cls, path: str | Path) -> DeploymentManifest:
+        path = Path(path)
+        try:
+            with open(path, "rb") as f:
+                manifest = cls.parse_obj(tomllib.load(f))
+        except (tomllib.TOMLDecodeError, ValidationError) as e:
+            raise ValueError(f"Invalid deployment manifest {path}:\n{e}") from e
+        manifest._path = path.resolve()
+        return manifest
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    def deployment_configs(self) -> list[DeploymentConfig]:
+        configs = []
+        for entry in self.deployments:
+            fields = {**self.defaults.dict(exclude_none=True), **entry.dict(exclude_none=True)}
+            for merged in ("parameters", "job_variables"):
+                if getattr(self.defaults, merged) is not None and getattr(entry, merged) is not None:
+                    fields[merged] = {**getattr(self.defaults, merged), **getattr(entry, merged)}
+            if description_file := fields.pop("description_file", None):
+                fields.setdefault("description", (self.path.parent / description_file).read_text())
+            schedules = entry.schedules if entry.schedules is not None else self.defaults.schedules
+            fields["schedules"] = [x.to_schedule() for x in schedules or []]
+            if fields.get("name") is None:
+                raise ValueError(f"Every deployment in {self.path} needs a `name`")
+            try:
+                configs.append(DeploymentConfig(**fields))
+            except ValidationError as e:
+                raise ValueError(f"Invalid deployment '{fields['name']}' in {self.path}:\n{e}") from e
+        return configs
+
+    @sync_compatible
+    async def run_kwargs(self) -> dict:
+        """
+        The `execute_deploy_process` keyword arguments this manifest describes
+        - Only contacts the API to load the source's `access_token_secret`; works from sync code and with `await`
+
+        """
+        from .deployment_process import build_entrypoint_str
+
+        return {
+            "flow_name": self.flow.name,
+            "source": await self.source.to_storage(),
+            "entrypoint": self.flow.entrypoint or build_entrypoint_str(str(self.path)),
+            "deployments": self.deployment_configs(),
+            "work_pool_name": self.flow.work_pool_name,
+            "cwd": self.path.parent,
+        }
+
+
+async def deploy_manifest(path: str | Path, *, cli_flags: list[str] | None = None, **kwargs):
+    """
+    Deploys a `_deploy.toml` the same way a `_deploy.py` with `execute_deploy_process` would
+    - `kwargs` are passed to `execute_deploy_process` (e.g., `client`, `state_cache`)
+
+    """
+    from .deployment_process import execute_deploy_process
+
+    run = await DeploymentManifest.load(path).run_kwargs()
+    return await execute_deploy_process(**run, cli_flags=cli_flags, **kwargs)
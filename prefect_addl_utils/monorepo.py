@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import runpy
+import sys
+import tempfile
+from pathlib import Path
+
+from prefect import get_client
+from rich.console import Console
+
+from . import deployment_process, profiling
+from .clone_cache import CloneCache
+from .diff_sinks import open_diff_sink, stdout_reserved_for_diffs
+from .entrypoint import check_entrypoint
+from .flow_source import pull_source
+from .manage_config import get_repo
+from .manifest import MANIFEST_NAME, DeploymentManifest
+from .repo_status import ChangedSince, RepoStatus
+
+DEPLOY_SCRIPT_NAME = "_deploy.py"
+SKIP_DIRS = {"__pycache__", "node_modules", "venv"}
+
+console = Console()
+
+
+def discover_deploy_scripts(root: str | Path) -> list[Path]:
+    """
+    Finds every `_deploy.py` and `_deploy.toml` manifest under `root`, skipping hidden directories (`.git`, `.venv`,
+    ...) and build clutter
+    - A directory with both deploys both
+
+    """
+    scripts = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(x for x in dirnames if not x.startswith(".") and x not in SKIP_DIRS)
+        scripts += [Path(dirpath) / x for x in (DEPLOY_SCRIPT_NAME, MANIFEST_NAME) if x in filenames]
+    return scripts
+
+
+def collect_deploy_runs(script: Path, cli_flags: list[str]) -> list[dict]:
+    """
+    Executes a `_deploy.py` as `__main__` and returns the `execute_deploy_process` calls it makes, without running them
+    - The script's directory is put first on `sys.path` (for `from flow import main`), and modules imported from
+      it are dropped afterwards so the next script's `flow` module is not shadowed by this one
+    - Runs that do not pass `cwd` get the script's directory, as if the script was run from there
+
+    """
+    script = Path(script).resolve()
+    script_dir = script.parent
+    collected_runs = []
+    token = deployment_process._collected_runs.set(collected_runs)
+    saved_argv, saved_path, saved_cwd = sys.argv, list(sys.path), os.getcwd()
+    try:
+        sys.argv = [str(script), *cli_flags]
+        sys.path.insert(0, str(script_dir))
+        os.chdir(script_dir)
+        runpy.run_path(str(script), run_name="__main__")
+    finally:
+        deployment_process._collected_runs.reset(token)
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        os.chdir(saved_cwd)
+        __drop_modules_under(script_dir)
+
+    for run in collected_runs:
+        run.setdefault("cwd", script_dir)
+    return collected_runs
+
+
+async def run_deploy_runs(runs: list[dict], *, cli_flags: list[str], max_concurrency: int = 4):
+    """
+    Runs collected `execute_deploy_process` calls through one shared pipeline
+    - One API client for every run
+    - Each distinct source is pulled once, and every run using it loads its flow from that checkout
+      - With `--local-source` nothing is pulled; every run loads its flow from the local working tree
+      - With `--clone-cache` sources are checked out from the persistent clone cache instead of a fresh pull
+      - With `--plan` nothing is pulled or deployed; returns whether each run's plan has changes
+    - Up to `max_concurrency` runs (flows) deploy at the same time
+    - Every run writes its deployment diffs to one shared sink (`--diff-format`/`--diff-file`)
+
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        checkouts = {}
+        if "--local-source" not in cli_flags and "--plan" not in cli_flags:
+            sources = {__source_key(x["source"]): x["source"] for x in runs}
+            clone_cache = CloneCache() if "--clone-cache" in cli_flags else None
+            with console.status(f"[bold green]Pulling {len(sources)} source(s)..."), profiling.span("pull sources"):
+                pulled = await asyncio.gather(
+                    *[
+                        clone_cache.checkout_source(x) if clone_cache else pull_source(x, Path(tmpdir) / str(i))
+                        for i, x in enumerate(sources.values())
+                    ]
+                )
+            checkouts = dict(zip(sources, pulled))
+
+        token = deployment_process._shared_pipeline.set(True)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        diff_sink = open_diff_sink(
+            deployment_process.cli_option_value(cli_flags, "--diff-format") or "rich",
+            deployment_process.cli_option_value(cli_flags, "--diff-file"),
+        )
+        try:
+            async with get_client() as client:
+
+                async def bounded_run(run: dict):
+                    async with semaphore:
+                        return await deployment_process.execute_deploy_process(
+                            **run,
+                            client=client,
+                            diff_sink=diff_sink,
+                            source_checkout=checkouts.get(__source_key(run["source"])),
+                            cli_flags=cli_flags,
+                        )
+
+                return await asyncio.gather(*[bounded_run(x) for x in runs])
+        finally:
+            deployment_process._shared_pipeline.reset(token)
+            diff_sink.close()
+
+
+def deploy_all(root: str | Path, *, cli_flags: list[str], max_concurrency: int = 4):
+    """
+    Discovers every `_deploy.py` and `_deploy.toml` under `root` and deploys them all from this one process
+    - Manifests are read without importing their flows (entrypoints are checked by parsing the flow module); each
+      flow is only loaded when its run deploys it
+    - Directories with uncommitted changes are skipped (a standalone `_deploy.py` run would refuse to deploy them)
+    - With `--since REF`, directories where nothing (including their `deploy-dependencies`) changed on HEAD since it
+      branched off REF are skipped before their `_deploy.py` is even imported
+    - With `--plan`, exits with `PLAN_CHANGES_EXIT_CODE` when any deployment would change, and 0 otherwise
+    - With `--profile`, reports one profile for discovery, loading and every run
+    - With `--diff-format ndjson|markdown` and no `--diff-file`, only the diffs are printed to stdout
+
+    """
+    diff_format = deployment_process.cli_option_value(cli_flags, "--diff-format") or "rich"
+    with (
+        stdout_reserved_for_diffs(diff_format, deployment_process.cli_option_value(cli_flags, "--diff-file")),
+        profiling.profile(
+            "--profile" in cli_flags or "--profile-memory" in cli_flags,
+            trace_memory="--profile-memory" in cli_flags,
+            report_path=deployment_process.cli_option_value(cli_flags, "--profile-file"),
+        ),
+    ):
+        runs = []
+        with profiling.span("discover"):
+            repo_status = RepoStatus.for_repo(get_repo())
+            scripts = discover_deploy_scripts(root)
+        if since := deployment_process.cli_option_value(cli_flags, "--since"):
+            with profiling.span("change detection"):
+                changes = ChangedSince.for_repo(get_repo(), since)
+                unchanged = [x for x in scripts if not changes.affects(x.parent)]
+            console.print(
+                f"{len(scripts) - len(unchanged)} of {len(scripts)} deploy scripts changed since [blue]{since}[/blue]"
+            )
+            for script in unchanged:
+                console.print(f"  [grey50]unchanged[/grey50] {script}")
+            scripts = [x for x in scripts if x not in unchanged]
+        for script in scripts:
+            if repo_status.is_dirty(script.parent):
+                console.print(f"[bold yellow]WARNING:[/bold yellow] skipping {script} (uncommitted changes)")
+                continue
+            console.print(f"Loading [blue]{script}[/blue]")
+            with profiling.span("collect", script=str(script)):
+                if script.name == MANIFEST_NAME:
+                    run = DeploymentManifest.load(script).run_kwargs()
+                    check_entrypoint(run["entrypoint"], run["flow_name"], repo_status.root)
+                    runs.append(run)
+                else:
+                    runs += collect_deploy_runs(script, cli_flags)
+
+        results = []
+        if runs:
+            results = asyncio.run(run_deploy_runs(runs, cli_flags=cli_flags, max_concurrency=max_concurrency))
+    if "--plan" in cli_flags:
+        sys.exit(deployment_process.PLAN_CHANGES_EXIT_CODE if any(results) else 0)
+    return runs
+
+
+def __source_key(source) -> str:
+    return json.dumps(source.to_pull_step(), sort_keys=True, default=str)
+
+
+def __drop_modules_under(directory: Path):
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if module_file and Path(module_file).resolve().is_relative_to(directory):
+            del sys.modules[name]
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import functools
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from rich.console import Console
+from rich.table import Table, box
+
+from .manage_config import default_cache_dir
+
+console = Console()
+
+SpanHook = Callable[["Span"], None]
+_span_hooks: list[SpanHook] = []
+
+_profiler: ContextVar[Profiler | None] = ContextVar("_profiler", default=None)
+_open_spans: ContextVar[tuple[Span, ...]] = ContextVar("_open_spans", default=())
+
+
+class Span:
+    """
+    One timed phase or step
+    - `requests` counts HTTP requests sent while the span was open (including by nested spans)
+    - `peak_bytes` is the traced memory peak while the span was open (only with `trace_memory`)
+
+    """
+
+    __slots__ = ("name", "attributes", "parent", "start", "duration", "requests", "peak_bytes")
+
+    def __init__(self, name: str, attributes: dict, parent: Span | None, start: float):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.start = start
+        self.duration: float | None = None
+        self.requests = 0
+        self.peak_bytes: int | None = None
+
+    @property
+    def path(self) -> str:
+        return f"{self.parent.path}/{self.name}" if self.parent else self.name
+
+    def to_dict(self, started: float) -> dict:
+        return {
+            "name": self.name,
+            "path": self.path,
+            "attributes": self.attributes,
+            "start": round(self.start - started, 6),
+            "duration": round(self.duration, 6) if self.duration is not None else None,
+            "requests": self.requests,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+class Profiler:
+    """
+    Records spans for deploy phases and per-deployment steps
+    - Spans are opened with the module-level `span(...)`, which does nothing unless a profiler is active
+    - Every finished span is passed to the hooks registered with `add_span_hook`
+    - `trace_memory=True` runs `tracemalloc` (slow; use it to find memory peaks, not for timings)
+
+    """
+
+    # `httpx.AsyncClient.send` before and after the request counter was installed, and how many profilers are active
+    _patched_send: tuple[Callable, Callable] | None = None
+    _activations = 0
+
+    def __init__(self, *, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.spans: list[Span] = []
+        self.started = time.perf_counter()
+        self._open: set[Span] = set()
+
+    @contextmanager
+    def activate(self):
+        Profiler.__install_request_counter()
+        started_tracemalloc = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start()
+        token = _profiler.set(self)
+        try:
+            yield self
+        finally:
+            _profiler.reset(token)
+            if started_tracemalloc:
+                tracemalloc.stop()
+            Profiler.__remove_request_counter()
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        open_spans = _open_spans.get()
+        span_ = Span(name, attributes, open_spans[-1] if open_spans else None, time.perf_counter())
+        self.__sample_memory()
+        self._open.add(span_)
+        token = _open_spans.set((*open_spans, span_))
+        try:
+            yield span_
+        finally:
+            _open_spans.reset(token)
+            self.__sample_memory()
+            self._open.discard(span_)
+            span_.duration = time.perf_counter() - span_.start
+            self.spans.append(span_)
+            for hook in _span_hooks:
+                try:
+                    hook(span_)
+                except Exception as e:
+                    console.print(f"[bold yellow]WARNING:[/bold yellow] span hook {hook!r} failed: {e!r}")
+
+    def summary(self) -> list[dict]:
+        """Spans aggregated by path (`parent/child`), in the order each path first started"""
+        rows = {}
+        for span_ in sorted(self.spans, key=lambda x: x.start):
+            if span_.path not in rows:
+                rows[span_.path] = {"path": span_.path, "count": 0, "total": 0.0, "max": 0.0, "requests": 0}
+                rows[span_.path]["peak_bytes"] = None
+            row = rows[span_.path]
+            row["count"] += 1
+            row["total"] += span_.duration
+            row["max"] = max(row["max"], span_.duration)
+            row["requests"] += span_.requests
+            if span_.peak_bytes is not None:
+                row["peak_bytes"] = max(row["peak_bytes"] or 0, span_.peak_bytes)
+        return list(rows.values())
+
+    def report(self) -> dict:
+        return {
+            "created": datetime.now().astimezone().isoformat(),
+            "summary": self.summary(),
+            "spans": [x.to_dict(self.started) for x in sorted(self.spans, key=lambda x: x.start)],
+        }
+
+    def write_report(self, path: str | Path | None = None) -> Path:
+        """
+        Writes the JSON report to `path`, or to a timestamped file under the cache directory
+
+        """
+        if path is None:
+            path = default_cache_dir() / "profiles" / f"{datetime.now():%Y%m%d-%H%M%S-%f}.json"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2, default=str))
+        return path
+
+    def summary_table(self) -> Table:
+        table = Table(title="Deploy profile", title_justify="left", title_style="bold blue", box=box.ROUNDED)
+        table.add_column("Phase", style="bold magenta")
+        for column in ("Count", "Total s", "Max s", "Requests"):
+            table.add_column(column, justify="right")
+        if self.trace_memory:
+            table.add_column("Peak MiB", justify="right")
+        for row in self.summary():
+            depth = row["path"].count("/")
+            cells = [
+                f"{'  ' * depth}{row['path'].rsplit('/', 1)[-1]}",
+                str(row["count"]),
+                f"{row['total']:.3f}",
+                f"{row['max']:.3f}",
+                str(row["requests"]),
+            ]
+            if self.trace_memory:
+                cells.append(f"{row['peak_bytes'] / 1024**2:.1f}" if row["peak_bytes"] is not None else "")
+            table.add_row(*cells)
+        return table
+
+    def __sample_memory(self):
+        # attributes the peak since the last sample to every span open in that interval, so nested spans each get
+        # their own peak from one process-wide `tracemalloc` peak
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        for span_ in self._open:
+            span_.peak_bytes = max(span_.peak_bytes or 0, peak)
+
+    @staticmethod
+    def __install_request_counter():
+        # `RunnerDeployment.apply` opens its own API clients, so requests are counted where every client sends them;
+        # the patch is installed by the outermost active profiler and removed when it exits
+        import httpx
+
+        Profiler._activations += 1
+        if Profiler._activations > 1:
+            return
+        send = httpx.AsyncClient.send
+
+        @functools.wraps(send)
+        async def counted_send(self, request, **kwargs):
+            for span_ in _open_spans.get():
+                span_.requests += 1
+            return await send(self, request, **kwargs)
+
+        httpx.AsyncClient.send = counted_send
+        Profiler._patched_send = (send, counted_send)
+
+    @staticmethod
+    def __remove_request_counter():
+        import httpx
+
+        Profiler._activations -= 1
+        if Profiler._activations or Profiler._patched_send is None:
+            return
+        send, counted_send = Profiler._patched_send
+        if httpx.AsyncClient.send is counted_send:  # leave it when something else patched `send` on top since
+            httpx.AsyncClient.send = send
+        Profiler._patched_send = None
+
+
+def current() -> Profiler | None:
+    return _profiler.get()
+
+
+def span(name: str, **attributes):
+    """
+    Times the enclosed block as a span of the active profiler (a no-op `nullcontext` when none is active)
+
+    """
+    profiler = _profiler.get()
+    return profiler.span(name, **attributes) if profiler else nullcontext()
+
+
+def add_span_hook(hook: SpanHook):
+    """
+    Calls `hook(span)` for every finished span
+    - Registering a hook turns recording on for every deploy, even without `--profile` (no report is printed)
+
+    """
+    _span_hooks.append(hook)
+
+
+def remove_span_hook(hook: SpanHook):
+    _span_hooks.remove(hook)
+
+
+@contextmanager
+def profile(enabled: bool, *, trace_memory: bool = False, report_path: str | Path | None = None):
+    """
+    Activates a profiler for the enclosed deploy and, when `enabled`, prints the summary and writes the JSON report
+    - Reuses the active profiler when there is one (e.g., each run of `deploy-all` reports as part of the whole)
+    - Records spans without a report when only span hooks are registered
+
+    """
+    if _profiler.get() is not None or not (enabled or _span_hooks):
+        yield _profiler.get()
+        return
+    profiler = Profiler(trace_memory=trace_memory)
+    try:
+        with profiler.activate():
+            yield profiler
+    finally:
+        if enabled:
+            console.print(profiler.summary_table())
+            console.print(f"Profile report written to [blue]{profiler.write_report(report_path)}[/blue]")
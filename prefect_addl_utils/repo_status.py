@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+
+from git import Repo
+from git.exc import GitCommandError
+
+from .manage_config import ProjectContext
+
+
+class RepoStatus:
+    """
+    Answers "does this directory have uncommitted changes?" for many directories from one `git status` pass
+    - Covers the same changes as `repo.is_dirty(path=..., untracked_files=True)`: staged, unstaged and untracked
+    - The status pass runs on first use and is kept until `refresh()`; use `RepoStatus.for_repo` to share one per
+      repo for the process lifetime
+    - Enables git's untracked cache; git's fsmonitor is used only when the repo's own config enables `core.fsmonitor`
+      (it starts a background daemon, so it is never turned on here)
+
+    """
+
+    _instances: dict[Path, RepoStatus] = {}
+
+    def __init__(self, repo: Repo):
+        self.repo = repo
+        self.root = Path(repo.working_tree_dir).resolve()
+        self._changed_paths: list[PurePosixPath] | None = None
+
+    @classmethod
+    def for_repo(cls, repo: Repo) -> RepoStatus:
+        root = Path(repo.working_tree_dir).resolve()
+        if root not in cls._instances:
+            cls._instances[root] = cls(repo)
+        return cls._instances[root]
+
+    @property
+    def changed_paths(self) -> list[PurePosixPath]:
+        """Repo-relative paths with staged, unstaged or untracked changes (untracked directories end the path)"""
+        if self._changed_paths is None:
+            self._changed_paths = self.__read_status()
+        return self._changed_paths
+
+    def refresh(self):
+        self._changed_paths = None
+
+    def is_dirty(self, path: str | Path) -> bool:
+        relative = PurePosixPath(Path(path).resolve().relative_to(self.root).as_posix())
+        if relative == PurePosixPath("."):
+            return bool(self.changed_paths)
+        for changed in self.changed_paths:
+            # `changed` under `relative`, or an untracked directory (git lists only its top) that contains `relative`
+            if changed == relative or relative in changed.parents or changed in relative.parents:
+                return True
+        return False
+
+    def head_is_on(self, branch: str) -> bool:
+        """
+        Whether HEAD is `branch`: checked out, or detached at the commit `branch` or `origin/{branch}` points to (CI)
+
+        """
+        if not self.repo.head.is_detached:
+            return self.repo.active_branch.name == branch
+        head = self.repo.head.commit.hexsha
+        for ref in (branch, f"origin/{branch}"):
+            try:
+                if self.repo.git.rev_parse("--verify", "--quiet", f"{ref}^{{commit}}") == head:
+                    return True
+            except GitCommandError:
+                continue  # no such ref
+        return False
+
+    def head_is_pushed(self, branch: str, remote: str = "origin") -> bool:
+        """
+        Whether HEAD is the commit `{remote}/{branch}` points to, as of the last fetch (no remote ref: `False`)
+
+        """
+        try:
+            head = self.repo.git.rev_parse("--verify", "--quiet", f"{remote}/{branch}^{{commit}}")
+        except GitCommandError:
+            return False  # no such ref
+        return head == self.repo.head.commit.hexsha
+
+    def __read_status(self) -> list[PurePosixPath]:
+        output = self.repo.git(c="core.untrackedCache=true").status("--porcelain=v1", "-z", "--untracked-files=normal")
+
+        changed = []
+        entries = iter(output.split("\0"))
+        for entry in entries:
+            if not entry:
+                continue
+            changed.append(PurePosixPath(entry[3:].rstrip("/")))
+            if entry[0] in "RC":
+                # renames/copies are followed by the original path, which changed too
+                changed.append(PurePosixPath(next(entries)))
+        return changed
+
+
+class ChangedSince:
+    """
+    Answers "did anything this deploy directory depends on change since `ref`?" (`--since <ref>`) from one `git diff`
+    - Compares HEAD (the working tree's commit) with where it branched off `ref` (`git diff ref...HEAD`), so neither
+      uncommitted changes nor commits made on `ref` since then are included
+    - A directory is affected when a changed path is inside it, or matches one of its dependency globs
+    - `dependencies` maps deploy directory globs to the globs of shared paths they depend on, all relative to the repo
+      root, e.g., `{"flows/*": ["shared/**", "requirements.txt"]}`; `*` also matches across `/` (`fnmatch` rules)
+    - Use `ChangedSince.for_repo` to share one per repo and the commits `ref` and HEAD resolve to (a moved HEAD or a
+      relative ref such as `HEAD~1` gets a new one); it reads `dependencies` from `deploy-dependencies` in
+      `[tool.prefect-addl-utils]` when none are passed
+
+    """
+
+    _instances: dict[tuple[Path, str, str | None, str | None], ChangedSince] = {}
+
+    def __init__(self, repo: Repo, ref: str, dependencies: dict[str, list[str]] | None = None):
+        self.repo = repo
+        self.ref = ref
+        self.root = Path(repo.working_tree_dir).resolve()
+        self.dependencies = dependencies or {}
+        self._changed_paths: list[PurePosixPath] | None = None
+
+    @classmethod
+    def for_repo(cls, repo: Repo, ref: str, dependencies: dict[str, list[str]] | None = None) -> ChangedSince:
+        key = (Path(repo.working_tree_dir).resolve(), ref, cls.__resolve(repo, ref), cls.__resolve(repo, "HEAD"))
+        if key not in cls._instances:
+            if dependencies is None:
+                dependencies = ProjectContext.discover().config.get("deploy-dependencies", {})
+            cls._instances[key] = cls(repo, ref, dependencies)
+        return cls._instances[key]
+
+    @property
+    def changed_paths(self) -> list[PurePosixPath]:
+        """Repo-relative paths added, modified, deleted or renamed (both names) on HEAD since it branched off `ref`"""
+        if self._changed_paths is None:
+            try:
+                output = self.repo.git.diff("--name-only", "--no-renames", "-z", f"{self.ref}...HEAD", "--")
+            except GitCommandError as e:
+                raise ValueError(f"`--since {self.ref}`: not a git ref this repo can diff against HEAD") from e
+            self._changed_paths = [PurePosixPath(x) for x in output.split("\0") if x]
+        return self._changed_paths
+
+    def affects(self, path: str | Path) -> bool:
+        relative = PurePosixPath(Path(path).resolve().relative_to(self.root).as_posix())
+        if relative == PurePosixPath("."):
+            return bool(self.changed_paths)
+        dependency_globs = []
+        for pattern, globs in self.dependencies.items():
+            if fnmatchcase(relative.as_posix(), pattern):
+                dependency_globs += globs
+        return any(
+            relative in changed.parents or any(fnmatchcase(changed.as_posix(), x) for x in dependency_globs)
+            for changed in self.changed_paths
+        )
+
+    @staticmethod
+    def __resolve(repo: Repo, rev: str) -> str | None:
+        try:
+            return repo.git.rev_parse("--verify", "--quiet", f"{rev}^{{commit}}")
+        except GitCommandError:
+            return None  # `changed_paths` reports the unknown ref
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from prefect.client.orchestration import PrefectClient
+from prefect.client.schemas.responses import DeploymentResponse
+from prefect.client.schemas.sorting import DeploymentSort
+
+from .deployment_state import (
+    PREFETCH_PAGE_SIZE,
+    count_deployments,
+    deployment_name_filters,
+    in_name_order,
+    prefetch_deployments,
+)
+from .manage_config import default_cache_dir
+
+
+class DeploymentStateCache:
+    """
+    On-disk cache of server deployment state, so unchanged deployments are not downloaded again on every run
+    - One record per workspace (API URL) and deployment ID, plus a per-flow index of deployment name -> ID
+    - Each index entry keeps a watermark: the newest server `updated` seen when the record was last revalidated.
+      Any later server change to the deployment gets a newer `updated` than its watermark
+    - `read` revalidates against the server on every call; the cache only saves bytes, it never serves stale state
+
+    """
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root) if root else default_cache_dir() / "deployments"
+
+    def workspace_path(self, api_url: str) -> Path:
+        return self.root / hashlib.sha256(str(api_url).encode()).hexdigest()[:16]
+
+    def load(self, api_url: str, flow_name: str, deployment_names: list[str]) -> dict[str, DeploymentResponse]:
+        """
+        Returns the cached `{flow_name}/{deployment_name}` -> `DeploymentResponse` index, without any API calls
+
+        """
+        return self.__load(api_url, flow_name, deployment_names)[0]
+
+    def __load(
+        self, api_url: str, flow_name: str, deployment_names: list[str]
+    ) -> tuple[dict[str, DeploymentResponse], datetime | None]:
+        flow_index = self.__read_json(self.__flow_index_path(api_url, flow_name)) or {}
+        index, watermarks = {}, []
+        for name in deployment_names:
+            if not (entry := flow_index.get(name)):
+                continue
+            record_path = self.workspace_path(api_url) / "deployments" / f"{entry['id']}.json"
+            try:
+                index[f"{flow_name}/{name}"] = DeploymentResponse.parse_file(record_path)
+            except (FileNotFoundError, ValueError):
+                continue
+            watermarks.append(datetime.fromisoformat(entry["watermark"]))
+        return index, min(watermarks, default=None)
+
+    def store(
+        self,
+        api_url: str,
+        flow_name: str,
+        deployments: dict[str, DeploymentResponse],
+        *,
+        deployment_names: list[str] | None = None,
+    ):
+        """
+        Saves `deployments` (an index as returned by `load`/`read`), which must have just been read from the server
+        - Names in `deployment_names` missing from `deployments` are dropped (they no longer exist on the server)
+
+        """
+        deployments = {k: v for k, v in deployments.items() if v is not None}
+        if deployments:
+            watermark = max(x.updated for x in deployments.values()).isoformat()
+        flow_index_path = self.__flow_index_path(api_url, flow_name)
+        flow_index = self.__read_json(flow_index_path) or {}
+        for name in deployment_names or []:
+            flow_index.pop(name, None)
+        for deployment in deployments.values():
+            record_path = self.workspace_path(api_url) / "deployments" / f"{deployment.id}.json"
+            self.__write(record_path, deployment.json())
+            flow_index[deployment.name] = {"id": str(deployment.id), "watermark": watermark}
+        self.__write(flow_index_path, json.dumps(flow_index, sort_keys=True))
+
+    def store_deployed(
+        self,
+        api_url: str,
+        flow_name: str,
+        deployed: dict[str, DeploymentResponse],
+        previous: dict[str, DeploymentResponse],
+    ):
+        """
+        Saves the post-deploy index from `read_deployed_deployments`, leaving out the records it reused from
+        `previous` instead of re-reading them
+        - A reused record is the pre-deploy copy: applying moved the server `updated` past it, and may have
+          changed fields `matches_sent` does not compare (e.g., `paused`). Stored under the watermark of the records
+          that were re-read, it would never be downloaded again; left out, the next `read` re-reads it
+
+        """
+        self.store(api_url, flow_name, {k: v for k, v in deployed.items() if v is not previous.get(k)})
+
+    async def read(
+        self, client: PrefectClient, flow_name: str, deployment_names: list[str]
+    ) -> dict[str, DeploymentResponse]:
+        """
+        Drop-in for `prefetch_deployments` that only downloads deployments changed since they were cached
+        - Lists the flow's deployments newest `updated` first, in growing pages, until reaching the oldest watermark
+          of the cached records; everything older than that is unchanged (typically one record is downloaded)
+        - Names that are not cached are read by name, and a count check catches deployments deleted on the server
+        - Falls back to a full `prefetch_deployments` when nothing is cached or the count does not match
+
+        """
+        api_url = str(client.api_url)
+        cached, watermark = self.__load(api_url, flow_name, deployment_names)
+        if cached:
+            index = {**cached, **await self.__read_changed(client, flow_name, deployment_names, watermark)}
+            if missing := [x for x in deployment_names if f"{flow_name}/{x}" not in index]:
+                index.update(await prefetch_deployments(client, flow_name, missing))
+            if await count_deployments(client, flow_name, deployment_names) != len(index):
+                index = await prefetch_deployments(client, flow_name, deployment_names)
+        else:
+            index = await prefetch_deployments(client, flow_name, deployment_names)
+        self.store(api_url, flow_name, index, deployment_names=deployment_names)
+        return in_name_order(index, flow_name, deployment_names)
+
+    async def __read_changed(
+        self,
+        client: PrefectClient,
+        flow_name: str,
+        deployment_names: list[str],
+        watermark: datetime,
+    ) -> dict[str, DeploymentResponse]:
+        flow_filter, deployment_filter = deployment_name_filters(flow_name, deployment_names)
+        changed = {}
+        offset, limit = 0, 1
+        while True:
+            page = await client.read_deployments(
+                flow_filter=flow_filter,
+                deployment_filter=deployment_filter,
+                sort=DeploymentSort.UPDATED_DESC,
+                limit=limit,
+                offset=offset,
+            )
+            for deployment in page:
+                if deployment.updated <= watermark:
+                    return changed
+                changed[f"{flow_name}/{deployment.name}"] = deployment
+            if len(page) < limit:
+                return changed
+            offset += limit
+            limit = min(limit * 4, PREFETCH_PAGE_SIZE)
+
+    def __flow_index_path(self, api_url: str, flow_name: str) -> Path:
+        return self.workspace_path(api_url) / "flows" / f"{hashlib.sha256(flow_name.encode()).hexdigest()[:16]}.json"
+
+    @staticmethod
+    def __read_json(path: Path) -> dict | None:
+        try:
+            return json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def __write(path: Path, content: str):
+        # write-then-rename, so concurrent runs never read a partially written file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=path.parent, delete=False, suffix=".tmp") as f:
+            f.write(content)
+        os.replace(f.name, path)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+from typing import Iterable, NamedTuple
+
+from prefect import get_client
+from prefect.blocks.system import Secret
+from prefect.client.orchestration import PrefectClient
+from prefect.runner.storage import GitRepository
+from prefect.utilities.asyncutils import sync_compatible
+
+# secrets are never written to disk; each one is loaded at most once per process and workspace
+_secrets: dict[tuple[str, str], Secret] = {}
+
+
+class ResolvedValues(NamedTuple):
+    variables: dict[str, str | None]  # `None` when the variable does not exist
+    secrets: dict[str, Secret]
+
+
+class VariableCache:
+    """
+    Cache of Prefect Variable values per workspace (API URL), each value expiring `ttl` after it was fetched
+    - Kept in process memory only, so a `deploy-all` run reads each Variable once, while every new process (and so
+      every deploy) starts from the current values instead of a branch or URL fetched by an earlier run
+    - Only Variables are cached; Secret block values are memoized separately and never leave the process memory
+
+    """
+
+    def __init__(self, *, ttl: timedelta = timedelta(minutes=10)):
+        self.ttl = ttl
+        self._values: dict[tuple[str, str], tuple[str, float]] = {}
+
+    def get(self, api_url: str, names: Iterable[str]) -> dict[str, str]:
+        """
+        Returns the cached values among `names` that have not expired (missing names are left out)
+
+        """
+        fresh_after = time.monotonic() - self.ttl.total_seconds()
+        values = {}
+        for name in names:
+            value, fetched = self._values.get((api_url, name), (None, float("-inf")))
+            if fetched > fresh_after:
+                values[name] = value
+        return values
+
+    def store(self, api_url: str, values: dict[str, str]):
+        fetched = time.monotonic()
+        self._values.update({(api_url, name): (value, fetched) for name, value in values.items()})
+
+
+# the cache `resolve_values` uses when none is passed
+_variables = VariableCache()
+
+
+@sync_compatible
+async def resolve_values(
+    variables: Iterable[str] = (),
+    secrets: Iterable[str] = (),
+    *,
+    client: PrefectClient | None = None,
+    cache: VariableCache | None = None,
+) -> ResolvedValues:
+    """
+    Resolves Prefect Variables and Secret blocks by name over one client, instead of one `Variable.get`/`Secret.load`
+    round trip each
+    - Variables not in `cache` (default: one per process) are read concurrently, then cached
+    - Secrets are loaded concurrently and kept in memory for the process only
+    - Works from sync code (e.g., module level of a `_deploy.py`) and with `await`
+
+    """
+    variables, secrets = list(dict.fromkeys(variables)), list(dict.fromkeys(secrets))
+    cache = cache or _variables
+    async with nullcontext(client) if client else get_client() as client:
+        api_url = str(client.api_url)
+        resolved_variables = cache.get(api_url, variables)
+        missing_secrets = [x for x in secrets if (api_url, x) not in _secrets]
+        fetched_variables, loaded_secrets = await asyncio.gather(
+            __read_variables(client, [x for x in variables if x not in resolved_variables]),
+            asyncio.gather(*[Secret.load(x, client=client) for x in missing_secrets]),
+        )
+    if fetched_variables:
+        cache.store(api_url, fetched_variables)
+    _secrets.update({(api_url, name): x for name, x in zip(missing_secrets, loaded_secrets)})
+    return ResolvedValues(
+        variables={x: resolved_variables.get(x, fetched_variables.get(x)) for x in variables},
+        secrets={x: _secrets[(api_url, x)] for x in secrets},
+    )
+
+
+@sync_compatible
+async def git_repository_from_variables(
+    *,
+    url_variable: str,
+    branch_variable: str | None = None,
+    name_variable: str | None = None,
+    access_token_secret: str | None = None,
+    include_submodules: bool = False,
+    client: PrefectClient | None = None,
+    cache: VariableCache | None = None,
+) -> GitRepository:
+    """
+    Builds a `GitRepository` source whose URL, branch and name are Prefect Variables and whose access token is a
+    Secret block, resolving all of them in one `resolve_values` batch
+    - e.g., `git_repository_from_variables(url_variable="flows_storage", branch_variable="flows_branch", ...)`
+
+    """
+    variable_names = [x for x in (url_variable, branch_variable, name_variable) if x]
+    resolved = await resolve_values(
+        variable_names, [access_token_secret] if access_token_secret else [], client=client, cache=cache
+    )
+    if not (url := resolved.variables[url_variable]):
+        raise ValueError(f"Prefect Variable '{url_variable}' (the source repository URL) does not exist")
+    return GitRepository(
+        url=url,
+        branch=resolved.variables[branch_variable] if branch_variable else None,
+        name=resolved.variables[name_variable] if name_variable else None,
+        credentials={"access_token": resolved.secrets[access_token_secret]} if access_token_secret else None,
+        include_submodules=include_submodules,
+    )
+
+
+async def __read_variables(client: PrefectClient, names: list[str]) -> dict[str, str]:
+    variables = await asyncio.gather(*[client.read_variable_by_name(x) for x in names])
+    return {x.name: x.value for x in variables if x is not None}
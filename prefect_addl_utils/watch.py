@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import sys
+import time
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+
+from prefect import get_client
+from prefect.client.orchestration import PrefectClient
+from rich.console import Console
+
+from . import deployment_process
+from .diff_sinks import open_diff_sink, stdout_reserved_for_diffs
+from .entrypoint import check_entrypoint
+from .manage_config import ProjectContext, get_repo
+from .manifest import MANIFEST_NAME, DeploymentManifest
+from .monorepo import SKIP_DIRS, collect_deploy_runs, discover_deploy_scripts
+from .repo_status import RepoStatus
+
+WATCH_INTERVAL = 0.5  # seconds between checks for changed files
+
+console = Console()
+
+
+class DeployDirectoryWatcher:
+    """
+    Finds which deploy directories (those with a `_deploy.py` or `_deploy.toml`) under `root` had files change
+    - Polls file modification times and sizes, so it needs no extra dependency and works on every filesystem
+    - Files in nested directories belong to the nearest deploy directory above them; hidden files and directories,
+      editor backups (`~`) and build clutter (`__pycache__`, ...) are ignored
+    - Files matching `dependencies` (deploy directory globs to shared path globs, relative to `repo_root`; read from
+      `deploy-dependencies` in `[tool.prefect-addl-utils]` when none are passed, see `ChangedSince`) also mark every
+      deploy directory depending on them
+    - Deploy directories are found once; create a new watcher to pick up new ones
+
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        dependencies: dict[str, list[str]] | None = None,
+        *,
+        repo_root: str | Path | None = None,
+    ):
+        self.root = Path(root).resolve()
+        self.repo_root = Path(repo_root).resolve() if repo_root else self.root
+        if dependencies is None:
+            dependencies = ProjectContext.discover(self.root).config.get("deploy-dependencies", {})
+        self.dependencies = dependencies
+        self.scripts = discover_deploy_scripts(self.root)
+        self.directories = sorted({x.parent.resolve() for x in self.scripts}, key=lambda x: len(x.parts), reverse=True)
+        self._files = self.__snapshot()
+
+    def scripts_in(self, directory: Path) -> list[Path]:
+        return [x for x in self.scripts if x.parent.resolve() == directory]
+
+    def poll(self) -> list[Path]:
+        """
+        Deploy directories with files added, changed or removed since the previous poll (or since the watcher started)
+
+        """
+        files = self.__snapshot()
+        changed_files = files.keys() ^ self._files.keys()
+        changed_files |= {x for x in files.keys() & self._files.keys() if files[x] != self._files[x]}
+        self._files = files
+        changed = set()
+        for path in changed_files:
+            changed |= {self.__owner(path), *self.__dependents(path)}
+        return sorted(x for x in changed if x is not None)
+
+    def __owner(self, path: Path) -> Path | None:
+        # `directories` is sorted deepest first, so a nested deploy directory wins over the one containing it
+        return next((x for x in self.directories if x in path.parents), None)
+
+    def __dependents(self, path: Path) -> list[Path]:
+        relative = self.__relative(path)
+        patterns = [x for x, globs in self.dependencies.items() if any(fnmatchcase(relative, y) for y in globs)]
+        return [x for x in self.directories if any(fnmatchcase(self.__relative(x), y) for y in patterns)]
+
+    def __relative(self, path: Path) -> str:
+        # repo-relative for paths in the repo; others are matched by their absolute path, which no glob matches
+        return path.relative_to(self.repo_root).as_posix() if path.is_relative_to(self.repo_root) else path.as_posix()
+
+    def __snapshot(self) -> dict[Path, tuple[int, int]]:
+        files = {}
+        for directory in self.directories:
+            files.update(self.__stat_files(directory))
+        for glob in {x for globs in self.dependencies.values() for x in globs}:
+            # walk only the part of the repo before the first wildcard, e.g., `shared/db` for `shared/db/*.py`
+            base = itertools.takewhile(lambda x: not set(x) & set("*?["), PurePosixPath(glob).parts)
+            for path, stat in self.__stat_files(self.repo_root.joinpath(*base)).items():
+                if fnmatchcase(self.__relative(path), glob):
+                    files[path] = stat
+        return files
+
+    @staticmethod
+    def __stat_files(directory: Path) -> dict[Path, tuple[int, int]]:
+        files = {}
+        walk = os.walk(directory) if directory.is_dir() else [(directory.parent, [], [directory.name])]
+        for dirpath, dirnames, filenames in walk:
+            dirnames[:] = [x for x in dirnames if not x.startswith(".") and x not in SKIP_DIRS]
+            for name in filenames:
+                if name.startswith(".") or name.endswith("~"):
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue  # removed while walking
+                files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+
+def drop_repo_modules(repo_root: str | Path):
+    """
+    Removes modules imported from files in the repo from `sys.modules`, so the next import re-reads them
+    - `collect_deploy_runs` only drops modules under the script's directory; shared modules elsewhere in the repo would
+      otherwise keep the code they had when first imported
+    - Installed packages (hidden directories such as `.venv`, `site-packages`, ...) and this package are kept
+
+    """
+    repo_root = Path(repo_root).resolve()
+    package_dir = Path(__file__).resolve().parent
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if not module_file:
+            continue
+        path = Path(module_file).resolve()
+        if not path.is_relative_to(repo_root) or path.is_relative_to(package_dir):
+            continue
+        parts = path.relative_to(repo_root).parts[:-1]
+        if not any(x.startswith(".") or x in SKIP_DIRS or x == "site-packages" for x in parts):
+            del sys.modules[name]
+
+
+async def watch(root: str | Path, *, cli_flags: list[str], interval: float = WATCH_INTERVAL):
+    """
+    Keeps one process warm and re-plans (`--plan`) each deploy directory under `root` when its files change
+    - One API client, git repo and project context for the whole session
+    - A change re-runs only that directory's `_deploy.py`/`_deploy.toml` and renders its plan; a change to a shared
+      path re-plans every directory whose `deploy-dependencies` include it, and repo modules are re-imported each time
+    - Errors in a changed script (e.g., a half-typed edit) are printed and the watch continues; stop with Ctrl+C
+
+    """
+    cli_flags = cli_flags if "--plan" in cli_flags else [*cli_flags, "--plan"]
+    repo_status = RepoStatus.for_repo(get_repo())
+    watcher = DeployDirectoryWatcher(root, repo_root=repo_status.root)
+    diff_format = deployment_process.cli_option_value(cli_flags, "--diff-format") or "rich"
+    with stdout_reserved_for_diffs(diff_format, deployment_process.cli_option_value(cli_flags, "--diff-file")):
+        token = deployment_process._shared_pipeline.set(True)
+        try:
+            async with get_client() as client:
+                if error := await client.api_healthcheck():
+                    raise RuntimeError(f"The Prefect API at {client.api_url} is not reachable: {error!r}")
+                console.print(
+                    f"Watching {len(watcher.directories)} deploy directories under [blue]{watcher.root}[/blue] "
+                    "(Ctrl+C to stop)"
+                )
+                while True:
+                    await asyncio.sleep(interval)
+                    for directory in watcher.poll():
+                        started = time.perf_counter()
+                        repo_status.refresh()
+                        try:
+                            await __plan_directory(watcher.scripts_in(directory), client, cli_flags, repo_status.root)
+                        except (Exception, SystemExit) as e:
+                            console.print(f"[bold red]ERROR:[/bold red] planning {directory} failed: {e!r}")
+                            continue
+                        console.print(f"[grey50]Planned {directory} in {time.perf_counter() - started:.2f}s[/grey50]")
+        finally:
+            deployment_process._shared_pipeline.reset(token)
+
+
+async def __plan_directory(scripts: list[Path], client: PrefectClient, cli_flags: list[str], repo_root: Path):
+    drop_repo_modules(repo_root)
+    runs = []
+    for script in scripts:
+        if script.name == MANIFEST_NAME:
+            run = await DeploymentManifest.load(script).run_kwargs()
+            check_entrypoint(run["entrypoint"], run["flow_name"], repo_root)
+            runs.append(run)
+        else:
+            # a `_deploy.py` calls `asyncio.run(...)`, which cannot run inside this event loop
+            runs += await asyncio.to_thread(collect_deploy_runs, script, cli_flags)
+    diff_sink = open_diff_sink(
+        deployment_process.cli_option_value(cli_flags, "--diff-format") or "rich",
+        deployment_process.cli_option_value(cli_flags, "--diff-file"),
+    )
+    try:
+        for run in runs:
+            await deployment_process.execute_deploy_process(
+                **run, client=client, diff_sink=diff_sink, cli_flags=cli_flags
+            )
+    finally:
+        diff_sink.close()
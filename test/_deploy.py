@@ -6,8 +6,6 @@ from pathlib import Path
 from flow import Parameters, main
 from prefect.client.schemas.objects import MinimalDeploymentSchedule as sch
 from prefect.client.schemas.schedules import CronSchedule
-from prefect.runner.storage import GitRepository
-from prefect.variables import Variable
 
 import prefect_addl_utils as addl
 
@@ -37,11 +35,11 @@ deployment2 = addl.DeploymentConfig(
     description=open(Path(__file__).parent / "_description.md").read(),
 )
 
-git_storage = GitRepository(
-    name=Variable.get("github_flows_repo_name").value,
-    url=Variable.get("github_flows_storage").value,
-    branch=Variable.get("github_flows_branch").value,
-    # credentials={"access_token": Secret.load("github-flows-token")},
+git_storage = addl.git_repository_from_variables(
+    name_variable="github_flows_repo_name",
+    url_variable="github_flows_storage",
+    branch_variable="github_flows_branch",
+    # access_token_secret="github-flows-token",
 )
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from git import Repo
+from prefect import get_client
+from prefect.testing.utilities import prefect_test_harness
+
+from prefect_addl_utils.manage_config import get_repo
+
+
+@pytest.fixture(scope="module")
+def prefect_server():
+    # one temporary Prefect API per test module; modules where every test needs it use
+    # `pytest.mark.usefixtures("prefect_server")`
+    with prefect_test_harness():
+        yield
+
+
+@pytest_asyncio.fixture
+async def client(prefect_server):
+    async with get_client() as client:
+        yield client
+
+
+FLOW_MODULE = """
+from prefect import flow
+
+
+@flow(name="fp-flow", description="flow description", version="flow-version")
+def main(table: str, rows: int = 10):
+    ...
+"""
+
+
+@pytest.fixture
+def flows_repo(tmp_path, monkeypatch) -> Path:
+    """Committed git repo (branch `main`) at `tmp_path/flows` with the `fp-flow` flow at `flow_a/flow.py:main`."""
+    root = tmp_path / "flows"
+    repo = Repo.init(root, initial_branch="main")
+    (root / "flow_a").mkdir(parents=True)
+    (root / "flow_a" / "flow.py").write_text(FLOW_MODULE)
+    (root / ".gitignore").write_text("__pycache__/\n")
+    repo.index.add(["flow_a/flow.py", ".gitignore"])
+    repo.index.commit("initial")
+    monkeypatch.setenv("GIT_REPO_ROOT", str(root))
+    get_repo.cache_clear()
+    yield root
+    get_repo.cache_clear()
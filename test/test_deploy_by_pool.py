@@ -0,0 +1,55 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import contextlib
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+import pytest_asyncio
+from prefect.client.schemas.actions import WorkPoolCreate
+from prefect.exceptions import ObjectAlreadyExists
+from prefect.flows import load_flow_from_entrypoint
+from prefect.runner.storage import GitRepository
+
+from prefect_addl_utils.deployment_process import deploy_by_pool
+from prefect_addl_utils.flow_source import attach_source, build_deployment
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("prefect_server")]
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def work_pools(client):
+    for name in ("pool-a", "pool-b"):
+        with contextlib.suppress(ObjectAlreadyExists):
+            await client.create_work_pool(WorkPoolCreate(name=name, type="process"))
+
+
+def __deployments(pools: list[str]):
+    flow = load_flow_from_entrypoint(str(Path(__file__).parent / "flow.py:main"))
+    source = GitRepository(url="https://example.com/org/flows.git", name="flows")
+    flow = attach_source(flow, source, "test/flow.py:main")
+    return [build_deployment(flow, name=f"dep{i}", work_pool_name=x) for i, x in enumerate(pools)]
+
+
+async def test_deployments_apply_to_their_own_pools_in_input_order(client, capsys):
+    deployments = __deployments(["pool-a", "pool-b", "pool-a", "pool-b"])
+
+    results = await deploy_by_pool(client, deployments, max_concurrency=2)
+
+    assert all(isinstance(x, UUID) for x in results)
+    for deployment, deployment_id in zip(deployments, results):
+        server = await client.read_deployment(deployment_id)
+        assert (server.name, server.work_pool_name) == (deployment.name, deployment.work_pool_name)
+    assert "Deployments" not in capsys.readouterr().out  # prefect's `deploy()` tables are not printed
+
+
+async def test_failing_pool_does_not_stop_the_others(client):
+    deployments = __deployments(["pool-a", "no-such-pool", "pool-b"])
+
+    results = await deploy_by_pool(client, deployments)
+
+    assert isinstance(results[0], UUID) and isinstance(results[2], UUID)
+    assert isinstance(results[1], ValueError)
+    assert "no-such-pool" in str(results[1])
+    assert (await client.read_deployment(results[2])).name == "dep2"
@@ -0,0 +1,164 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+from prefect.client.schemas.objects import MinimalDeploymentSchedule
+from prefect.client.schemas.schedules import CronSchedule, IntervalSchedule, RRuleSchedule
+
+from prefect_addl_utils.deployment_diff import (
+    DeploymentDiff,
+    ParameterChange,
+    ParameterDiff,
+    SettingChange,
+    diff_parameters,
+    diff_schedules,
+    schedule_key,
+    truncated_repr,
+)
+
+ANCHOR = "2024-01-01T00:00:00+00:00"
+
+
+def __cron(cron: str, active: bool = True, timezone: str = "UTC") -> MinimalDeploymentSchedule:
+    return MinimalDeploymentSchedule(schedule=CronSchedule(cron=cron, timezone=timezone), active=active)
+
+
+def __interval(seconds: int) -> MinimalDeploymentSchedule:
+    schedule = IntervalSchedule(interval=timedelta(seconds=seconds), anchor_date=ANCHOR)
+    return MinimalDeploymentSchedule(schedule=schedule, active=True)
+
+
+def __rrule(rrule: str) -> MinimalDeploymentSchedule:
+    return MinimalDeploymentSchedule(schedule=RRuleSchedule(rrule=rrule), active=True)
+
+
+def test_schedule_key_matches_schedule_equality():
+    assert schedule_key(True, __cron("0 1 * * *").schedule) == schedule_key(True, __cron("0 1 * * *").schedule)
+    assert schedule_key(True, __cron("0 1 * * *").schedule) != schedule_key(False, __cron("0 1 * * *").schedule)
+    assert schedule_key(True, __cron("0 1 * * *").schedule) != schedule_key(
+        True, __cron("0 1 * * *", timezone="America/Chicago").schedule
+    )
+    assert schedule_key(True, __interval(60).schedule) == schedule_key(True, __interval(60).schedule)
+    assert schedule_key(True, __interval(60).schedule) != schedule_key(True, __interval(120).schedule)
+
+
+def test_diff_classifies_in_stable_order():
+    old = [__cron("0 1 * * *"), __interval(60), __rrule("FREQ=DAILY"), __cron("0 2 * * *")]
+    new = [__cron("0 3 * * *"), __rrule("FREQ=DAILY"), __cron("0 1 * * *"), __interval(120)]
+
+    changes = diff_schedules(new, old)
+
+    assert [(x.mode, x.schedule) for x in changes] == [
+        ("added", new[0].schedule),
+        ("added", new[3].schedule),
+        ("removed", old[1].schedule),
+        ("removed", old[3].schedule),
+        (None, new[1].schedule),
+        (None, new[2].schedule),
+    ]
+
+
+def test_diff_active_flag_change_is_remove_and_add():
+    changes = diff_schedules([__cron("0 1 * * *", active=False)], [__cron("0 1 * * *")])
+
+    assert [(x.mode, x.active) for x in changes] == [("added", False), ("removed", True)]
+
+
+def test_diff_without_old_lists_everything_added_once():
+    changes = diff_schedules([__cron("0 1 * * *"), __cron("0 1 * * *")])
+
+    assert [x.mode for x in changes] == ["added"]
+
+
+def test_diff_many_schedules():
+    old = [__interval(x) for x in range(1, 1001)]
+    new = [__interval(x) for x in range(501, 1501)]
+
+    changes = diff_schedules(new, old)
+
+    assert sum(x.mode == "added" for x in changes) == 500
+    assert sum(x.mode == "removed" for x in changes) == 500
+    assert sum(x.mode is None for x in changes) == 500
+
+
+def test_parameter_diff_yields_changed_leaf_paths():
+    old = {"a": {"b": [{"c": 1}, {"c": 2}, {"c": 3}, {"c": 4}]}, "d": "same", "gone": True}
+    new = {"a": {"b": [{"c": 1}, {"c": 2}, {"c": 3}, {"c": 5}, {"c": 6}]}, "d": "same", "e": None}
+
+    assert list(diff_parameters(new, old)) == [
+        ParameterChange("a.b[3].c", "changed", 4, 5),
+        ParameterChange("a.b[4]", "added", new={"c": 6}),
+        ParameterChange("e", "added", new=None),
+        ParameterChange("gone", "removed", old=True),
+    ]
+
+
+def test_parameter_diff_type_change_and_max_depth():
+    assert list(diff_parameters({"a": [1]}, {"a": {"x": 1}})) == [ParameterChange("a", "changed", {"x": 1}, [1])]
+    assert list(diff_parameters({"a": {"b": {"c": 2}}}, {"a": {"b": {"c": 1}}}, max_depth=2)) == [
+        ParameterChange("a.b", "changed", {"c": 1}, {"c": 2})
+    ]
+
+
+def test_parameter_diff_equal_values_yield_nothing():
+    value = {"tables": [{"columns": list(range(1000))} for _ in range(100)]}
+
+    assert list(diff_parameters(value, {**value})) == []
+
+
+def test_truncated_repr_is_bounded():
+    text = truncated_repr({"tables": [{"columns": list(range(1000))} for _ in range(1000)]}, max_length=40)
+
+    assert len(text) <= 40
+    assert text.endswith("...")
+
+
+def __deployment(tags: list, schedules: list, parameters: dict, entrypoint: str = "flow.py:main"):
+    return SimpleNamespace(entrypoint=entrypoint, tags=tags, schedules=schedules, parameters=parameters)
+
+
+def test_deployment_diff_build():
+    old = __deployment(["a", "b"], [__cron("0 1 * * *")], {"x": 1, "cfg": {"k": [1, 2]}, "gone": "y"})
+    new = __deployment(["b", "c"], [__cron("0 1 * * *")], {"x": 1, "cfg": {"k": [1, 3]}, "new": None})
+
+    diff = DeploymentDiff.build("flow/dep", new, old)
+
+    assert (diff.tags_added, diff.tags_removed, diff.tags_unchanged) == (["c"], ["a"], ["b"])
+    assert [x.mode for x in diff.schedules] == [None]
+    assert diff.parameters == [
+        ParameterDiff("new", "added", new=None),
+        ParameterDiff("gone", "removed", old="y"),
+        ParameterDiff("cfg", "changed", {"k": [1, 3]}, {"k": [1, 2]}, (ParameterChange("k[1]", "changed", 2, 3),)),
+        ParameterDiff("x", None, 1, 1),
+    ]
+    assert diff.action == "update"
+    assert [x["name"] for x in diff.to_dict()["parameters"]] == ["new", "gone", "cfg"]
+
+
+def test_deployment_diff_actions():
+    deployment = __deployment(["a"], [__cron("0 1 * * *")], {"x": 1})
+
+    assert DeploymentDiff.build("flow/dep", deployment).action == "create"
+    assert DeploymentDiff.build("flow/dep", deployment, deployment).action == "unchanged"
+    assert DeploymentDiff.build("flow/dep", deployment, __deployment(["a"], [], {"x": 1}, "old.py:main")).changed
+
+
+def test_deployment_diff_settings_changes_are_updates():
+    old = SimpleNamespace(**__deployment(["a"], [], {"x": 1}).__dict__, version="1", job_variables=None, pull_steps=[])
+    new = SimpleNamespace(**{**old.__dict__, "version": "2", "job_variables": {"env": {"A": "1"}}})
+
+    diff = DeploymentDiff.build("flow/dep", new, old)
+
+    assert diff.settings == [
+        SettingChange("version", "1", "2"),
+        SettingChange("job_variables", {}, {"env": {"A": "1"}}),
+    ]
+    assert diff.action == "update"
+    assert diff.to_dict()["settings"] == [
+        {"name": "version", "old": "1", "new": "2"},
+        {"name": "job_variables", "old": {}, "new": {"env": {"A": "1"}}},
+    ]
+    assert DeploymentDiff.build("flow/dep", new, new).action == "unchanged"
+    assert DeploymentDiff.build("flow/dep", new).settings == []
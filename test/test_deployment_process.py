@@ -0,0 +1,58 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import contextlib
+import json
+
+import pytest
+from prefect.client.schemas.actions import WorkPoolCreate
+from prefect.exceptions import ObjectAlreadyExists
+from prefect.runner.storage import GitRepository
+
+from prefect_addl_utils.deployment_config import DeploymentConfig
+from prefect_addl_utils.deployment_process import execute_deploy_process
+from prefect_addl_utils.deployment_state import prefetch_deployments
+
+pytestmark = pytest.mark.asyncio
+
+# not sorted, so neither name order nor server order can pass for config order
+NAMES = ["d5", "d0", "d7", "d2", "d6", "d1", "d4", "d3"]
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2", "two", "1.5"])
+async def test_invalid_jobs_are_rejected(jobs):
+    with pytest.raises(ValueError, match="--jobs"):
+        await execute_deploy_process(
+            flow_name="fp-flow",
+            source=GitRepository(url="https://example.com/flows.git", branch="main"),
+            entrypoint="flow_a/flow.py:main",
+            deployments=[],
+            cli_flags=["--jobs", jobs],
+        )
+
+
+async def test_concurrent_prep_keeps_config_order(client, flows_repo, capsys):
+    with contextlib.suppress(ObjectAlreadyExists):
+        await client.create_work_pool(WorkPoolCreate(name="pool-order", type="process"))
+    run = {
+        "flow_name": "fp-flow",
+        "source": GitRepository(url=str(flows_repo), branch="main", name="flows"),
+        "entrypoint": "flow_a/flow.py:main",
+        "work_pool_name": "pool-order",
+        "client": client,
+        "source_checkout": flows_repo,
+        "cwd": flows_repo / "flow_a",
+    }
+    for version in ("1", "2"):  # creates, then updates with every previous deployment read
+        configs = [DeploymentConfig(name=x, version=version, parameters={"table": x}) for x in NAMES]
+        capsys.readouterr()
+        await execute_deploy_process(
+            deployments=configs, cli_flags=["--jobs", "4", "--update-all", "--diff-format", "ndjson"], **run
+        )
+
+        diffs = [json.loads(x) for x in capsys.readouterr().out.splitlines()]
+        assert [x["name"] for x in diffs] == [f"fp-flow/{x}" for x in NAMES]
+        assert {x["action"] for x in diffs} == {"create" if version == "1" else "update"}
+
+    previous_deployments_d = await prefetch_deployments(client, "fp-flow", NAMES)
+    assert list(previous_deployments_d) == [f"fp-flow/{x}" for x in NAMES]
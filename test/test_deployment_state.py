@@ -0,0 +1,34 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import pytest
+
+from prefect_addl_utils.deployment_state import PREFETCH_PAGE_SIZE, prefetch_deployments
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("prefect_server")]
+
+NAMES = [f"dep{i:03}" for i in range(PREFETCH_PAGE_SIZE + 5)]
+
+
+async def test_prefetch_pages_through_every_deployment_of_the_flow(client, monkeypatch):
+    for flow_name, names in (("paged-flow", NAMES), ("other-flow", NAMES[::20])):
+        flow_id = await client.create_flow_from_name(flow_name)
+        for name in names:
+            await client.create_deployment(flow_id=flow_id, name=name, tags=[flow_name])
+    pages = []
+    read_deployments = client.read_deployments
+
+    async def counting_read_deployments(**kwargs):
+        page = await read_deployments(**kwargs)
+        pages.append(len(page))
+        return page
+
+    monkeypatch.setattr(client, "read_deployments", counting_read_deployments)
+
+    index = await prefetch_deployments(client, "paged-flow", NAMES)
+
+    assert pages == [PREFETCH_PAGE_SIZE, 5]
+    assert list(index) == [f"paged-flow/{x}" for x in NAMES]
+    assert {x.name for x in index.values()} == set(NAMES)
+    assert {tuple(x.tags) for x in index.values()} == {("paged-flow",)}
+    assert list(await prefetch_deployments(client, "other-flow", NAMES)) == [f"other-flow/{x}" for x in NAMES[::20]]
@@ -0,0 +1,110 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import io
+import json
+from types import SimpleNamespace
+
+from prefect.client.schemas.objects import MinimalDeploymentSchedule
+from prefect.client.schemas.schedules import CronSchedule
+
+from prefect_addl_utils.deployment_diff import DeploymentDiff
+from prefect_addl_utils.diff_sinks import MarkdownDiffSink, NdjsonDiffSink, open_diff_sink, stdout_reserved_for_diffs
+
+SCHEDULE = MinimalDeploymentSchedule(schedule=CronSchedule(cron="0 1 * * *"), active=True)
+OLD = SimpleNamespace(entrypoint="flow.py:main", tags=["a"], schedules=[SCHEDULE], parameters={"cfg": {"k": 1}})
+MOVED_FROM = SimpleNamespace(**OLD.__dict__, work_pool_name="pool-a")
+NEW = SimpleNamespace(entrypoint="flow.py:main", tags=["a", "b"], schedules=[], parameters={"cfg": {"k": 2}})
+
+
+def test_ndjson_sink_writes_one_line_per_diff():
+    stream = io.StringIO()
+    sink = NdjsonDiffSink(stream)
+
+    sink.write(DeploymentDiff.build("flow/changed", NEW, OLD))
+    sink.write(DeploymentDiff.build("flow/same", OLD, OLD))
+
+    lines = [json.loads(x) for x in stream.getvalue().splitlines()]
+    assert [x["action"] for x in lines] == ["update", "unchanged"]
+    assert lines[0]["schedules"][0]["mode"] == "removed"
+    assert lines[0]["parameters"] == [
+        {"name": "cfg", "mode": "changed", "changes": [{"path": "k", "mode": "changed", "old": 1, "new": 2}]}
+    ]
+
+
+def test_markdown_sink_lists_only_changes():
+    stream = io.StringIO()
+    sink = MarkdownDiffSink(stream)
+
+    sink.write(DeploymentDiff.build("flow/changed", NEW, OLD))
+    sink.write(DeploymentDiff.build("flow/same", OLD, OLD))
+
+    assert stream.getvalue() == (
+        "#### `flow/changed` (update)\n"
+        "\n"
+        "- tags: +`b`\n"
+        "- schedule - `cron='0 1 * * *' timezone=None day_or=True` (active)\n"
+        "- parameter `cfg`:\n"
+        "  - `k`: `1` → `2`\n"
+        "\n"
+        "- `flow/same`: no changes\n"
+    )
+
+
+def test_markdown_sink_lists_setting_changes():
+    stream = io.StringIO()
+    sink = MarkdownDiffSink(stream)
+
+    sink.write(DeploymentDiff.build("flow/moved", SimpleNamespace(**OLD.__dict__, work_pool_name="pool-b"), MOVED_FROM))
+
+    assert stream.getvalue() == "#### `flow/moved` (update)\n\n- work_pool_name: `'pool-a'` → `'pool-b'`\n\n"
+
+
+def test_open_diff_sink_appends_to_file(tmp_path):
+    path = tmp_path / "diffs.ndjson"
+    for _ in range(2):
+        sink = open_diff_sink("ndjson", str(path))
+        sink.write(DeploymentDiff.build("flow/changed", NEW, OLD))
+        sink.close()
+
+    assert len(path.read_text().splitlines()) == 2
+
+
+def test_stdout_reserved_for_diffs_sends_everything_else_to_stderr(capsys):
+    from rich.console import Console
+
+    with stdout_reserved_for_diffs("ndjson"):
+        sink = open_diff_sink("ndjson")
+        print("banner")
+        Console().print("[bold]status[/bold]")
+        sink.write(DeploymentDiff.build("flow/changed", NEW, OLD))
+        sink.close()
+    with stdout_reserved_for_diffs("rich"):
+        print("terminal view")
+
+    out, err = capsys.readouterr()
+    diff_line, *terminal_lines = out.splitlines()
+    assert json.loads(diff_line)["name"] == "flow/changed"
+    assert terminal_lines == ["terminal view"]
+    assert err.splitlines() == ["banner", "status"]
+
+
+def test_rich_summary_sink_buffers_until_flush():
+    from rich.console import Console
+
+    from prefect_addl_utils.deployment_output import RichDiffSink
+
+    output = Console(file=io.StringIO(), width=120, color_system=None)
+    sink = RichDiffSink(output, mode="summary", batch_size=10)
+
+    sink.write(DeploymentDiff.build("flow/changed", NEW, OLD))
+    sink.write(DeploymentDiff.build("flow/same", OLD, OLD))
+    sink.write(DeploymentDiff.build("flow/moved", SimpleNamespace(**OLD.__dict__, work_pool_name="pool-b"), MOVED_FROM))
+    assert output.file.getvalue() == ""
+    sink.flush()
+
+    assert output.file.getvalue().splitlines() == [
+        "🚀 flow/changed update tags +1/-0, schedules +0/-1, parameters ~1",
+        "🚀 flow/same unchanged",
+        "🚀 flow/moved update settings work_pool_name",
+    ]
@@ -0,0 +1,114 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from prefect_addl_utils.entrypoint import FlowParameter, check_entrypoint, resolve_entrypoint
+
+FLOW_MODULE = """
+import prefect
+from prefect import flow as prefect_flow
+from .helpers import imported_flow
+
+import heavy_dependency_that_is_not_installed
+
+
+@prefect_flow(name="heavy-flow", retries=2)
+def main(table: str, rows: int = 10, *, dry_run: bool = False):
+    ...
+
+
+@prefect.flow
+async def load_all(**options):
+    ...
+
+
+def helper():
+    ...
+
+
+wrapped = prefect_flow(helper)
+"""
+
+
+def test_flow_is_resolved_without_importing_the_module(tmp_path):
+    (tmp_path / "flows").mkdir()
+    (tmp_path / "flows" / "heavy.py").write_text(FLOW_MODULE)
+
+    main = resolve_entrypoint("flows/heavy.py:main", tmp_path)
+    load_all = resolve_entrypoint("flows/heavy.py:load_all", tmp_path)
+
+    assert (main.flow_name, main.is_async) == ("heavy-flow", False)
+    assert main.parameters == (
+        FlowParameter("table", "positional", "str", None),
+        FlowParameter("rows", "positional", "int", "10"),
+        FlowParameter("dry_run", "keyword", "bool", "False"),
+    )
+    assert (load_all.flow_name, load_all.is_async) == ("load-all", True)
+    assert load_all.parameters == (FlowParameter("options", "var_keyword", None, None),)
+    assert resolve_entrypoint("flows/heavy.py:wrapped", tmp_path).flow_name == "helper"
+    assert resolve_entrypoint("flows/heavy.py:imported_flow", tmp_path) is None
+    assert "heavy_dependency_that_is_not_installed" not in sys.modules
+
+
+@pytest.mark.parametrize(
+    "entrypoint, message",
+    [
+        ("flows/heavy.py:missing", "no top-level `missing`"),
+        ("flows/heavy.py:helper", "not decorated with `@flow`"),
+        ("flows/other.py:main", "cannot read"),
+        ("flows/broken.py:main", "not valid Python"),
+    ],
+)
+def test_invalid_entrypoints_are_rejected(tmp_path, entrypoint, message):
+    (tmp_path / "flows").mkdir()
+    (tmp_path / "flows" / "heavy.py").write_text(FLOW_MODULE)
+    (tmp_path / "flows" / "broken.py").write_text("@flow\ndef main(:\n")
+
+    with pytest.raises(ValueError, match=message):
+        resolve_entrypoint(entrypoint, tmp_path)
+
+
+def test_results_are_cached_by_content(tmp_path):
+    first, second = tmp_path / "a.py", tmp_path / "b.py"
+    first.write_text(FLOW_MODULE)
+    second.write_text(FLOW_MODULE)
+
+    assert resolve_entrypoint("a.py:main", tmp_path) is resolve_entrypoint("b.py:main", tmp_path)
+    second.write_text(FLOW_MODULE.replace('name="heavy-flow"', 'name="renamed-flow"'))
+    with pytest.raises(ValueError, match="is named 'renamed-flow', but 'heavy-flow' was expected"):
+        check_entrypoint("b.py:main", "heavy-flow", tmp_path)
+
+
+def test_repo_test_flow_resolves():
+    static_flow = check_entrypoint("test/flow.py:main", "test-flow3", Path(__file__).parents[1])
+
+    assert [x.name for x in static_flow.parameters] == ["test_mode", "username", "host", "loop_sleep_ms"]
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "from impl import *\n",
+        "import impl\n\nfor main in [impl.main]:\n    pass\n",
+        "import impl\n\nwith impl.flows() as main:\n    pass\n",
+        "import impl\n\nmain, other = impl.main, impl.other\n",
+        "try:\n    pass\nfinally:\n    from impl import main\n",
+        "import impl\n\nglobals()['main'] = impl.main\n",
+        "from prefect import flow\n\n@flow\ndef main():\n    ...\n\nfrom impl import *\n",
+    ],
+)
+def test_bindings_that_are_not_followed_are_left_to_the_import(tmp_path, module):
+    (tmp_path / "flow.py").write_text(module)
+
+    assert resolve_entrypoint("flow.py:main", tmp_path) is None
+
+
+def test_local_names_in_other_functions_do_not_hide_a_missing_flow(tmp_path):
+    (tmp_path / "flow.py").write_text("def helper():\n    main = 1\n    return main\n")
+
+    with pytest.raises(ValueError, match="no top-level `main`"):
+        resolve_entrypoint("flow.py:main", tmp_path)
@@ -0,0 +1,169 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import contextlib
+
+import pytest
+import pytest_asyncio
+from prefect.client.schemas.actions import WorkPoolCreate
+from prefect.client.schemas.objects import MinimalDeploymentSchedule
+from prefect.client.schemas.schedules import CronSchedule
+from prefect.exceptions import ObjectAlreadyExists
+from prefect.flows import load_flow_from_entrypoint
+from prefect.runner.storage import GitRepository
+
+from prefect_addl_utils.deployment_config import DeploymentConfig
+from prefect_addl_utils.deployment_diff import DeploymentDiff
+from prefect_addl_utils.deployment_process import deploy_by_pool, execute_deploy_process
+from prefect_addl_utils.deployment_state import matches_sent
+from prefect_addl_utils.fingerprint import local_fingerprint, server_fingerprint
+from prefect_addl_utils.flow_source import attach_source, build_deployment
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("prefect_server")]
+
+ENTRYPOINT = "flow_a/flow.py:main"
+
+CONFIG = DeploymentConfig(
+    name="dep",
+    version="1.0.0",
+    work_queue_name="default",
+    job_variables={"env": {"A": "1"}},
+    parameters={"table": "t", "rows": 5},
+    description="deployment description",
+    schedules=[
+        MinimalDeploymentSchedule(schedule=CronSchedule(cron="0 1 * * *", timezone="America/Chicago")),
+        MinimalDeploymentSchedule(schedule=CronSchedule(cron="0 2 * * *"), active=False),
+    ],
+    tags=["team", "nightly"],
+)
+# the description falls back to the flow's, everything else to prefect's empty defaults
+MINIMAL_CONFIG = DeploymentConfig(name="minimal", version="1.0.0")
+
+CONFIG_CHANGES = {
+    "schedule": {"schedules": [MinimalDeploymentSchedule(schedule=CronSchedule(cron="0 3 * * *"))]},
+    "schedule active": {
+        "schedules": [
+            MinimalDeploymentSchedule(schedule=CronSchedule(cron="0 1 * * *", timezone="America/Chicago")),
+            MinimalDeploymentSchedule(schedule=CronSchedule(cron="0 2 * * *"), active=True),
+        ]
+    },
+    "tags": {"tags": ["team"]},
+    "parameters": {"parameters": {"table": "t", "rows": 6}},
+    "description": {"description": "another description"},
+    "version": {"version": "1.0.1"},
+    "job_variables": {"job_variables": {"env": {"A": "2"}}},
+    "work_queue": {"work_queue_name": "other-queue"},
+}
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def work_pools(client):
+    for name in ("pool-a", "pool-b"):
+        with contextlib.suppress(ObjectAlreadyExists):
+            await client.create_work_pool(WorkPoolCreate(name=name, type="process"))
+
+
+@pytest.fixture
+def flow(flows_repo):
+    return load_flow_from_entrypoint(str(flows_repo / ENTRYPOINT))
+
+
+@pytest.fixture
+def source(flows_repo):
+    return GitRepository(url=str(flows_repo), branch="main", name="flows")
+
+
+async def __round_trip(client, config: DeploymentConfig, flow, source, work_pool_name: str = "pool-a"):
+    flow = attach_source(flow, source, ENTRYPOINT)
+    deployment = build_deployment(flow, **{**config.dict(), "work_pool_name": work_pool_name})
+    [deployment_id] = await deploy_by_pool(client, [deployment])
+    return await client.read_deployment(deployment_id)
+
+
+def __local(config: DeploymentConfig, flow, source, *, entrypoint: str = ENTRYPOINT, work_pool_name: str = "pool-a"):
+    return local_fingerprint(config, flow=flow, source=source, entrypoint=entrypoint, work_pool_name=work_pool_name)
+
+
+def __build(config: DeploymentConfig, flow, source, work_pool_name: str = "pool-a"):
+    return build_deployment(
+        attach_source(flow, source, ENTRYPOINT), **{**config.dict(), "work_pool_name": work_pool_name}
+    )
+
+
+def __diff(config: DeploymentConfig, flow, source, server, work_pool_name: str = "pool-a") -> DeploymentDiff:
+    return DeploymentDiff.build(server.name, __build(config, flow, source, work_pool_name), server)
+
+
+@pytest.mark.parametrize("config", [CONFIG, MINIMAL_CONFIG], ids=["full", "defaults"])
+async def test_round_trip_is_unchanged(client, flow, source, config):
+    server = await __round_trip(client, config, flow, source)
+
+    assert server_fingerprint(server) == __local(config, flow, source)
+    reordered = config.copy(update={"tags": (config.tags or [])[::-1], "schedules": (config.schedules or [])[::-1]})
+    assert server_fingerprint(server) == __local(reordered, flow, source)
+
+
+@pytest.mark.parametrize("field", list(CONFIG_CHANGES))
+async def test_one_changed_config_field_is_changed(client, flow, source, field):
+    server = await __round_trip(client, CONFIG, flow, source)
+
+    changed = CONFIG.copy(update=CONFIG_CHANGES[field])
+
+    assert server_fingerprint(server) != __local(changed, flow, source)
+    # the rendered diff agrees with the fingerprint on what `--plan` counts as an update
+    assert __diff(changed, flow, source, server).action == "update"
+
+
+@pytest.mark.parametrize("config", [CONFIG, MINIMAL_CONFIG], ids=["full", "defaults"])
+async def test_round_trip_diff_is_unchanged(client, flow, source, config):
+    server = await __round_trip(client, config, flow, source)
+
+    assert __diff(config, flow, source, server).action == "unchanged"
+    assert __diff(config, flow, source, server, work_pool_name="pool-b").settings[0].name == "work_pool_name"
+
+
+async def test_matches_sent_compares_settings(client, flow, source):
+    server = await __round_trip(client, CONFIG, flow, source)
+
+    assert matches_sent(__build(CONFIG, flow, source), server)
+    assert not matches_sent(__build(CONFIG.copy(update={"version": "1.0.1"}), flow, source), server)
+
+
+async def test_changed_work_pool_entrypoint_branch_or_schema_is_changed(client, flow, source, tmp_path):
+    server = await __round_trip(client, CONFIG, flow, source)
+    (tmp_path / "other_flow.py").write_text(
+        'from prefect import flow\n\n\n@flow(name="fp-flow", description="flow description", version="flow-version")\n'
+        "def main(table: str, rows: float = 10):\n    ...\n"
+    )
+    other_schema_flow = load_flow_from_entrypoint(str(tmp_path / "other_flow.py:main"))
+    other_branch = GitRepository(url=source._url, branch="release", name="flows")
+
+    assert server_fingerprint(server) == __local(CONFIG, flow, source)
+    assert server_fingerprint(server) != __local(CONFIG, flow, source, work_pool_name="pool-b")
+    assert server_fingerprint(server) != __local(CONFIG, flow, source, entrypoint="flow_a/other.py:main")
+    assert server_fingerprint(server) != __local(CONFIG, flow, other_branch)
+    assert server_fingerprint(server) != __local(CONFIG, other_schema_flow, source)
+
+
+async def test_incremental_deploy_skips_only_unchanged_deployments(client, flows_repo, source):
+    configs = [CONFIG.copy(update={"name": "inc0"}), CONFIG.copy(update={"name": "inc1"})]
+    run = {
+        "flow_name": "fp-flow",
+        "source": source,
+        "entrypoint": ENTRYPOINT,
+        "work_pool_name": "pool-a",
+        "client": client,
+        "source_checkout": flows_repo,
+        "cwd": flows_repo / "flow_a",
+        "cli_flags": ["--incremental", "--update-all"],
+    }
+    await execute_deploy_process(deployments=configs, **run)
+    before = {x: await client.read_deployment_by_name(f"fp-flow/{x}") for x in ("inc0", "inc1")}
+
+    configs[1] = configs[1].copy(update={"version": "1.0.1"})
+    await execute_deploy_process(deployments=configs, **run)
+    after = {x: await client.read_deployment_by_name(f"fp-flow/{x}") for x in ("inc0", "inc1")}
+
+    assert after["inc0"].updated == before["inc0"].updated
+    assert after["inc1"].updated > before["inc1"].updated
+    assert after["inc1"].version == "1.0.1"
@@ -0,0 +1,105 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import importlib.util
+import sys
+
+import pytest
+from git import Repo
+from prefect.client.schemas.objects import MinimalDeploymentSchedule
+from prefect.client.schemas.schedules import CronSchedule
+from prefect.deployments.runner import RunnerDeployment
+from prefect.runner.storage import GitRepository
+from prefect.utilities.callables import parameter_schema
+
+from prefect_addl_utils.flow_source import attach_source, build_deployment, load_flow_from_checkout
+
+FLOW_MODULE = """
+from prefect import flow
+
+
+@flow(name="schema-flow")
+def main(table: str, rows: int = 10):
+    ...
+"""
+
+MODELS_MODULE = """
+from pydantic.v1 import BaseModel
+
+
+class Options(BaseModel):
+    {fields}
+"""
+
+MODELS_FLOW_MODULE = """
+from prefect import flow
+from schema_models import Options
+
+
+@flow
+def main(options: Options):
+    ...
+"""
+
+
+def __load_flow(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    source = GitRepository(url="https://example.com/org/flows.git", name="flows")
+    return attach_source(module.main, source, f"{path.name}:main")
+
+
+def test_deployments_of_one_flow_share_the_parameter_schema(tmp_path):
+    path = tmp_path / "schema_flow.py"
+    path.write_text(FLOW_MODULE)
+    flow = __load_flow(path)
+
+    first, second = build_deployment(flow, name="first"), build_deployment(flow, name="second", version="2")
+
+    assert first._parameter_openapi_schema is second._parameter_openapi_schema
+    assert first._parameter_openapi_schema == parameter_schema(flow)
+    assert (first.version, second.version) == (flow.version, "2")
+
+
+@pytest.mark.asyncio
+async def test_reloaded_flow_schema_follows_imported_models(tmp_path):
+    (tmp_path / "schema_models.py").write_text(MODELS_MODULE.format(fields="a: int = 1"))
+    (tmp_path / "schema_flow.py").write_text(MODELS_FLOW_MODULE)
+    source = GitRepository(url="https://example.com/org/flows.git", name="flows")
+    before = build_deployment(await load_flow_from_checkout(source, "schema_flow.py:main", tmp_path), name="dep")
+
+    (tmp_path / "schema_models.py").write_text(MODELS_MODULE.format(fields="a: int = 1\n    b: int = 2"))
+    sys.modules.pop("schema_models", None)  # as `collect_deploy_runs`/`watch` drop modules before re-running
+    after = build_deployment(await load_flow_from_checkout(source, "schema_flow.py:main", tmp_path), name="dep")
+
+    assert list(before._parameter_openapi_schema.definitions["Options"]["properties"]) == ["a"]
+    assert list(after._parameter_openapi_schema.definitions["Options"]["properties"]) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_build_deployment_matches_from_storage(tmp_path):
+    # `build_deployment` sets the private `RunnerDeployment` attributes `from_storage` sets; this fails when prefect
+    # changes them
+    repo = Repo.init(tmp_path / "flows")
+    (tmp_path / "flows" / "schema_flow.py").write_text(FLOW_MODULE)
+    repo.index.add(["schema_flow.py"])
+    repo.index.commit("initial")
+    source = GitRepository(url=str(tmp_path / "flows"), name="flows")
+    kwargs = {
+        "name": "dep",
+        "schedules": [MinimalDeploymentSchedule(schedule=CronSchedule(cron="0 1 * * *"), active=False)],
+        "parameters": {"table": "t"},
+        "tags": ["team"],
+        "work_pool_name": "pool",
+        "job_variables": {"env": {"A": "1"}},
+    }
+
+    expected = await RunnerDeployment.from_storage(storage=source, entrypoint="schema_flow.py:main", **kwargs)
+    flow = await load_flow_from_checkout(source, "schema_flow.py:main", tmp_path / "flows")
+    actual = build_deployment(flow, **kwargs)
+
+    assert actual.dict(exclude={"storage"}) == expected.dict(exclude={"storage"})
+    assert actual.storage is source
+    assert actual._path == expected._path
+    assert actual._parameter_openapi_schema == expected._parameter_openapi_schema
@@ -0,0 +1,45 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import pytest
+from git import Repo
+from prefect.runner.storage import GitRepository
+
+from prefect_addl_utils.deployment_config import DeploymentConfig
+from prefect_addl_utils.deployment_process import execute_deploy_process
+
+
+@pytest.fixture
+def pushed_repo(flows_repo, tmp_path) -> Repo:
+    Repo.init(tmp_path / "origin.git", bare=True)
+    repo = Repo(flows_repo)
+    repo.create_remote("origin", str(tmp_path / "origin.git")).push("main")
+    return repo
+
+
+async def __deploy_local_source(flows_repo):
+    await execute_deploy_process(
+        flow_name="fp-flow",
+        source=GitRepository(url="https://example.com/flows.git", branch="main", name="flows"),
+        entrypoint="flow_a/flow.py:main",
+        deployments=[DeploymentConfig(name="local", version="1.0.0")],
+        work_pool_name="pool",
+        cwd=flows_repo / "flow_a",
+        cli_flags=["--local-source"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_source_refuses_unpushed_commits(flows_repo, pushed_repo):
+    (flows_repo / "flow_a" / "notes.md").write_text("unpushed\n", encoding="utf-8")
+    pushed_repo.index.add(["flow_a/notes.md"])
+    pushed_repo.index.commit("unpushed")
+
+    with pytest.raises(ValueError, match="to match `origin/main`"):
+        await __deploy_local_source(flows_repo)
+
+
+@pytest.mark.asyncio
+async def test_local_source_refuses_a_branch_without_a_remote_copy(flows_repo):
+    with pytest.raises(ValueError, match="to match `origin/main`"):
+        await __deploy_local_source(flows_repo)
@@ -0,0 +1,88 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from git import Repo
+
+from prefect_addl_utils.manage_config import AddlGitRepo, ProjectContext
+
+
+@pytest.fixture(autouse=True)
+def clear_project_cache():
+    ProjectContext.clear_cache()
+    yield
+    ProjectContext.clear_cache()
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """Git repo at `tmp_path/repo` with a flow directory two levels down."""
+    root = tmp_path / "repo"
+    Repo.init(root)
+    (root / "flows" / "flow_a").mkdir(parents=True)
+    return root
+
+
+def test_discovers_git_root_without_pyproject(project):
+    context = ProjectContext.discover(project / "flows" / "flow_a")
+
+    assert context.pyproject_path is None
+    assert context.config == {}
+    assert context.repo_root == project.resolve()
+
+
+def test_pyproject_without_tool_table(project):
+    (project / "pyproject.toml").write_text('[project]\nname = "flows"\n')
+
+    context = ProjectContext.discover(project / "flows" / "flow_a")
+
+    assert context.config == {}
+    assert context.repo_root == project.resolve()
+
+
+def test_configured_git_repo_root_is_relative_to_pyproject(project):
+    (project / "flows" / "pyproject.toml").write_text('[tool.prefect-addl-utils]\ngit-repo-root = ".."\n')
+
+    context = ProjectContext.discover(project / "flows" / "flow_a")
+
+    assert context.config == {"git-repo-root": ".."}
+    assert context.repo_root == project.resolve()
+    assert Path(context.repo.working_tree_dir) == project.resolve()
+
+
+def test_configured_git_repo_root_must_exist(project):
+    (project / "pyproject.toml").write_text('[tool.prefect-addl-utils]\ngit-repo-root = "missing"\n')
+
+    with pytest.raises(RuntimeError, match="was not found"):
+        ProjectContext.discover(project).repo_root
+
+
+def test_discovery_is_memoized_per_directory(project):
+    first = ProjectContext.discover(project / "flows")
+
+    assert ProjectContext.discover(project / "flows") is first
+    assert ProjectContext.discover(project / "flows" / "flow_a") is not first
+    assert ProjectContext.discover(project / "flows" / "flow_a").repo is first.repo
+
+
+def test_pyproject_change_invalidates_context(project):
+    pyproject = project / "pyproject.toml"
+    pyproject.write_text("[tool.prefect-addl-utils]\n")
+    first = ProjectContext.discover(project)
+
+    pyproject.write_text('[tool.prefect-addl-utils]\ngit-repo-root = "."\n')
+    stat = pyproject.stat()
+    os.utime(pyproject, ns=(stat.st_atime_ns, first.pyproject_mtime + 1_000_000_000))
+    second = ProjectContext.discover(project)
+
+    assert second is not first
+    assert second.config == {"git-repo-root": "."}
+
+
+def test_addl_git_repo_get_uses_cwd(project, monkeypatch):
+    monkeypatch.chdir(project / "flows" / "flow_a")
+
+    assert Path(AddlGitRepo.get().working_tree_dir) == project.resolve()
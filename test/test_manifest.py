@@ -0,0 +1,117 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+from prefect.blocks.system import Secret
+from prefect.client.schemas.schedules import CronSchedule, IntervalSchedule
+
+from prefect_addl_utils.manifest import DeploymentManifest
+
+MANIFEST = """
+[flow]
+name = "heavy-flow"
+entrypoint = "flows/heavy/flow.py:main"
+work_pool_name = "pool"
+
+[source]
+url = "https://example.com/org/flows.git"
+branch = "main"
+
+[defaults]
+version = "1.0.0"
+tags = ["team"]
+parameters = { host = "host1", retries = 3 }
+description_file = "_description.md"
+
+[[deployments]]
+name = "daily"
+schedules = [{ cron = "0 2 * * *", timezone = "America/Chicago" }]
+
+[[deployments]]
+name = "hourly"
+tags = ["team", "hourly"]
+parameters = { retries = 5 }
+schedules = [{ interval = 3600, active = false }]
+"""
+
+
+def __write(tmp_path: Path, content: str) -> Path:
+    (tmp_path / "_description.md").write_text("Loads the heavy tables")
+    path = tmp_path / "_deploy.toml"
+    path.write_text(content)
+    return path
+
+
+def test_manifest_maps_onto_deployment_configs(tmp_path):
+    manifest = DeploymentManifest.load(__write(tmp_path, MANIFEST))
+
+    daily, hourly = manifest.deployment_configs()
+
+    assert (daily.name, daily.version, daily.tags, daily.work_queue_name) == ("daily", "1.0.0", ["team"], "default")
+    assert daily.parameters == {"host": "host1", "retries": 3}
+    assert daily.description == "Loads the heavy tables"
+    assert daily.schedules[0].schedule == CronSchedule(cron="0 2 * * *", timezone="America/Chicago")
+    assert hourly.tags == ["team", "hourly"]
+    assert hourly.parameters == {"host": "host1", "retries": 5}
+    assert isinstance(hourly.schedules[0].schedule, IntervalSchedule)
+    assert hourly.schedules[0].active is False
+
+
+def test_interval_schedules_parse_identically(tmp_path):
+    path = __write(tmp_path, MANIFEST)
+
+    first = DeploymentManifest.load(path).deployment_configs()[1].schedules[0]
+    second = DeploymentManifest.load(path).deployment_configs()[1].schedules[0]
+
+    assert first.schedule == second.schedule
+
+
+def test_run_kwargs_do_not_import_the_flow(tmp_path):
+    run = DeploymentManifest.load(__write(tmp_path, MANIFEST)).run_kwargs()
+
+    assert run["flow_name"] == "heavy-flow"
+    assert run["entrypoint"] == "flows/heavy/flow.py:main"
+    assert run["source"]._url == "https://example.com/org/flows.git"
+    assert run["cwd"] == tmp_path.resolve()
+    assert "flow" not in run
+    assert not any(x == "flow" or x.endswith(".flow") for x in sys.modules)
+
+
+@pytest.mark.asyncio
+async def test_source_access_token_is_a_secret_block(tmp_path, prefect_server):
+    await Secret(value="s3cr3t-token").save("flows-token")
+    manifest = MANIFEST.replace('branch = "main"', 'branch = "main"\naccess_token_secret = "flows-token"')
+
+    run = await DeploymentManifest.load(__write(tmp_path, manifest)).run_kwargs()
+
+    assert run["source"]._credentials["access_token"].get() == "s3cr3t-token"
+    pull_step = run["source"].to_pull_step()["prefect.deployments.steps.git_clone"]
+    assert "prefect.blocks.secret.flows-token" in pull_step["credentials"]["access_token"]
+
+
+@pytest.mark.parametrize(
+    "broken, message",
+    [
+        (MANIFEST.replace("work_pool_name", "work_pool"), "work_pool"),
+        (MANIFEST.replace('cron = "0 2 * * *"', 'cron = "0 2 * * *", interval = 60'), "exactly one of"),
+        (MANIFEST.replace('version = "1.0.0"', ""), "version"),
+        (MANIFEST.replace("[flow]", "[flow"), "Invalid deployment manifest"),
+    ],
+)
+def test_invalid_manifests_are_rejected(tmp_path, broken, message):
+    with pytest.raises(ValueError, match=message):
+        DeploymentManifest.load(__write(tmp_path, broken)).deployment_configs()
+
+
+def test_deployments_can_override_the_work_pool(tmp_path):
+    manifest = DeploymentManifest.load(
+        __write(tmp_path, MANIFEST.replace('name = "hourly"', 'name = "hourly"\nwork_pool_name = "gpu-pool"'))
+    )
+
+    daily, hourly = manifest.deployment_configs()
+
+    assert manifest.run_kwargs()["work_pool_name"] == "pool"
+    assert (daily.work_pool_name, hourly.work_pool_name) == (None, "gpu-pool")
@@ -0,0 +1,141 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from git import Repo
+from prefect.client.schemas.actions import WorkPoolCreate
+from prefect.client.schemas.filters import FlowFilter, FlowFilterName
+from prefect.exceptions import ObjectAlreadyExists
+
+from prefect_addl_utils import deployment_process, monorepo
+from prefect_addl_utils.monorepo import collect_deploy_runs, discover_deploy_scripts, run_deploy_runs
+
+pytestmark = pytest.mark.asyncio
+
+FLOW_FILTER = FlowFilter(name=FlowFilterName(any_=["fp-flow", "fp-flow-b"]))
+
+DEPLOY_SCRIPT = """\
+import asyncio
+
+from prefect.runner.storage import GitRepository
+
+import prefect_addl_utils as addl
+
+if __name__ == "__main__":
+    asyncio.run(
+        addl.execute_deploy_process(
+            flow_name="{flow_name}",
+            source=GitRepository(url="{url}", branch="main", name="flows"),
+            entrypoint="{directory}/flow.py:main",
+            deployments=[addl.DeploymentConfig(name="{directory}-dep", version="1.0.0")],
+            work_pool_name="pool-mono",
+        )
+    )
+"""
+
+
+@pytest.fixture
+def flows_monorepo(flows_repo) -> Path:
+    """`flows_repo` with a `_deploy.py` for `fp-flow` (`flow_a`) and `fp-flow-b` (`flow_b`), committed on `main`."""
+    flow_b = (flows_repo / "flow_a" / "flow.py").read_text().replace('name="fp-flow"', 'name="fp-flow-b"')
+    (flows_repo / "flow_b").mkdir()
+    (flows_repo / "flow_b" / "flow.py").write_text(flow_b)
+    for directory, flow_name in (("flow_a", "fp-flow"), ("flow_b", "fp-flow-b")):
+        script = DEPLOY_SCRIPT.format(flow_name=flow_name, url=flows_repo.as_posix(), directory=directory)
+        (flows_repo / directory / "_deploy.py").write_text(script)
+    repo = Repo(flows_repo)
+    repo.index.add(["flow_a/_deploy.py", "flow_b/_deploy.py", "flow_b/flow.py"])
+    repo.index.commit("deploy scripts")
+    return flows_repo
+
+
+@pytest_asyncio.fixture
+async def work_pool(client):
+    with contextlib.suppress(ObjectAlreadyExists):
+        await client.create_work_pool(WorkPoolCreate(name="pool-mono", type="process"))
+    # the server is shared by the module, so every test starts without the deployments an earlier one made
+    for deployment in await client.read_deployments(flow_filter=FLOW_FILTER):
+        await client.delete_deployment(deployment.id)
+
+
+async def __deployment_names(client) -> list[str]:
+    return sorted(x.name for x in await client.read_deployments(flow_filter=FLOW_FILTER))
+
+
+def test_discovery_skips_hidden_and_clutter_directories(tmp_path):
+    for name in (
+        "_deploy.py",
+        "flow_b/_deploy.toml",
+        "flow_a/_deploy.py",
+        "flow_a/nested/_deploy.py",
+        ".venv/lib/_deploy.py",
+        "node_modules/pkg/_deploy.py",
+        "flow_a/__pycache__/_deploy.py",
+        "venv/_deploy.py",
+    ):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("")
+
+    assert discover_deploy_scripts(tmp_path) == [
+        tmp_path / "_deploy.py",
+        tmp_path / "flow_a" / "_deploy.py",
+        tmp_path / "flow_a" / "nested" / "_deploy.py",
+        tmp_path / "flow_b" / "_deploy.toml",
+    ]
+
+
+@pytest.mark.usefixtures("work_pool")
+async def test_collect_captures_runs_without_deploying(client, flows_monorepo):
+    # a `_deploy.py` calls `asyncio.run(...)`, which cannot run inside the test's event loop
+    runs = await asyncio.to_thread(collect_deploy_runs, flows_monorepo / "flow_a" / "_deploy.py", ["--update-all"])
+
+    assert [(x["flow_name"], x["entrypoint"], x["cwd"]) for x in runs] == [
+        ("fp-flow", "flow_a/flow.py:main", (flows_monorepo / "flow_a").resolve())
+    ]
+    assert [x.name for x in runs[0]["deployments"]] == ["flow_a-dep"]
+    assert await __deployment_names(client) == []
+
+
+@pytest.mark.usefixtures("work_pool")
+async def test_runs_share_one_client_and_one_pull_per_source(client, flows_monorepo, monkeypatch):
+    runs = []
+    for directory in ("flow_a", "flow_b"):
+        runs += await asyncio.to_thread(collect_deploy_runs, flows_monorepo / directory / "_deploy.py", [])
+    pulled, clients = [], []
+    pull_source, execute_deploy_process = monorepo.pull_source, deployment_process.execute_deploy_process
+
+    async def counting_pull_source(source, base_path):
+        pulled.append(source._url)
+        return await pull_source(source, base_path)
+
+    async def recording_execute_deploy_process(**kwargs):
+        clients.append(kwargs["client"])
+        return await execute_deploy_process(**kwargs)
+
+    monkeypatch.setattr(monorepo, "pull_source", counting_pull_source)
+    monkeypatch.setattr(deployment_process, "execute_deploy_process", recording_execute_deploy_process)
+
+    await run_deploy_runs(runs, cli_flags=[])
+
+    assert pulled == [flows_monorepo.as_posix()]
+    assert len(clients) == 2 and clients[0] is clients[1]
+    assert await __deployment_names(client) == ["flow_a-dep", "flow_b-dep"]
+
+
+@pytest.mark.usefixtures("work_pool")
+async def test_deploy_all_since_only_deploys_changed_directories(client, flows_monorepo):
+    repo = Repo(flows_monorepo)
+    repo.create_head("base")
+    (flows_monorepo / "flow_b" / "notes.md").write_text("changed\n")
+    repo.index.add(["flow_b/notes.md"])
+    repo.index.commit("change flow_b")
+
+    runs = await asyncio.to_thread(monorepo.deploy_all, flows_monorepo, cli_flags=["--since", "base"])
+
+    assert [x["flow_name"] for x in runs] == ["fp-flow-b"]
+    assert await __deployment_names(client) == ["flow_b-dep"]
@@ -0,0 +1,97 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import contextlib
+import json
+
+import pytest
+import pytest_asyncio
+from prefect.client.schemas.actions import WorkPoolCreate
+from prefect.exceptions import ObjectAlreadyExists, ObjectNotFound
+from prefect.runner.storage import GitRepository
+
+from prefect_addl_utils.deployment_config import DeploymentConfig
+from prefect_addl_utils.deployment_process import PLAN_CHANGES_EXIT_CODE, execute_deploy_process
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("prefect_server")]
+
+ENTRYPOINT = "flow_a/flow.py:main"
+CONFIGS = [
+    DeploymentConfig(name="plan0", version="1.0.0", parameters={"table": "t"}, tags=["team"]),
+    DeploymentConfig(name="plan1", version="1.0.0", parameters={"table": "t"}, tags=["team"]),
+]
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def work_pool(client):
+    with contextlib.suppress(ObjectAlreadyExists):
+        await client.create_work_pool(WorkPoolCreate(name="pool-plan", type="process"))
+
+
+@pytest.fixture
+def run(client, flows_repo) -> dict:
+    return {
+        "flow_name": "fp-flow",
+        "source": GitRepository(url=str(flows_repo), branch="main", name="flows"),
+        "entrypoint": ENTRYPOINT,
+        "work_pool_name": "pool-plan",
+        "client": client,
+        "cwd": flows_repo / "flow_a",
+    }
+
+
+@pytest_asyncio.fixture
+async def deployed(client, flows_repo, run) -> dict:
+    await execute_deploy_process(deployments=CONFIGS, source_checkout=flows_repo, cli_flags=[], **run)
+    return {x.name: await client.read_deployment_by_name(f"fp-flow/{x.name}") for x in CONFIGS}
+
+
+@pytest.fixture
+def no_clone(monkeypatch):
+    async def clone(*args, **kwargs):
+        raise AssertionError("`--plan` cloned the source")
+
+    monkeypatch.setattr(GitRepository, "pull_code", clone)
+
+
+@pytest.mark.usefixtures("no_clone")
+async def test_plan_with_changes_exits_2_and_deploys_nothing(client, deployed, run, capsys):
+    configs = [CONFIGS[0], CONFIGS[1].copy(update={"version": "1.0.1"}), DeploymentConfig(name="plan2", version="1")]
+
+    with pytest.raises(SystemExit) as exc_info:
+        await execute_deploy_process(deployments=configs, cli_flags=["--plan"], **run)
+
+    assert exc_info.value.code == PLAN_CHANGES_EXIT_CODE
+    assert "Plan: 1 to create, 1 to update, 1 unchanged" in capsys.readouterr().out
+    for name, deployment in deployed.items():
+        assert (await client.read_deployment_by_name(f"fp-flow/{name}")).updated == deployment.updated
+    with pytest.raises(ObjectNotFound):
+        await client.read_deployment_by_name("fp-flow/plan2")
+
+
+@pytest.mark.usefixtures("no_clone")
+async def test_plan_without_changes_exits_0(deployed, run, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        await execute_deploy_process(deployments=CONFIGS, cli_flags=["--plan"], **run)
+
+    assert exc_info.value.code == 0
+    assert "Plan: 0 to create, 0 to update, 2 unchanged" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    ("cli_flags", "actions"),
+    [(["--plan"], ["update", "unchanged"]), (["--update-all"], ["unchanged", "update"])],
+    ids=["plan", "deploy"],
+)
+async def test_ndjson_diffs_are_the_only_stdout(flows_repo, deployed, run, capsys, cli_flags, actions):
+    configs = [CONFIGS[0], CONFIGS[1].copy(update={"version": "1.0.2"})]
+    capsys.readouterr()
+
+    with contextlib.suppress(SystemExit):
+        await execute_deploy_process(
+            deployments=configs, source_checkout=flows_repo, cli_flags=[*cli_flags, "--diff-format", "ndjson"], **run
+        )
+
+    out, err = capsys.readouterr()
+    assert [json.loads(x)["action"] for x in out.splitlines()] == actions
+    assert str(run["cwd"]) in err
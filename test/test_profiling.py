@@ -0,0 +1,83 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from prefect_addl_utils import profiling
+from prefect_addl_utils.profiling import Profiler
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_span_is_a_noop_without_profiler():
+    with profiling.span("phase") as span:
+        assert span is None
+    assert profiling.current() is None
+
+
+async def test_nested_spans_count_requests():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    profiler = Profiler()
+    with profiler.activate():
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            with profiling.span("read"):
+                await client.get("/a")
+                with profiling.span("deployment", deployment="dep0"):
+                    await client.get("/b")
+            await client.get("/untracked")
+
+    summary = {x["path"]: x for x in profiler.summary()}
+    assert list(summary) == ["read", "read/deployment"]
+    assert summary["read"]["requests"] == 2
+    assert summary["read/deployment"]["requests"] == 1
+    assert profiler.spans[0].attributes == {"deployment": "dep0"}
+
+
+async def test_memory_peaks_are_attributed_to_open_spans():
+    profiler = Profiler(trace_memory=True)
+    with profiler.activate():
+        with profiling.span("outer"):
+            with profiling.span("allocate"):
+                data = bytearray(5 * 1024**2)
+            del data
+            with profiling.span("small"):
+                pass
+
+    peaks = {x["path"]: x["peak_bytes"] for x in profiler.summary()}
+    assert peaks["outer/allocate"] >= 5 * 1024**2
+    assert peaks["outer"] >= peaks["outer/allocate"]
+    assert peaks["outer/small"] < 5 * 1024**2
+
+
+async def test_profile_runs_hooks_and_writes_report(tmp_path):
+    finished = []
+
+    def hook(span):
+        finished.append(span.path)
+
+    profiling.add_span_hook(hook)
+    try:
+        with profiling.profile(False) as profiler:
+            with profiling.span("deploy run"):
+                with profiling.span("deploy"):
+                    pass
+    finally:
+        profiling.remove_span_hook(hook)
+
+    assert finished == ["deploy run/deploy", "deploy run"]
+    report = json.loads(profiler.write_report(tmp_path / "profile.json").read_text())
+    assert [x["path"] for x in report["summary"]] == ["deploy run", "deploy run/deploy"]
+
+
+async def test_request_counter_is_removed_when_the_outermost_profiler_exits():
+    send = httpx.AsyncClient.send
+
+    with Profiler().activate():
+        with Profiler().activate():
+            patched = httpx.AsyncClient.send
+        assert httpx.AsyncClient.send is patched
+    assert patched is not send
+    assert httpx.AsyncClient.send is send
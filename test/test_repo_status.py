@@ -0,0 +1,169 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from git import Repo
+
+from prefect_addl_utils.repo_status import ChangedSince, RepoStatus
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Repo:
+    repo = Repo.init(tmp_path / "flows")
+    for name in ("flow_a/flow.py", "flow_b/flow.py", "shared/utils.py"):
+        path = tmp_path / "flows" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("# flow\n")
+    repo.index.add(["flow_a/flow.py", "flow_b/flow.py", "shared/utils.py"])
+    repo.index.commit("initial")
+    return repo
+
+
+def __root(repo: Repo) -> Path:
+    return Path(repo.working_tree_dir)
+
+
+def test_clean_repo(repo):
+    status = RepoStatus(repo)
+
+    assert status.changed_paths == []
+    assert not status.is_dirty(__root(repo) / "flow_a")
+    assert not status.is_dirty(__root(repo))
+
+
+def test_unstaged_change_only_dirties_its_directory(repo):
+    (__root(repo) / "flow_a" / "flow.py").write_text("# changed\n")
+    status = RepoStatus(repo)
+
+    assert status.is_dirty(__root(repo) / "flow_a")
+    assert not status.is_dirty(__root(repo) / "flow_b")
+    assert status.is_dirty(__root(repo))
+
+
+def test_staged_change(repo):
+    (__root(repo) / "flow_b" / "flow.py").write_text("# changed\n")
+    repo.index.add(["flow_b/flow.py"])
+
+    assert RepoStatus(repo).is_dirty(__root(repo) / "flow_b")
+
+
+def test_untracked_files_and_directories(repo):
+    (__root(repo) / "flow_a" / "notes.txt").write_text("untracked\n")
+    (__root(repo) / "flow_c" / "nested").mkdir(parents=True)
+    (__root(repo) / "flow_c" / "nested" / "flow.py").write_text("# new flow\n")
+    status = RepoStatus(repo)
+
+    assert status.is_dirty(__root(repo) / "flow_a")
+    assert status.is_dirty(__root(repo) / "flow_c" / "nested")
+    assert not status.is_dirty(__root(repo) / "flow_b")
+
+
+def test_matches_gitpython_is_dirty(repo):
+    (__root(repo) / "shared" / "utils.py").write_text("# changed\n")
+    (__root(repo) / "flow_a" / "new.py").write_text("# new\n")
+    status = RepoStatus(repo)
+
+    for name in ("flow_a", "flow_b", "shared"):
+        path = __root(repo) / name
+        assert status.is_dirty(path) == repo.is_dirty(path=path, untracked_files=True)
+
+
+def test_status_is_cached_until_refresh(repo):
+    status = RepoStatus(repo)
+    assert not status.is_dirty(__root(repo) / "flow_a")
+
+    (__root(repo) / "flow_a" / "flow.py").write_text("# changed\n")
+    assert not status.is_dirty(__root(repo) / "flow_a")
+
+    status.refresh()
+    assert status.is_dirty(__root(repo) / "flow_a")
+
+
+def test_for_repo_shares_one_instance_per_repo(repo):
+    assert RepoStatus.for_repo(repo) is RepoStatus.for_repo(Repo(repo.working_tree_dir))
+
+
+def __commit(repo: Repo, name: str, content: str = "# changed\n"):
+    path = __root(repo) / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    repo.index.add([name])
+    repo.index.commit(f"change {name}")
+
+
+def test_changed_since_maps_commits_onto_deploy_directories(repo):
+    __commit(repo, "flow_a/flow.py")
+    (__root(repo) / "flow_b" / "flow.py").write_text("# uncommitted\n")
+    changes = ChangedSince(repo, "HEAD~1")
+
+    assert changes.changed_paths == [Path("flow_a/flow.py")]
+    assert changes.affects(__root(repo) / "flow_a")
+    assert not changes.affects(__root(repo) / "flow_b")
+    assert changes.affects(__root(repo))
+
+
+def test_changed_since_follows_dependency_globs(repo):
+    __commit(repo, "shared/db/connection.py")
+    changes = ChangedSince(repo, "HEAD~1", {"flow_a": ["shared/db/*"], "flow_*": ["requirements.txt"]})
+
+    assert changes.affects(__root(repo) / "flow_a")
+    assert not changes.affects(__root(repo) / "flow_b")
+
+
+def test_changed_since_rejects_unknown_refs(repo):
+    with pytest.raises(ValueError, match="--since no-such-ref"):
+        ChangedSince(repo, "no-such-ref").changed_paths
+
+
+def test_head_is_on_a_checked_out_or_detached_branch(repo):
+    status = RepoStatus(repo)
+    main = repo.active_branch.name
+    repo.create_head("release")
+
+    assert status.head_is_on(main)
+    assert not status.head_is_on("release")
+    (__root(repo) / "flow_a" / "flow.py").write_text("# changed\n")
+    repo.index.add(["flow_a/flow.py"])
+    repo.index.commit("second")
+    repo.git.checkout("--detach", "release")
+    assert status.head_is_on("release")
+    assert not status.head_is_on(main)
+    assert not status.head_is_on("missing")
+
+
+def test_head_is_pushed_only_at_the_remote_branch_commit(repo, tmp_path):
+    status = RepoStatus(repo)
+    main = repo.active_branch.name
+    assert not status.head_is_pushed(main)  # no remote
+
+    Repo.init(tmp_path / "origin.git", bare=True)
+    repo.create_remote("origin", str(tmp_path / "origin.git")).push(main)
+    assert status.head_is_pushed(main)
+    __commit(repo, "flow_a/flow.py")
+    assert not status.head_is_pushed(main)
+    repo.remote("origin").push(main)
+    assert status.head_is_pushed(main)
+
+
+def test_changed_since_ignores_commits_made_on_the_ref_after_branching(repo):
+    base = repo.active_branch.name
+    repo.git.checkout("-b", "feature")
+    __commit(repo, "flow_a/flow.py")
+    repo.git.checkout(base)
+    __commit(repo, "flow_b/flow.py")
+    repo.git.checkout("feature")
+
+    assert ChangedSince(repo, base).changed_paths == [Path("flow_a/flow.py")]
+
+
+def test_changed_since_for_repo_follows_a_moving_head(repo):
+    __commit(repo, "flow_a/flow.py")
+    first = ChangedSince.for_repo(repo, "HEAD~1", {})
+    assert first is ChangedSince.for_repo(repo, "HEAD~1", {})
+    __commit(repo, "flow_b/flow.py")
+    second = ChangedSince.for_repo(repo, "HEAD~1", {})
+
+    assert second is not first
+    assert second.changed_paths == [Path("flow_b/flow.py")]
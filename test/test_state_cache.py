@@ -0,0 +1,106 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+from uuid import UUID
+
+import pytest
+
+from prefect_addl_utils.state_cache import DeploymentStateCache
+
+NAMES = ["dep0", "dep1", "dep2"]
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("prefect_server")]
+
+
+async def __create_flow(client, flow_name: str, tags: list[str]) -> UUID:
+    flow_id = await client.create_flow_from_name(flow_name)
+    for name in NAMES:
+        await client.create_deployment(flow_id=flow_id, name=name, tags=tags)
+    return flow_id
+
+
+def __count_downloads(client, monkeypatch) -> list[int]:
+    """Records how many deployments each `read_deployments` call downloads."""
+    downloads = []
+    read_deployments = client.read_deployments
+
+    async def counting_read_deployments(**kwargs):
+        page = await read_deployments(**kwargs)
+        downloads.append(len(page))
+        return page
+
+    monkeypatch.setattr(client, "read_deployments", counting_read_deployments)
+    return downloads
+
+
+async def test_cold_read_matches_server(tmp_path, client):
+    await __create_flow(client, "cold-flow", ["a"])
+    cache = DeploymentStateCache(tmp_path)
+
+    index = await cache.read(client, "cold-flow", NAMES)
+
+    assert sorted(index) == [f"cold-flow/{x}" for x in NAMES]
+    assert cache.load(str(client.api_url), "cold-flow", NAMES) == index
+
+
+async def test_warm_read_downloads_one_record_when_unchanged(tmp_path, client, monkeypatch):
+    await __create_flow(client, "warm-flow", ["a"])
+    cache = DeploymentStateCache(tmp_path)
+    cold = await cache.read(client, "warm-flow", NAMES)
+    downloads = __count_downloads(client, monkeypatch)
+
+    warm = await cache.read(client, "warm-flow", NAMES)
+
+    assert warm == cold
+    assert sum(downloads) == 1
+
+
+async def test_warm_read_refetches_updated_deployment(tmp_path, client):
+    flow_id = await __create_flow(client, "updated-flow", ["a"])
+    cache = DeploymentStateCache(tmp_path)
+    await cache.read(client, "updated-flow", NAMES)
+
+    await client.create_deployment(flow_id=flow_id, name="dep0", tags=["b"])
+    index = await cache.read(client, "updated-flow", NAMES)
+
+    assert index["updated-flow/dep0"].tags == ["b"]
+    assert index["updated-flow/dep1"].tags == ["a"]
+
+
+async def test_warm_read_drops_deleted_deployment(tmp_path, client):
+    await __create_flow(client, "deleted-flow", ["a"])
+    cache = DeploymentStateCache(tmp_path)
+    cold = await cache.read(client, "deleted-flow", NAMES)
+
+    await client.delete_deployment(cold["deleted-flow/dep1"].id)
+    index = await cache.read(client, "deleted-flow", NAMES)
+
+    assert sorted(index) == ["deleted-flow/dep0", "deleted-flow/dep2"]
+
+
+async def test_warm_read_finds_new_deployment(tmp_path, client):
+    flow_id = await __create_flow(client, "new-flow", ["a"])
+    cache = DeploymentStateCache(tmp_path)
+    await cache.read(client, "new-flow", NAMES + ["dep3"])
+
+    await client.create_deployment(flow_id=flow_id, name="dep3", tags=["c"])
+    index = await cache.read(client, "new-flow", NAMES + ["dep3"])
+
+    assert index["new-flow/dep3"].tags == ["c"]
+
+
+async def test_records_reused_after_deploy_are_not_stored(tmp_path, client):
+    flow_id = await __create_flow(client, "deployed-flow", ["a"])
+    cache = DeploymentStateCache(tmp_path)
+    previous = await cache.read(client, "deployed-flow", NAMES)
+
+    # as after `deploy()`: dep0 reused as read before applying it, dep1 re-read
+    await client.create_deployment(flow_id=flow_id, name="dep0", tags=["a"], version="2")
+    await client.create_deployment(flow_id=flow_id, name="dep1", tags=["b"])
+    reread = await client.read_deployment_by_name("deployed-flow/dep1")
+    deployed = {**previous, "deployed-flow/dep1": reread}
+    cache.store_deployed(str(client.api_url), "deployed-flow", deployed, previous)
+    index = await cache.read(client, "deployed-flow", NAMES)
+
+    assert index["deployed-flow/dep0"].version == "2"
+    assert index["deployed-flow/dep1"].tags == ["b"]
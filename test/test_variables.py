@@ -0,0 +1,51 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from prefect.blocks.system import Secret
+from prefect.client.schemas.actions import VariableCreate, VariableUpdate
+
+from prefect_addl_utils.variables import VariableCache, git_repository_from_variables, resolve_values
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("prefect_server")]
+
+
+async def test_variables_are_cached_until_ttl(client):
+    await client.create_variable(VariableCreate(name="flows_branch", value="main"))
+    cache = VariableCache()
+
+    first = await resolve_values(["flows_branch", "missing"], client=client, cache=cache)
+    await client.update_variable(VariableUpdate(name="flows_branch", value="dev"))
+    cached = await resolve_values(["flows_branch"], client=client, cache=cache)
+    cache.ttl = timedelta(0)
+    expired = await resolve_values(["flows_branch"], client=client, cache=cache)
+    new_process = await resolve_values(["flows_branch"], client=client, cache=VariableCache())
+
+    assert first.variables == {"flows_branch": "main", "missing": None}
+    assert cached.variables == {"flows_branch": "main"}
+    assert expired.variables == new_process.variables == {"flows_branch": "dev"}
+
+
+async def test_secrets_stay_out_of_the_variable_cache(client):
+    await Secret(value="s3cr3t-token").save("flows-token", client=client)
+    cache = VariableCache()
+
+    resolved = await resolve_values(["flows_branch"], ["flows-token"], client=client, cache=cache)
+
+    assert resolved.secrets["flows-token"].get() == "s3cr3t-token"
+    assert "s3cr3t-token" not in repr(cache._values)
+
+
+async def test_git_repository_from_variables(client):
+    await client.create_variable(VariableCreate(name="flows_storage", value="https://example.com/org/flows.git"))
+    await client.create_variable(VariableCreate(name="release_branch", value="release"))
+
+    source = await git_repository_from_variables(
+        url_variable="flows_storage", branch_variable="release_branch", client=client, cache=VariableCache()
+    )
+
+    assert (source._url, source._branch) == ("https://example.com/org/flows.git", "release")
+    with pytest.raises(ValueError, match="does not exist"):
+        await git_repository_from_variables(url_variable="missing", client=client, cache=VariableCache())
@@ -0,0 +1,80 @@
+# ruff: noqa: S101
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+from prefect_addl_utils.watch import DeployDirectoryWatcher, drop_repo_modules
+
+
+def __write(path: Path, content: str = "# deploy\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    stat = path.stat()
+    # bump the modification time explicitly, so back-to-back writes never look unchanged
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_changes_map_to_the_nearest_deploy_directory(tmp_path):
+    __write(tmp_path / "flow_a" / "_deploy.py")
+    __write(tmp_path / "flow_a" / "lib" / "helpers.py")
+    __write(tmp_path / "flow_a" / "nested" / "_deploy.toml")
+    __write(tmp_path / "flow_b" / "_deploy.py")
+    watcher = DeployDirectoryWatcher(tmp_path, {})
+
+    assert watcher.poll() == []
+    __write(tmp_path / "flow_a" / "lib" / "helpers.py", "# changed\n")
+    __write(tmp_path / "flow_a" / "nested" / "flow.py")
+    assert watcher.poll() == [(tmp_path / "flow_a").resolve(), (tmp_path / "flow_a" / "nested").resolve()]
+    assert watcher.poll() == []
+
+    (tmp_path / "flow_b" / "_deploy.py").unlink()
+    assert watcher.poll() == [(tmp_path / "flow_b").resolve()]
+    nested = tmp_path / "flow_a" / "nested"
+    assert watcher.scripts_in(nested.resolve()) == [nested / "_deploy.toml"]
+
+
+def test_clutter_and_files_outside_deploy_directories_are_ignored(tmp_path):
+    __write(tmp_path / "flow_a" / "_deploy.py")
+    watcher = DeployDirectoryWatcher(tmp_path, {})
+
+    __write(tmp_path / "flow_a" / "__pycache__" / "flow.cpython-311.pyc")
+    __write(tmp_path / "flow_a" / ".flow.py.swp")
+    __write(tmp_path / "flow_a" / "flow.py~")
+    __write(tmp_path / "shared" / "utils.py")
+
+    assert watcher.poll() == []
+
+
+def test_shared_dependencies_mark_their_dependents(tmp_path):
+    for name in ("flows/flow_a/_deploy.py", "flows/flow_b/_deploy.py", "shared/db/connection.py", "requirements.txt"):
+        __write(tmp_path / name)
+    dependencies = {"flows/flow_a": ["shared/db/*"], "flows/*": ["requirements.txt"]}
+    watcher = DeployDirectoryWatcher(tmp_path / "flows", dependencies, repo_root=tmp_path)
+    flow_a, flow_b = (tmp_path / "flows" / "flow_a").resolve(), (tmp_path / "flows" / "flow_b").resolve()
+
+    __write(tmp_path / "shared" / "db" / "connection.py", "# changed\n")
+    assert watcher.poll() == [flow_a]
+    __write(tmp_path / "requirements.txt", "prefect\n")
+    assert watcher.poll() == [flow_a, flow_b]
+    __write(tmp_path / "shared" / "other.py")
+    assert watcher.poll() == []
+
+
+def test_repo_modules_are_dropped_but_installed_ones_kept(tmp_path, monkeypatch):
+    __write(tmp_path / "shared" / "watch_shared_module.py", "VALUE = 1\n")
+    __write(tmp_path / ".venv" / "site-packages" / "watch_installed_module.py", "VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path / "shared"))
+    monkeypatch.syspath_prepend(str(tmp_path / ".venv" / "site-packages"))
+    import watch_installed_module  # noqa: F401
+    import watch_shared_module  # noqa: F401
+
+    try:
+        drop_repo_modules(tmp_path)
+
+        assert "watch_shared_module" not in sys.modules
+        assert "watch_installed_module" in sys.modules
+    finally:
+        sys.modules.pop("watch_shared_module", None)
+        sys.modules.pop("watch_installed_module", None)